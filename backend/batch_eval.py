@@ -0,0 +1,147 @@
+# backend/batch_eval.py
+"""
+Bulk re-grading of stored answers.
+
+Packs many (question, answer, difficulty) items into a few evaluation
+prompts, runs them concurrently under the LLM rate limiter (at background
+priority, behind live interviews) and writes the scores back to the
+questions table with bulk updates.
+
+Usage:
+    python batch_eval.py --interview 12 --interview 15
+    python batch_eval.py --limit 500 --dry-run
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+load_dotenv()
+from database import SessionLocal
+from models import Question
+from llm import evaluate_answers_batch_async
+import metrics
+
+# Items per prompt, and a cap on the prompt's question+answer text so long
+# answers don't push a batch past the model's context or output budget
+BATCH_EVAL_SIZE = int(os.getenv("BATCH_EVAL_SIZE", "10"))
+BATCH_EVAL_MAX_CHARS = int(os.getenv("BATCH_EVAL_MAX_CHARS", "24000"))
+BATCH_EVAL_CONCURRENCY = int(os.getenv("BATCH_EVAL_CONCURRENCY", "4"))
+
+
+def pack(items: list, size: int = BATCH_EVAL_SIZE, max_chars: int = BATCH_EVAL_MAX_CHARS) -> list:
+    """Splits items into batches of at most `size` items and about `max_chars` characters"""
+    batches, batch, chars = [], [], 0
+    for item in items:
+        item_chars = len(item["question"] or "") + len(item["answer"] or "")
+        if batch and (len(batch) >= size or chars + item_chars > max_chars):
+            batches.append(batch)
+            batch, chars = [], 0
+        batch.append(item)
+        chars += item_chars
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def evaluate_items(items: list, concurrency: int = BATCH_EVAL_CONCURRENCY) -> list:
+    """
+    Evaluates items (dicts with question, answer, difficulty and optionally
+    time_taken) in packed batches. Returns one evaluation per item, in order.
+    A batch whose call fails yields None for its items.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(batch):
+        async with semaphore:
+            try:
+                with metrics.timed("batch_evaluation"):
+                    return await evaluate_answers_batch_async(batch)
+            except Exception as e:
+                print(f"❌ Batch evaluation failed ({len(batch)} items): {e}")
+                metrics.increment("batch_evaluation_failed", len(batch))
+                return [None] * len(batch)
+
+    results = await asyncio.gather(*(run(batch) for batch in pack(items)))
+    return [evaluation for batch_results in results for evaluation in batch_results]
+
+
+def question_items(rows) -> list:
+    return [
+        {
+            "id": row.id,
+            "question": row.question_text or "",
+            "answer": row.answer_text or "",
+            "difficulty": row.difficulty if row.difficulty is not None else 3.0
+        }
+        for row in rows
+    ]
+
+
+def write_scores(scores: dict, sources: dict = None):
+    """Bulk-updates Question.score from {question id: score}, and score_source from {question id: source}"""
+    if not scores:
+        return
+    sources = sources or {}
+    db = SessionLocal()
+    try:
+        db.bulk_update_mappings(Question, [
+            {"id": question_id, "score": score, "score_source": sources.get(question_id, "llm")}
+            for question_id, score in scores.items()
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def rescore_questions(rows, dry_run: bool = False, concurrency: int = BATCH_EVAL_CONCURRENCY) -> dict:
+    """Re-evaluates Question rows and stores the new scores; returns {question id: score}"""
+    items = question_items(rows)
+    evaluations = await evaluate_items(items, concurrency)
+    evaluated = {
+        item["id"]: evaluation
+        for item, evaluation in zip(items, evaluations) if evaluation is not None
+    }
+    scores = {question_id: evaluation["score"] for question_id, evaluation in evaluated.items()}
+    if not dry_run:
+        sources = {question_id: evaluation.get("source", "llm") for question_id, evaluation in evaluated.items()}
+        await asyncio.to_thread(write_scores, scores, sources)
+    return scores
+
+
+def load_questions(interview_ids=None, limit: int = None) -> list:
+    db = SessionLocal()
+    try:
+        query = db.query(Question).filter(Question.answer_text.isnot(None))
+        if interview_ids:
+            query = query.filter(Question.interview_id.in_(interview_ids))
+        query = query.order_by(Question.id)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-grade stored answers with batched LLM evaluation")
+    parser.add_argument("--interview", type=int, action="append", help="Interview id (repeatable)")
+    parser.add_argument("--limit", type=int, help="Re-grade at most this many answers")
+    parser.add_argument("--concurrency", type=int, default=BATCH_EVAL_CONCURRENCY)
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate but don't write scores")
+    args = parser.parse_args()
+
+    rows = load_questions(args.interview, args.limit)
+    print(f"📦 Re-grading {len(rows)} answers in {len(pack(question_items(rows)))} batches")
+    started = time.perf_counter()
+    scores = asyncio.run(rescore_questions(rows, args.dry_run, args.concurrency))
+    elapsed = time.perf_counter() - started
+
+    changed = sum(1 for row in rows if row.id in scores and scores[row.id] != row.score)
+    print(f"✅ Scored {len(scores)}/{len(rows)} answers ({changed} changed) in {elapsed:.1f}s"
+          + (" [dry run]" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# backend/bench_prompts.py
+"""
+Microbenchmark for the question prompt builders.
+
+Compares render time and estimated prompt tokens of the compiled templates
+(prompts.py) with the per-call f-string builders they replaced, and shows
+how much of each prompt is the static system message providers can cache.
+
+Usage:
+    python bench_prompts.py [--iterations 20000]
+"""
+import argparse
+import timeit
+
+from llm import _technical_question_prompt, _followup_question_prompt, _new_topic_question_prompt
+from prompts import TECHNICAL_QUESTION, FOLLOWUP_QUESTION, NEW_TOPIC_QUESTION
+from rate_limiter import estimate_tokens
+
+
+# Previous builders, kept verbatim as the baseline
+
+def legacy_technical_question_prompt(tech_stack: str, difficulty: float, position: str = None, experience: float = None) -> str:
+
+    # Build experience level description
+    if experience is not None:
+        if experience < 1:
+            exp_level = "entry-level with less than 1 year of experience"
+        elif experience <= 2:
+            exp_level = "junior with 1-2 years of experience"
+        elif experience <= 5:
+            exp_level = "mid-level with 3-5 years of experience"
+        elif experience <= 10:
+            exp_level = "senior with 6-10 years of experience"
+        else:
+            exp_level = "very senior with 10+ years of experience"
+    else:
+        exp_level = "unknown experience level"
+
+    # Build position context
+    position_context = f"\nPosition applying for: {position}" if position else ""
+
+    prompt = f"""
+You are a technical interviewer conducting a live screening interview.
+
+Candidate profile:
+- Tech stack: {tech_stack}
+- Experience level: {exp_level}{position_context}
+- Interview difficulty (internal): {difficulty} out of 5
+
+Question requirements:
+- Ask ONLY ONE question relevant to their tech stack AND position
+- The question MUST be scenario-based (realistic workplace situation)
+- Tailor the complexity to match their experience level ({exp_level})
+- The scenario should be small and focused (not a full system design)
+- For junior roles: focus on fundamentals, basic problem-solving, and core concepts
+- For mid-level roles: focus on practical application, best practices, and trade-offs
+- For senior roles: focus on complex scenarios, architecture decisions, and optimization
+- Ask what the candidate would do, explain, or expect to happen
+- DO NOT ask full system design or architecture questions
+- DO NOT use words like: design an entire system, architect, end-to-end solution
+- The question should be answerable verbally in 2–5 minutes
+- Make it relevant to the actual work they would do in the {position if position else 'role'}
+
+Return ONLY the question text, nothing else.
+"""
+    return prompt
+
+
+def legacy_followup_question_prompt(tech_stack: str, difficulty: float, position: str, experience: float,
+                              previous_question: str, previous_answer: str, covered_topics: list) -> str:
+
+    # Build experience level description
+    if experience is not None:
+        if experience < 1:
+            exp_level = "entry-level with less than 1 year of experience"
+        elif experience <= 2:
+            exp_level = "junior with 1-2 years of experience"
+        elif experience <= 5:
+            exp_level = "mid-level with 3-5 years of experience"
+        elif experience <= 10:
+            exp_level = "senior with 6-10 years of experience"
+        else:
+            exp_level = "very senior with 10+ years of experience"
+    else:
+        exp_level = "unknown experience level"
+
+    # Build position context
+    position_context = f"\nPosition applying for: {position}" if position else ""
+
+    prompt = f"""
+You are a technical interviewer conducting a live screening interview.
+
+Candidate profile:
+- Tech stack: {tech_stack}
+- Experience level: {exp_level}{position_context}
+- Interview difficulty (internal): {difficulty} out of 5
+
+Previous question asked:
+{previous_question}
+
+Candidate's answer:
+{previous_answer}
+
+Topics already covered in interview: {", ".join(covered_topics) if covered_topics else "None yet"}
+
+Question requirements:
+- Generate ONE follow-up question that builds upon or relates to their previous answer
+- If they mentioned a specific technology, tool, or concept in their answer, you can ask about it
+- If their answer was strong, ask a slightly deeper question on a related topic
+- If their answer was weak or they skipped, move to a different but related area
+- Maintain the same tech stack focus: {tech_stack}
+- Keep the difficulty appropriate for {exp_level}
+- The question MUST be scenario-based (realistic workplace situation)
+- The scenario should be small and focused (not a full system design)
+- For junior roles: focus on fundamentals, basic problem-solving, and core concepts
+- For mid-level roles: focus on practical application, best practices, and trade-offs
+- For senior roles: focus on complex scenarios, architecture decisions, and optimization
+- Ask what the candidate would do, explain, or expect to happen
+- DO NOT ask full system design or architecture questions
+- The question should be answerable verbally in 2–5 minutes
+- Make it relevant to the actual work they would do in the {position if position else 'role'}
+- If continuing on the same topic, you may go deeper; otherwise feel free to connect to related areas within their tech stack
+- Try to touch upon different aspects of their tech stack over the course of the interview
+- Extract the main technology/topic from your question and append it at the end like this: [TOPIC: topic_name]
+
+Return ONLY the question text, nothing else.
+"""
+    return prompt
+
+
+def legacy_new_topic_question_prompt(tech_stack: str, difficulty: float, position: str, experience: float,
+                               covered_topics: list, question_history: list) -> str:
+
+    # Build experience level description
+    if experience is not None:
+        if experience < 1:
+            exp_level = "entry-level with less than 1 year of experience"
+        elif experience <= 2:
+            exp_level = "junior with 1-2 years of experience"
+        elif experience <= 5:
+            exp_level = "mid-level with 3-5 years of experience"
+        elif experience <= 10:
+            exp_level = "senior with 6-10 years of experience"
+        else:
+            exp_level = "very senior with 10+ years of experience"
+    else:
+        exp_level = "unknown experience level"
+
+    # Build covered topics context
+    covered_str = ", ".join(covered_topics) if covered_topics else "None yet"
+
+    position_context = f"\nPosition applying for: {position}" if position else ""
+
+    prompt = f"""
+You are a technical interviewer conducting a live screening interview.
+
+Candidate profile:
+- Tech stack: {tech_stack}
+- Experience level: {exp_level}{position_context}
+- Interview difficulty (internal): {difficulty} out of 5
+
+Topics already covered: {covered_str}
+
+Question requirements:
+- Ask ONE question from a DIFFERENT topic/technology from their tech stack that hasn't been thoroughly explored yet
+- Focus on technologies or concepts from their stack that are NOT in the covered topics list
+- The question MUST be scenario-based (realistic workplace situation)
+- Tailor the complexity to match their experience level ({exp_level})
+- The scenario should be small and focused (not a full system design)
+- For junior roles: focus on fundamentals, basic problem-solving, and core concepts
+- For mid-level roles: focus on practical application, best practices, and trade-offs
+- For senior roles: focus on complex scenarios, architecture decisions, and optimization
+- Ask what the candidate would do, explain, or expect to happen
+- DO NOT ask full system design or architecture questions
+- The question should be answerable verbally in 2–5 minutes
+- Make it relevant to the actual work they would do in the {position if position else 'role'}
+- Extract the main technology/topic from your question and append it at the end like this: [TOPIC: topic_name]
+
+Return ONLY the question text with the topic tag, nothing else.
+"""
+    return prompt
+
+
+PROFILE = dict(tech_stack="Python, Django, PostgreSQL, Redis", difficulty=3.0, position="Backend Developer", experience=4)
+PREVIOUS = dict(
+    previous_question="Your Django view slows down as the orders table grows. How would you find the cause?",
+    previous_answer="I would enable query logging, look for N+1 queries and add select_related or an index.",
+)
+COVERED = ["Django ORM", "PostgreSQL indexing"]
+
+CASES = [
+    (
+        "technical_question",
+        TECHNICAL_QUESTION,
+        lambda: legacy_technical_question_prompt(**PROFILE),
+        lambda: _technical_question_prompt(**PROFILE),
+    ),
+    (
+        "followup_question",
+        FOLLOWUP_QUESTION,
+        lambda: legacy_followup_question_prompt(**PROFILE, **PREVIOUS, covered_topics=COVERED),
+        lambda: _followup_question_prompt(**PROFILE, **PREVIOUS, covered_topics=COVERED),
+    ),
+    (
+        "new_topic_question",
+        NEW_TOPIC_QUESTION,
+        lambda: legacy_new_topic_question_prompt(**PROFILE, covered_topics=COVERED, question_history=[]),
+        lambda: _new_topic_question_prompt(**PROFILE, covered_topics=COVERED, question_history=[]),
+    ),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt rendering")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'call site':<20} {'legacy us':>10} {'template us':>12} {'legacy tok':>11} {'template tok':>13} {'system msg tok':>18}")
+    for name, template, legacy, compiled in CASES:
+        legacy_us = timeit.timeit(legacy, number=args.iterations) / args.iterations * 1e6
+        compiled_us = timeit.timeit(compiled, number=args.iterations) / args.iterations * 1e6
+        legacy_tokens = estimate_tokens(legacy())
+        compiled_tokens = sum(estimate_tokens(m["content"]) for m in compiled())
+        prefix_tokens = estimate_tokens(template.system)
+        print(f"{name:<20} {legacy_us:>10.2f} {compiled_us:>12.2f} {legacy_tokens:>11} {compiled_tokens:>13} "
+              f"{prefix_tokens:>10} ({prefix_tokens / compiled_tokens:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Load environment variables
@@ -27,6 +27,20 @@ SessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+def add_missing_columns(table):
+    """
+    create_all() never alters an existing table: add columns that were added
+    to the model since the table was created (they must be nullable).
+    """
+    existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name not in existing:
+                print(f"📊 Adding column {table.name}.{column.name}")
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                ))
+
 def get_db():
     db = SessionLocal()
     try:
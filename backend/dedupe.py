@@ -0,0 +1,193 @@
+# backend/dedupe.py
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+from dotenv import load_dotenv
+load_dotenv()
+
+# Questions whose hashed n-gram vectors have a cosine similarity at or above
+# the threshold are treated as the same scenario.
+DEDUPE_QUESTIONS = os.getenv("DEDUPE_QUESTIONS", "true").lower() in {"1", "true", "yes"}
+DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", "0.7"))
+DEDUPE_MAX_ATTEMPTS = int(os.getenv("DEDUPE_MAX_ATTEMPTS", "2"))
+
+VECTOR_DIM = 1024
+SIGNATURE_BITS = 512
+# LSH banding: a pair becomes a candidate if all bits of any band agree. 46
+# bands of 11 bits find ~85% of pairs at cosine 0.7 and ~98% at 0.8, while
+# only a few percent of unrelated questions have to be scored.
+BANDS = 46
+BAND_BITS = 11
+_BAND_WEIGHTS = 1 << np.arange(BAND_BITS)
+
+# Words every question shares carry no signal about the scenario
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are", "be",
+    "you", "your", "would", "how", "what", "why", "when", "which", "do", "does", "it", "this",
+    "that", "as", "at", "by", "from", "if", "can", "could", "should", "will", "we", "i",
+}
+
+# Fixed seed: signatures must match across workers and restarts
+_PLANES = np.random.default_rng(20240601).standard_normal((VECTOR_DIM, SIGNATURE_BITS)).astype(np.float32)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+def _features(text: str) -> list:
+    words = [w for w in re.findall(r"[a-z0-9+#.]+", text.lower()) if w not in _STOPWORDS]
+    features = [f"w:{w}" for w in words]
+    features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    joined = " ".join(words)
+    features += [f"c:{joined[i:i + 4]}" for i in range(len(joined) - 3)]
+    return features
+
+
+def vectorize(text: str) -> np.ndarray:
+    """
+    Hashed n-gram vector (word unigrams, bigrams and character 4-grams),
+    L2-normalized. crc32 is used instead of hash() so vectors are stable
+    across processes.
+    """
+    buckets = [zlib.crc32(f.encode()) % VECTOR_DIM for f in _features(text)]
+    vector = np.bincount(buckets, minlength=VECTOR_DIM).astype(np.float32) if buckets \
+        else np.zeros(VECTOR_DIM, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def similarity(a: str, b: str) -> float:
+    return float(vectorize(a) @ vectorize(b))
+
+
+def _signature_bits(vector: np.ndarray) -> np.ndarray:
+    return vector @ _PLANES > 0
+
+
+def signature(vector: np.ndarray) -> np.ndarray:
+    """Random-hyperplane (SimHash) signature, packed into SIGNATURE_BITS // 8 bytes"""
+    return np.packbits(_signature_bits(vector))
+
+
+def _band_keys(bits: np.ndarray) -> list:
+    values = bits[:BANDS * BAND_BITS].reshape(BANDS, BAND_BITS) @ _BAND_WEIGHTS
+    return list(enumerate(values.tolist()))
+
+
+def signature_similarity(query: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+    """Estimates cosine similarity from the Hamming distance between signatures"""
+    distance = _POPCOUNT[np.bitwise_xor(signatures, query)].sum(axis=1)
+    return np.cos(np.pi * distance / SIGNATURE_BITS)
+
+
+def near_duplicates(text: str, history, threshold: float = DEDUPE_THRESHOLD) -> list:
+    """
+    Returns the questions in `history` that are near-duplicates of `text`.
+    Exact cosine over the handful of questions in one interview.
+    """
+    history = [h for h in history if h]
+    if not history:
+        return []
+    query = vectorize(text)
+    matrix = np.stack([vectorize(h) for h in history])
+    scores = matrix @ query
+    return [h for h, score in zip(history, scores) if score >= threshold]
+
+
+def is_near_duplicate(text: str, history, threshold: float = DEDUPE_THRESHOLD) -> bool:
+    return bool(near_duplicates(text, history, threshold))
+
+
+class NearDuplicateIndex:
+    """
+    Approximate nearest-neighbour index over question signatures.
+
+    Signatures live in one growing NumPy array (64 bytes per question), and
+    each of the BANDS slices of a signature is an LSH bucket. A query only
+    scores the questions that share at least one band with it (about 2% of
+    unrelated ones), which keeps lookups around a millisecond per 10k
+    questions. Callers partition large collections (see PartitionedIndex).
+    """
+
+    def __init__(self):
+        self._signatures = np.zeros((1024, SIGNATURE_BITS // 8), dtype=np.uint8)
+        self._keys = []  # row -> key (None once removed)
+        self._rows = {}  # key -> row
+        self._bands = {}  # (band, value) -> list of rows
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, key, text: str):
+        bits = _signature_bits(vectorize(text))
+        sig = np.packbits(bits)
+        with self._lock:
+            if key in self._rows:
+                return
+            row = len(self._keys)
+            if row == len(self._signatures):
+                self._signatures = np.concatenate([self._signatures, np.zeros_like(self._signatures)])
+            self._signatures[row] = sig
+            self._keys.append(key)
+            self._rows[key] = row
+            for band_key in _band_keys(bits):
+                self._bands.setdefault(band_key, []).append(row)
+
+    def remove(self, key):
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is not None:
+                self._keys[row] = None  # Band lists are filtered on query
+
+    def query(self, text: str, threshold: float = DEDUPE_THRESHOLD) -> list:
+        """Returns [(key, estimated similarity)] of indexed questions at or above the threshold"""
+        bits = _signature_bits(vectorize(text))
+        sig = np.packbits(bits)
+        with self._lock:
+            candidates = set()
+            for band_key in _band_keys(bits):
+                candidates.update(self._bands.get(band_key, ()))
+            rows = [row for row in candidates if self._keys[row] is not None]
+            if not rows:
+                return []
+            scores = signature_similarity(sig, self._signatures[rows])
+            return [
+                (self._keys[row], float(score))
+                for row, score in zip(rows, scores) if score >= threshold
+            ]
+
+
+class PartitionedIndex:
+    """
+    One NearDuplicateIndex per partition (e.g. per tech stack), so a query
+    only scans the questions it can collide with and the total number of
+    indexed questions can grow into the millions.
+    """
+
+    def __init__(self):
+        self._partitions = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(index) for index in self._partitions.values())
+
+    def _partition(self, partition) -> NearDuplicateIndex:
+        with self._lock:
+            index = self._partitions.get(partition)
+            if index is None:
+                index = self._partitions[partition] = NearDuplicateIndex()
+            return index
+
+    def add(self, partition, key, text: str):
+        self._partition(partition).add(key, text)
+
+    def remove(self, partition, key):
+        index = self._partitions.get(partition)
+        if index is not None:
+            index.remove(key)
+
+    def query(self, partition, text: str, threshold: float = DEDUPE_THRESHOLD) -> list:
+        index = self._partitions.get(partition)
+        return index.query(text, threshold) if index is not None else []
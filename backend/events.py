@@ -0,0 +1,82 @@
+# backend/events.py
+import asyncio
+import json
+import time
+
+
+class EventBroker:
+    """
+    Wakes up the streaming connections of an interview when its state changes.
+
+    Subscribers re-read the session store when woken, so notifications carry no
+    payload and a missed one only delays an update until the next timer tick.
+    notify() is safe to call from worker threads as well as from the event loop.
+    """
+
+    # Streamed question previews wake subscribers at most this often
+    PREVIEW_INTERVAL = 0.05
+
+    def __init__(self):
+        self._subscribers = {}  # interview_id -> set of asyncio.Event
+        self._previews = {}  # interview_id -> (question_number, text, last_notified)
+        self._loop = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def subscribe(self, interview_id: int) -> asyncio.Event:
+        wakeup = asyncio.Event()
+        self._subscribers.setdefault(interview_id, set()).add(wakeup)
+        return wakeup
+
+    def unsubscribe(self, interview_id: int, wakeup: asyncio.Event):
+        subscribers = self._subscribers.get(interview_id)
+        if subscribers is not None:
+            subscribers.discard(wakeup)
+            if not subscribers:
+                self._subscribers.pop(interview_id, None)
+
+    def subscriber_count(self) -> int:
+        return sum(len(s) for s in self._subscribers.values())
+
+    def notify(self, interview_id: int):
+        if self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wake(interview_id)
+        else:
+            self._loop.call_soon_threadsafe(self._wake, interview_id)
+
+    def publish_preview(self, interview_id: int, question_number: int, text: str):
+        """
+        Records the part of a question generated so far. Previews live in this
+        worker only; streams served by other workers just get the final question.
+        """
+        _, _, last_notified = self._previews.get(interview_id, (None, None, 0.0))
+        now = time.monotonic()
+        if now - last_notified >= self.PREVIEW_INTERVAL:
+            self._previews[interview_id] = (question_number, text, now)
+            self.notify(interview_id)
+        else:
+            self._previews[interview_id] = (question_number, text, last_notified)
+
+    def preview(self, interview_id: int):
+        """Returns (question_number, text) of the question being generated, or None"""
+        preview = self._previews.get(interview_id)
+        return preview[:2] if preview else None
+
+    def clear_preview(self, interview_id: int):
+        self._previews.pop(interview_id, None)
+
+    def _wake(self, interview_id: int):
+        for wakeup in self._subscribers.get(interview_id, ()):
+            wakeup.set()
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Serializes one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
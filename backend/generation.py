@@ -0,0 +1,152 @@
+# backend/generation.py
+import json
+import math
+import os
+import threading
+from collections import deque
+
+from dotenv import load_dotenv
+load_dotenv()
+import metrics
+
+# Per call site overrides of the profiles below, as JSON, e.g.
+# {"evaluation": {"max_tokens": 96, "temperature": 0.1}, "rating": {"stop": ["\n\n"]}}
+LLM_GENERATION_PROFILES = os.getenv("LLM_GENERATION_PROFILES", "")
+# Derive max_tokens from the observed completion lengths of each call site
+LLM_ADAPTIVE_MAX_TOKENS = os.getenv("LLM_ADAPTIVE_MAX_TOKENS", "true").lower() in {"1", "true", "yes"}
+# max_tokens = p99 of recent completion lengths * headroom, within the profile's bounds
+LLM_MAX_TOKENS_HEADROOM = float(os.getenv("LLM_MAX_TOKENS_HEADROOM", "1.5"))
+LLM_GENERATION_MIN_SAMPLES = int(os.getenv("LLM_GENERATION_MIN_SAMPLES", "50"))
+
+_LENGTH_WINDOW = 500
+# Recent truncations above this share send max_tokens back to the profile's ceiling
+_MAX_TRUNCATION_RATE = 0.01
+# Upper bounds (tokens) of the reported histogram buckets
+_HISTOGRAM_BOUNDS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+class GenerationProfile:
+    """
+    Sampling parameters for one call site.
+
+    Args:
+        max_tokens (int): Ceiling for max_tokens; used as is until enough
+            completions have been observed (or when adaptive is False).
+        temperature (float): Sampling temperature.
+        stop (list): Stop sequences, or None.
+        json_mode (bool): Ask the provider for JSON output.
+        min_tokens (int): Floor for the adaptive max_tokens.
+        adaptive (bool): Whether max_tokens follows observed lengths. Off for
+            call sites whose output size depends on the input (batches).
+    """
+
+    def __init__(self, max_tokens: int, temperature: float, stop=None, json_mode: bool = False,
+                 min_tokens: int = 32, adaptive: bool = True):
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.stop = list(stop) if stop else None
+        self.json_mode = json_mode
+        self.min_tokens = min(min_tokens, max_tokens)
+        self.adaptive = adaptive
+
+
+DEFAULT_PROFILE = GenerationProfile(2000, 0.7, adaptive=False)
+
+# Questions are a short scenario plus a topic tag; scores and ratings are a
+# small JSON object. Scoring runs cooler so re-grades of the same answer agree.
+GENERATION_PROFILES = {
+    "technical_question": GenerationProfile(600, 0.7, min_tokens=128),
+    "followup_question": GenerationProfile(600, 0.7, min_tokens=128),
+    "new_topic_question": GenerationProfile(600, 0.7, min_tokens=128),
+    "evaluation": GenerationProfile(128, 0.2, json_mode=True),
+    "batch_evaluation": GenerationProfile(2000, 0.2, json_mode=True, adaptive=False),
+    "rating": GenerationProfile(256, 0.3, json_mode=True, min_tokens=64),
+}
+
+
+def _apply_overrides(config: str):
+    if not config.strip():
+        return
+    for call_site, overrides in json.loads(config).items():
+        base = GENERATION_PROFILES.get(call_site, DEFAULT_PROFILE)
+        settings = {
+            "max_tokens": base.max_tokens,
+            "temperature": base.temperature,
+            "stop": base.stop,
+            "json_mode": base.json_mode,
+            "min_tokens": base.min_tokens,
+            "adaptive": base.adaptive
+        }
+        settings.update(overrides)
+        GENERATION_PROFILES[call_site] = GenerationProfile(**settings)
+
+
+_apply_overrides(LLM_GENERATION_PROFILES)
+
+
+def profile_for(call_site: str) -> GenerationProfile:
+    return GENERATION_PROFILES.get(call_site, DEFAULT_PROFILE)
+
+
+class OutputLengthTracker:
+    """
+    Rolling window of completion lengths per call site, and whether each
+    completion was cut off by max_tokens (finish_reason "length").
+    """
+
+    def __init__(self, window: int = _LENGTH_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_site: str, tokens: int, truncated: bool = False):
+        if truncated:
+            metrics.increment(f"llm_truncated.{call_site}")
+        with self._lock:
+            samples = self._samples.get(call_site)
+            if samples is None:
+                samples = self._samples[call_site] = deque(maxlen=self.window)
+            samples.append((tokens, truncated))
+
+    def _snapshot(self, call_site: str) -> list:
+        with self._lock:
+            return list(self._samples.get(call_site, ()))
+
+    def max_tokens(self, call_site: str) -> int:
+        """max_tokens for the next call: tuned from recent lengths when the profile allows it"""
+        profile = profile_for(call_site)
+        if not (LLM_ADAPTIVE_MAX_TOKENS and profile.adaptive):
+            return profile.max_tokens
+        samples = self._snapshot(call_site)
+        if len(samples) < LLM_GENERATION_MIN_SAMPLES:
+            return profile.max_tokens
+        if sum(truncated for _, truncated in samples) > _MAX_TRUNCATION_RATE * len(samples):
+            return profile.max_tokens
+        lengths = sorted(tokens for tokens, _ in samples)
+        p99 = lengths[min(len(lengths) - 1, int(0.99 * len(lengths)))]
+        return max(profile.min_tokens, min(profile.max_tokens, math.ceil(p99 * LLM_MAX_TOKENS_HEADROOM)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            call_sites = list(self._samples)
+        report = {}
+        for call_site in call_sites:
+            samples = self._snapshot(call_site)
+            lengths = sorted(tokens for tokens, _ in samples)
+            histogram = {}
+            for tokens in lengths:
+                bucket = next((f"<={bound}" for bound in _HISTOGRAM_BOUNDS if tokens <= bound),
+                              f">{_HISTOGRAM_BOUNDS[-1]}")
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+            report[call_site] = {
+                "samples": len(lengths),
+                "p50_tokens": lengths[len(lengths) // 2] if lengths else None,
+                "p99_tokens": lengths[min(len(lengths) - 1, int(0.99 * len(lengths)))] if lengths else None,
+                "truncated": sum(truncated for _, truncated in samples),
+                "max_tokens": self.max_tokens(call_site),
+                "histogram": histogram
+            }
+        return report
+
+
+OUTPUT_LENGTHS = OutputLengthTracker()
@@ -0,0 +1,97 @@
+# backend/http_client.py
+import os
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+from dotenv import load_dotenv
+load_dotenv()
+
+# Connection pool settings (per upstream host)
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "100"))
+LLM_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() in {"1", "true", "yes"}
+
+_CLIENTS = {}  # origin -> httpx.Client
+_ASYNC_CLIENTS = {}  # origin -> httpx.AsyncClient
+_CLIENTS_LOCK = threading.Lock()
+
+
+def http2_available() -> bool:
+    """
+    HTTP/2 needs the optional `h2` package (installed with httpx[http2]).
+    """
+    if not LLM_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_POOL_SIZE,
+        max_keepalive_connections=LLM_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+    )
+
+
+def get_client(url: str) -> httpx.Client:
+    """
+    Returns the shared keep-alive client for the host serving `url`.
+
+    One client (and therefore one connection pool) is kept per origin, so
+    the pool size settings apply per upstream host. httpx clients are
+    thread-safe, so the same instance is shared by every worker thread.
+    """
+    origin = _origin(url)
+    client = _CLIENTS.get(origin)
+    if client is not None:
+        return client
+
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(origin)
+        if client is None:
+            client = httpx.Client(http2=http2_available(), limits=_limits())
+            _CLIENTS[origin] = client
+            print(f"🔌 HTTP client created for {origin} (http2={http2_available()}, pool={LLM_POOL_SIZE})")
+        return client
+
+
+def get_async_client(url: str) -> httpx.AsyncClient:
+    """
+    Returns the shared asyncio client for the host serving `url`.
+
+    Async clients are bound to the running event loop, so they must only be
+    used from coroutines running on the application loop.
+    """
+    origin = _origin(url)
+    client = _ASYNC_CLIENTS.get(origin)
+    if client is None:
+        client = httpx.AsyncClient(http2=http2_available(), limits=_limits())
+        _ASYNC_CLIENTS[origin] = client
+        print(f"🔌 Async HTTP client created for {origin} (http2={http2_available()}, pool={LLM_POOL_SIZE})")
+    return client
+
+
+def close_clients():
+    """Closes every pooled sync client (called on application shutdown)."""
+    with _CLIENTS_LOCK:
+        for client in _CLIENTS.values():
+            client.close()
+        _CLIENTS.clear()
+
+
+async def aclose_clients():
+    """Closes every pooled async client (called on application shutdown)."""
+    for client in list(_ASYNC_CLIENTS.values()):
+        await client.aclose()
+    _ASYNC_CLIENTS.clear()
@@ -1,54 +1,430 @@
 # backend/llm.py
-import requests
 import re
 import os
+import json
 from dotenv import load_dotenv
 load_dotenv()
-
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
-MODEL_NAME = os.getenv("MODEL_NAME", "llama-3.3-70b-versatile")
-
-# Headers for Groq API
-HEADERS = {
-    "Content-Type": "application/json",
-    "Authorization": f"Bearer {GROQ_API_KEY}"
-}
-
-def call_groq_api(prompt: str, timeout: int = 180) -> str:
-    """
-    Helper function to call Groq API with proper formatting
-    """
-    response = requests.post(
-        GROQ_API_URL,
-        headers=HEADERS,
-        json={
-            "model": MODEL_NAME,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "max_tokens": 2000
-        },
-        timeout=timeout
-    )
-    
+from http_client import get_client, get_async_client
+from llm_cache import CACHE, cache_key
+from singleflight import SingleFlight, AsyncSingleFlight
+from rate_limiter import (
+    priority_for,
+    estimate_request_tokens,
+    estimate_tokens,
+    record_completion_tokens
+)
+from resilience import (
+    LLM_ATTEMPT_TIMEOUT,
+    TransientError,
+    RateLimitedError,
+    is_transient
+)
+from providers import ROUTER, Provider, MODEL_NAME
+from llm_json import parse_response, parse_object, validate_items
+from schemas import EvaluationResult, BatchEvaluationItem, RatingResult
+from generation import profile_for, OUTPUT_LENGTHS
+from prescorer import PRESCORER
+from local_scorer import LOCAL_SCORER, EVAL_BACKEND
+from prompts import TECHNICAL_QUESTION, FOLLOWUP_QUESTION, NEW_TOPIC_QUESTION, experience_band, chat_messages
+import metrics
+import asyncio
+import time
+
+# Concurrent identical cacheable prompts (e.g. a cohort starting at once) are
+# coalesced into one upstream request
+FLIGHTS = SingleFlight("llm_singleflight")
+ASYNC_FLIGHTS = AsyncSingleFlight("llm_singleflight")
+
+# Ask providers for JSON output (response_format) on structured call sites;
+# disable for OpenAI-compatible servers that reject the parameter
+LLM_JSON_MODE = os.getenv("LLM_JSON_MODE", "true").lower() in {"1", "true", "yes"}
+# Extra calls made when an evaluation response can't be parsed even after repair
+LLM_PARSE_RETRIES = int(os.getenv("LLM_PARSE_RETRIES", "1"))
+
+# Compiled once; the cleaners run on every generated question
+_TOPIC_TAG = re.compile(r'\[TOPIC:\s*([^\]]+)\]')
+_NON_ASCII = re.compile(r"[^\x00-\x7F]+")
+
+class InvalidLLMResponseError(TransientError):
+    """The model's output could not be parsed, even after the repair pass."""
+
+def _chat_payload(prompt, call_site: str = None, json_mode: bool = None) -> dict:
+    # The model is filled in per provider when the request is sent. A prompt
+    # is either chat messages (static system message first) or a plain
+    # string sent as the user message. Sampling parameters come from the
+    # call site's generation profile.
+    profile = profile_for(call_site)
+    payload = {
+        "model": MODEL_NAME,
+        "messages": prompt if isinstance(prompt, list) else [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": profile.temperature,
+        "max_tokens": OUTPUT_LENGTHS.max_tokens(call_site)
+    }
+    if profile.stop:
+        payload["stop"] = profile.stop
+    if (profile.json_mode if json_mode is None else json_mode) and LLM_JSON_MODE:
+        payload["response_format"] = {"type": "json_object"}
+    return payload
+
+def _retry_after(response) -> float:
+    try:
+        return float(response.headers.get("retry-after", "5"))
+    except ValueError:
+        return 5.0
+
+def _check_status(response, provider: Provider):
+    if response.status_code == 429:
+        raise RateLimitedError(
+            f"{provider.name} API rate limited: {response.text[:200]}", _retry_after(response)
+        )
+    if response.status_code >= 500 or response.status_code == 408:
+        raise TransientError(f"{provider.name} API error: {response.status_code} - {response.text[:200]}")
     if response.status_code != 200:
-        raise RuntimeError(f"Groq API error: {response.status_code} - {response.text}")
-    
+        raise RuntimeError(f"{provider.name} API error: {response.status_code} - {response.text}")
+
+def _record_usage(provider: Provider, response, call_site: str, reserved: int):
+    """
+    Reconciles the provider's token budget with the usage it reported and
+    counts prompt, completion and cached prompt tokens per call site
+    (llm_tokens.<kind>.<call site>), so prefix-cache reuse can be measured.
+    """
+    try:
+        data = response.json()
+    except ValueError:
+        data = {}
+    usage = data.get("usage") or {}
+    choices = data.get("choices") or [{}]
+    prompt_tokens = usage.get("prompt_tokens") or 0
+    completion_tokens = usage.get("completion_tokens") or 0
+    # OpenAI-style usage reports prompt-cache hits under prompt_tokens_details
+    cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+    if usage.get("completion_tokens") is not None:
+        record_completion_tokens(call_site, completion_tokens)
+        OUTPUT_LENGTHS.record(call_site, completion_tokens, choices[0].get("finish_reason") == "length")
+    if usage:
+        total_tokens = usage.get("total_tokens")
+        provider.record_tokens(prompt_tokens + completion_tokens if total_tokens is None else total_tokens,
+                               prompt_tokens, cached_tokens)
+        metrics.increment(f"llm_tokens.prompt.{call_site}", prompt_tokens)
+        metrics.increment(f"llm_tokens.completion.{call_site}", completion_tokens)
+        metrics.increment(f"llm_tokens.cached.{call_site}", cached_tokens)
+    provider.limiter.settle(reserved, usage.get("total_tokens"))
+
+def _parse_chat_response(response, provider: Provider) -> str:
+    _check_status(response, provider)
     data = response.json()
     
     if "choices" not in data or len(data["choices"]) == 0:
-        raise RuntimeError(f"Groq returned no response: {data}")
+        raise RuntimeError(f"{provider.name} returned no response: {data}")
     
     return data["choices"][0]["message"]["content"].strip()
 
-def ask_technical_question(tech_stack: str, difficulty: float, position: str = None, experience: float = None) -> str:
+def _rate_limited(provider: Provider, reserved: int, error: RateLimitedError):
+    provider.limiter.settle(reserved, 0)
+    provider.limiter.pause(error.retry_after)
+
+def _send_chat(provider: Provider, payload: dict, call_site: str, reserved: int, attempt_timeout: float) -> str:
+    """One attempt against one provider, inside its rate limiter"""
+    provider.limiter.acquire(reserved, priority_for(call_site))
+    started = time.monotonic()
+    try:
+        response = get_client(provider.url).post(
+            provider.url,
+            headers=provider.headers,
+            json=dict(payload, model=provider.model),
+            timeout=attempt_timeout
+        )
+        content = _parse_chat_response(response, provider)
+    except Exception as e:
+        if isinstance(e, RateLimitedError):
+            _rate_limited(provider, reserved, e)
+        provider.record_result(call_site, failed=True)
+        raise
+    provider.record_result(call_site, time.monotonic() - started)
+    _record_usage(provider, response, call_site, reserved)
+    return content
+
+async def _send_chat_async(provider: Provider, payload: dict, call_site: str, reserved: int,
+                           attempt_timeout: float) -> str:
+    """Asyncio version of _send_chat."""
+    await provider.limiter.acquire_async(reserved, priority_for(call_site))
+    started = time.monotonic()
+    try:
+        response = await asyncio.wait_for(
+            get_async_client(provider.url).post(
+                provider.url,
+                headers=provider.headers,
+                json=dict(payload, model=provider.model),
+                timeout=attempt_timeout
+            ),
+            attempt_timeout
+        )
+        content = _parse_chat_response(response, provider)
+    except Exception as e:
+        if isinstance(e, RateLimitedError):
+            _rate_limited(provider, reserved, e)
+        provider.record_result(call_site, failed=True)
+        raise
+    provider.record_result(call_site, time.monotonic() - started)
+    _record_usage(provider, response, call_site, reserved)
+    return content
+
+def _failing_over(provider: Provider, call_site: str, error: Exception):
+    metrics.increment(f"llm_failover.{provider.name}")
+    print(f"🔀 {provider.name} failed for {call_site} ({error}), failing over")
+
+def _post_chat(payload: dict, timeout: int, call_site: str = None) -> str:
     """
-    Generates ONE scenario-based technical interview question
+    Sends one chat completion, routed to the best provider for the call site.
+
+    `timeout` bounds the whole call. Each attempt gets at most
+    LLM_ATTEMPT_TIMEOUT seconds and goes through the provider's rate limiter.
+    A transient failure (429, 5xx, timeout) fails over to the next provider
+    immediately; the last provider is retried with jittered backoff.
+    """
+    reserved = estimate_request_tokens(call_site, payload)
+    deadline = time.monotonic() + timeout
+    candidates = ROUTER.candidates(call_site)
+    for i, provider in enumerate(candidates):
+        last = i == len(candidates) - 1
+        try:
+            return provider.resilience.call(
+                call_site,
+                lambda attempt_timeout: _send_chat(provider, payload, call_site, reserved, attempt_timeout),
+                deadline - time.monotonic(),
+                retries=None if last else 0
+            )
+        except TransientError as e:
+            if last:
+                raise
+            _failing_over(provider, call_site, e)
+
+async def _post_chat_async(payload: dict, timeout: int, call_site: str = None) -> str:
+    """Asyncio version of _post_chat. Live call sites may also be hedged."""
+    reserved = estimate_request_tokens(call_site, payload)
+    deadline = time.monotonic() + timeout
+    candidates = ROUTER.candidates(call_site)
+    for i, provider in enumerate(candidates):
+        last = i == len(candidates) - 1
+        try:
+            return await provider.resilience.call_async(
+                call_site,
+                lambda attempt_timeout: _send_chat_async(provider, payload, call_site, reserved, attempt_timeout),
+                deadline - time.monotonic(),
+                retries=None if last else 0
+            )
+        except TransientError as e:
+            if last:
+                raise
+            _failing_over(provider, call_site, e)
+
+def _cached_chat(call_site: str, payload: dict, timeout: int) -> str:
+    cached = CACHE.get(call_site, payload)
+    if cached is not None:
+        return cached
+    content = _post_chat(payload, timeout, call_site)
+    CACHE.put(call_site, payload, content)
+    return content
+
+async def _cached_chat_async(call_site: str, payload: dict, timeout: int) -> str:
+    # The disk tier is SQLite, keep it off the event loop
+    if CACHE.disk_enabled:
+        cached = await asyncio.to_thread(CACHE.get, call_site, payload)
+    else:
+        cached = CACHE.get(call_site, payload)
+    if cached is not None:
+        return cached
+
+    content = await _post_chat_async(payload, timeout, call_site)
+    if CACHE.disk_enabled:
+        await asyncio.to_thread(CACHE.put, call_site, payload, content)
+    else:
+        CACHE.put(call_site, payload, content)
+    return content
+
+def call_groq_api(prompt, timeout: int = 180, call_site: str = None, use_cache: bool = True,
+                  json_mode: bool = None) -> str:
+    """
+    Helper function to call Groq API with proper formatting.
+    Goes through the shared keep-alive client so connections are reused.
+    Responses of cacheable call sites (see llm_cache.CACHE_POLICIES) are
+    served from and added to the response cache unless use_cache is False,
+    and identical cacheable prompts in flight at the same time share one
+    upstream request. json_mode (default: the call site's generation profile)
+    requests the provider's JSON output mode.
+    `prompt` is a list of chat messages or a string sent as the user message.
+    """
+    payload = _chat_payload(prompt, call_site, json_mode)
+    if not (use_cache and CACHE.cacheable(call_site)):
+        return _post_chat(payload, timeout, call_site)
+    return FLIGHTS.do(
+        cache_key(call_site, payload),
+        lambda: _cached_chat(call_site, payload, timeout)
+    )
+
+async def call_groq_api_async(prompt, timeout: int = 180, call_site: str = None,
+                              use_cache: bool = True, json_mode: bool = None) -> str:
+    """
+    Asyncio version of call_groq_api. Awaits the response on the event loop
+    instead of blocking a thread for the duration of the request.
+    """
+    payload = _chat_payload(prompt, call_site, json_mode)
+    if not (use_cache and CACHE.cacheable(call_site)):
+        return await _post_chat_async(payload, timeout, call_site)
+    return await ASYNC_FLIGHTS.do(
+        cache_key(call_site, payload),
+        lambda: _cached_chat_async(call_site, payload, timeout)
+    )
+
+async def stream_groq_api_async(prompt, timeout: int = 180, call_site: str = None):
+    """
+    Streaming version of call_groq_api_async. Yields the completion text in
+    chunks as the model produces them (chat-completions stream protocol).
+
+    A stream is a single attempt against the best-ranked provider: it is not
+    retried or failed over, but it respects the circuit breaker and fails if
+    no chunk arrives within LLM_ATTEMPT_TIMEOUT.
+    """
+    provider = ROUTER.candidates(call_site)[0]
+    payload = _chat_payload(prompt, call_site)
+    payload["model"] = provider.model
+    payload["stream"] = True
+    reserved = estimate_request_tokens(call_site, payload)
+    provider.resilience.breaker.allow()
+    await provider.limiter.acquire_async(reserved, priority_for(call_site))
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in payload["messages"])
+    completion_chars = 0
+    truncated = False
+    settled = False
+    started = time.monotonic()
+    try:
+        async with get_async_client(provider.url).stream(
+            "POST",
+            provider.url,
+            headers=provider.headers,
+            json=payload,
+            timeout=min(timeout, LLM_ATTEMPT_TIMEOUT)
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                if response.status_code == 429:
+                    provider.limiter.settle(reserved, 0)
+                    settled = True
+                    provider.limiter.pause(_retry_after(response))
+                _check_status(response, provider)
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    chunk = None
+                if not isinstance(chunk, dict):
+                    # A lost delta would leave a hole in the question; let the caller retry
+                    raise InvalidLLMResponseError(f"{provider.name} sent a malformed stream event: {data[:80]}")
+                choices = chunk.get("choices") or []
+                if choices:
+                    truncated = truncated or choices[0].get("finish_reason") == "length"
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        completion_chars += len(delta)
+                        yield delta
+    except Exception as e:
+        provider.resilience.record(call_site, started, e)
+        provider.record_result(call_site, failed=True)
+        raise
+    finally:
+        # Streams carry no usage, settle with estimates of both parts. Also runs
+        # when the stream fails or is abandoned, so the reservation never leaks.
+        if not settled:
+            provider.limiter.settle(reserved, prompt_tokens + max(1, completion_chars // 4))
+    provider.resilience.record(call_site, started)
+    provider.record_result(call_site, time.monotonic() - started)
+
+    completion_tokens = max(1, completion_chars // 4)
+    record_completion_tokens(call_site, completion_tokens)
+    OUTPUT_LENGTHS.record(call_site, completion_tokens, truncated)
+    provider.record_tokens(prompt_tokens + completion_tokens, prompt_tokens)
+
+class QuestionStreamCleaner:
+    """
+    Incremental version of the question cleanup, for showing a question while
+    it is still being generated.
+
+    feed() returns the newly displayable text. Text that may still turn out to
+    be an intro ending with a colon, a [TOPIC: ...] tag or a closing quote is
+    held back until it is resolved. The displayed text only ever grows; the
+    final question is still produced by the regular cleaners on the full
+    completion and replaces the preview.
+    """
+
+    # An intro line is only waited for this long before text is shown
+    INTRO_HOLDBACK = 80
+
+    def __init__(self):
+        self.raw = ""
+        self.shown = ""
+
+    def feed(self, delta: str) -> str:
+        self.raw += delta
+        text = self._visible(self.raw)
+        if len(text) > len(self.shown) and text.startswith(self.shown):
+            new_text = text[len(self.shown):]
+            self.shown = text
+            return new_text
+        return ""
+
+    def _visible(self, raw: str) -> str:
+        raw = _TOPIC_TAG.sub('', raw)
+
+        # Hold back a tag that is still being written
+        tag_start = raw.rfind("[")
+        if tag_start >= 0 and "]" not in raw[tag_start:]:
+            tail = raw[tag_start:]
+            if "[TOPIC:".startswith(tail) or tail.startswith("[TOPIC:"):
+                raw = raw[:tag_start]
+
+        first_line = raw.split("\n", 1)[0]
+        if ":" in first_line:
+            raw = raw.split(":", 1)[-1]
+        elif "\n" not in raw and len(first_line) < self.INTRO_HOLDBACK:
+            return ""
+
+        raw = _NON_ASCII.sub("", raw)
+        return raw.lstrip().lstrip('"').rstrip().rstrip('"')
+
+async def _stream_question_async(prompt, on_delta, timeout: int = 180, call_site: str = None) -> str:
+    """
+    Streams a question completion, calling on_delta(preview) with the cleaned
+    text shown so far, and returns the full raw completion.
+    """
+    cleaner = QuestionStreamCleaner()
+    chunks = []
+    try:
+        async for delta in stream_groq_api_async(prompt, timeout=timeout, call_site=call_site):
+            chunks.append(delta)
+            if cleaner.feed(delta):
+                on_delta(cleaner.shown)
+    except Exception as e:
+        if not is_transient(e):
+            raise
+        # The regular call retries (and waits out rate limits); its result
+        # replaces whatever preview was already shown
+        return await call_groq_api_async(prompt, timeout=timeout, call_site=call_site)
+    return "".join(chunks).strip()
+
+def _technical_question_prompt(tech_stack: str, difficulty: float, position: str = None, experience: float = None) -> list:
+    """
+    Builds the prompt for ONE scenario-based technical interview question
     appropriate to the candidate's experience level, position, and tech stack.
 
     The question focuses on practical reasoning and understanding,
@@ -60,68 +436,50 @@ def ask_technical_question(tech_stack: str, difficulty: float, position: str = N
         position (str): Position the candidate is applying for.
         experience (float): Years of experience the candidate has.
     """
+    return TECHNICAL_QUESTION.render_messages(
+        tech_stack=tech_stack,
+        experience_level=experience_band(experience)[1],
+        position=position,
+        difficulty=difficulty
+    )
 
-    # Build experience level description
-    if experience is not None:
-        if experience < 1:
-            exp_level = "entry-level with less than 1 year of experience"
-        elif experience <= 2:
-            exp_level = "junior with 1-2 years of experience"
-        elif experience <= 5:
-            exp_level = "mid-level with 3-5 years of experience"
-        elif experience <= 10:
-            exp_level = "senior with 6-10 years of experience"
-        else:
-            exp_level = "very senior with 10+ years of experience"
-    else:
-        exp_level = "unknown experience level"
-
-    # Build position context
-    position_context = f"\nPosition applying for: {position}" if position else ""
-    
-    prompt = f"""
-You are a technical interviewer conducting a live screening interview.
-
-Candidate profile:
-- Tech stack: {tech_stack}
-- Experience level: {exp_level}{position_context}
-- Interview difficulty (internal): {difficulty} out of 5
-
-Question requirements:
-- Ask ONLY ONE question relevant to their tech stack AND position
-- The question MUST be scenario-based (realistic workplace situation)
-- Tailor the complexity to match their experience level ({exp_level})
-- The scenario should be small and focused (not a full system design)
-- For junior roles: focus on fundamentals, basic problem-solving, and core concepts
-- For mid-level roles: focus on practical application, best practices, and trade-offs
-- For senior roles: focus on complex scenarios, architecture decisions, and optimization
-- Ask what the candidate would do, explain, or expect to happen
-- DO NOT ask full system design or architecture questions
-- DO NOT use words like: design an entire system, architect, end-to-end solution
-- The question should be answerable verbally in 2–5 minutes
-- Make it relevant to the actual work they would do in the {position if position else 'role'}
-
-Return ONLY the question text, nothing else.
-"""
-
-    raw = call_groq_api(prompt, timeout=180)
-
+def _clean_question(raw: str) -> str:
     # If the model adds an intro ending with a colon, strip it
     if ":" in raw.split("\n", 1)[0]:
         raw = raw.split(":", 1)[-1].strip()
 
     # Remove emojis and non-ASCII symbols
-    raw = re.sub(r"[^\x00-\x7F]+", "", raw)
+    raw = _NON_ASCII.sub("", raw)
 
     # Remove wrapping quotes if any
     raw = raw.strip().strip('"')
 
     return raw
 
-def ask_followup_question(tech_stack: str, difficulty: float, position: str, experience: float, 
-                         previous_question: str, previous_answer: str, covered_topics: list) -> str:
+def ask_technical_question(tech_stack: str, difficulty: float, position: str = None, experience: float = None) -> str:
     """
-    Generates a follow-up technical question based on the candidate's previous answer.
+    Generates ONE scenario-based technical interview question
+    appropriate to the candidate's experience level, position, and tech stack.
+    See _technical_question_prompt for the arguments.
+    """
+    prompt = _technical_question_prompt(tech_stack, difficulty, position, experience)
+    return _clean_question(call_groq_api(prompt, timeout=180, call_site="technical_question"))
+
+async def ask_technical_question_async(tech_stack: str, difficulty: float, position: str = None, experience: float = None,
+                                       use_cache: bool = True) -> str:
+    """
+    Asyncio version of ask_technical_question.
+    use_cache=False always asks the model for a fresh question.
+    """
+    prompt = _technical_question_prompt(tech_stack, difficulty, position, experience)
+    return _clean_question(await call_groq_api_async(
+        prompt, timeout=180, call_site="technical_question", use_cache=use_cache
+    ))
+
+def _followup_question_prompt(tech_stack: str, difficulty: float, position: str, experience: float,
+                              previous_question: str, previous_answer: str, covered_topics: list) -> list:
+    """
+    Builds the prompt for a follow-up technical question based on the candidate's previous answer.
     Maintains continuity while respecting tech stack, experience, and difficulty.
 
     Args:
@@ -133,91 +491,60 @@ def ask_followup_question(tech_stack: str, difficulty: float, position: str, exp
         covered_topics (list): List of topics already covered.
         previous_answer (str): The candidate's answer to the previous question.
     """
+    return FOLLOWUP_QUESTION.render_messages(
+        tech_stack=tech_stack,
+        experience_level=experience_band(experience)[1],
+        position=position,
+        difficulty=difficulty,
+        previous_question=previous_question,
+        previous_answer=previous_answer,
+        covered_topics=covered_topics
+    )
 
-    # Build experience level description
-    if experience is not None:
-        if experience < 1:
-            exp_level = "entry-level with less than 1 year of experience"
-        elif experience <= 2:
-            exp_level = "junior with 1-2 years of experience"
-        elif experience <= 5:
-            exp_level = "mid-level with 3-5 years of experience"
-        elif experience <= 10:
-            exp_level = "senior with 6-10 years of experience"
-        else:
-            exp_level = "very senior with 10+ years of experience"
-    else:
-        exp_level = "unknown experience level"
-
-    # Build position context
-    position_context = f"\nPosition applying for: {position}" if position else ""
-    
-    prompt = f"""
-You are a technical interviewer conducting a live screening interview.
-
-Candidate profile:
-- Tech stack: {tech_stack}
-- Experience level: {exp_level}{position_context}
-- Interview difficulty (internal): {difficulty} out of 5
-
-Previous question asked:
-{previous_question}
-
-Candidate's answer:
-{previous_answer}
-
-Topics already covered in interview: {", ".join(covered_topics) if covered_topics else "None yet"}
-
-Question requirements:
-- Generate ONE follow-up question that builds upon or relates to their previous answer
-- If they mentioned a specific technology, tool, or concept in their answer, you can ask about it
-- If their answer was strong, ask a slightly deeper question on a related topic
-- If their answer was weak or they skipped, move to a different but related area
-- Maintain the same tech stack focus: {tech_stack}
-- Keep the difficulty appropriate for {exp_level}
-- The question MUST be scenario-based (realistic workplace situation)
-- The scenario should be small and focused (not a full system design)
-- For junior roles: focus on fundamentals, basic problem-solving, and core concepts
-- For mid-level roles: focus on practical application, best practices, and trade-offs
-- For senior roles: focus on complex scenarios, architecture decisions, and optimization
-- Ask what the candidate would do, explain, or expect to happen
-- DO NOT ask full system design or architecture questions
-- The question should be answerable verbally in 2–5 minutes
-- Make it relevant to the actual work they would do in the {position if position else 'role'}
-- If continuing on the same topic, you may go deeper; otherwise feel free to connect to related areas within their tech stack
-- Try to touch upon different aspects of their tech stack over the course of the interview
-- Extract the main technology/topic from your question and append it at the end like this: [TOPIC: topic_name]
-
-Return ONLY the question text, nothing else.
-"""
-
-    raw = call_groq_api(prompt, timeout=180)
-
-    # If the model adds an intro ending with a colon, strip it
-    if ":" in raw.split("\n", 1)[0]:
-        raw = raw.split(":", 1)[-1].strip()
-
-    # Remove emojis and non-ASCII symbols
-    raw = re.sub(r"[^\x00-\x7F]+", "", raw)
-
-    # Remove wrapping quotes if any
-    raw = raw.strip().strip('"')
+def _clean_followup_question(raw: str, covered_topics: list) -> str:
+    raw = _clean_question(raw)
 
     # Extract topic if present
-    topic_match = re.search(r'\[TOPIC:\s*([^\]]+)\]', raw)
+    topic_match = _TOPIC_TAG.search(raw)
     if topic_match:
         topic = topic_match.group(1).strip()
         if topic not in covered_topics:
             covered_topics.append(topic)
         # Remove the topic tag from the question
-        raw = re.sub(r'\[TOPIC:\s*[^\]]+\]', '', raw).strip()
+        raw = _TOPIC_TAG.sub('', raw).strip()
 
     return raw
 
-def ask_new_topic_question(tech_stack: str, difficulty: float, position: str, experience: float,
-                          covered_topics: list, question_history: list) -> str:
+def ask_followup_question(tech_stack: str, difficulty: float, position: str, experience: float, 
+                         previous_question: str, previous_answer: str, covered_topics: list) -> str:
+    """
+    Generates a follow-up technical question based on the candidate's previous answer.
+    New topics are appended to covered_topics. See _followup_question_prompt for the arguments.
+    """
+    prompt = _followup_question_prompt(tech_stack, difficulty, position, experience,
+                                       previous_question, previous_answer, covered_topics)
+    return _clean_followup_question(call_groq_api(prompt, timeout=180, call_site="followup_question"), covered_topics)
+
+async def ask_followup_question_async(tech_stack: str, difficulty: float, position: str, experience: float,
+                                      previous_question: str, previous_answer: str, covered_topics: list,
+                                      on_delta=None) -> str:
+    """
+    Asyncio version of ask_followup_question.
+    If on_delta is given, the question is streamed and on_delta(preview) is
+    called with the cleaned text generated so far.
     """
-    Generates a technical question from a NEW topic in the tech stack
+    prompt = _followup_question_prompt(tech_stack, difficulty, position, experience,
+                                       previous_question, previous_answer, covered_topics)
+    if on_delta is not None:
+        raw = await _stream_question_async(prompt, on_delta, timeout=180, call_site="followup_question")
+    else:
+        raw = await call_groq_api_async(prompt, timeout=180, call_site="followup_question")
+    return _clean_followup_question(raw, covered_topics)
+
+def _new_topic_question_prompt(tech_stack: str, difficulty: float, position: str, experience: float,
+                               covered_topics: list, question_history: list) -> list:
+    """
+    Builds the prompt for a technical question from a NEW topic in the tech stack
     that hasn't been covered yet or is underrepresented.
     
     Args:
@@ -228,120 +555,95 @@ def ask_new_topic_question(tech_stack: str, difficulty: float, position: str, ex
         covered_topics (list): List of topics already covered.
         question_history (list): List of all questions asked so far.
     """
-    
-    # Build experience level description
-    if experience is not None:
-        if experience < 1:
-            exp_level = "entry-level with less than 1 year of experience"
-        elif experience <= 2:
-            exp_level = "junior with 1-2 years of experience"
-        elif experience <= 5:
-            exp_level = "mid-level with 3-5 years of experience"
-        elif experience <= 10:
-            exp_level = "senior with 6-10 years of experience"
-        else:
-            exp_level = "very senior with 10+ years of experience"
-    else:
-        exp_level = "unknown experience level"
-    
-    # Build covered topics context
-    covered_str = ", ".join(covered_topics) if covered_topics else "None yet"
-    
-    position_context = f"\nPosition applying for: {position}" if position else ""
-    
-    prompt = f"""
-You are a technical interviewer conducting a live screening interview.
-
-Candidate profile:
-- Tech stack: {tech_stack}
-- Experience level: {exp_level}{position_context}
-- Interview difficulty (internal): {difficulty} out of 5
-
-Topics already covered: {covered_str}
-
-Question requirements:
-- Ask ONE question from a DIFFERENT topic/technology from their tech stack that hasn't been thoroughly explored yet
-- Focus on technologies or concepts from their stack that are NOT in the covered topics list
-- The question MUST be scenario-based (realistic workplace situation)
-- Tailor the complexity to match their experience level ({exp_level})
-- The scenario should be small and focused (not a full system design)
-- For junior roles: focus on fundamentals, basic problem-solving, and core concepts
-- For mid-level roles: focus on practical application, best practices, and trade-offs
-- For senior roles: focus on complex scenarios, architecture decisions, and optimization
-- Ask what the candidate would do, explain, or expect to happen
-- DO NOT ask full system design or architecture questions
-- The question should be answerable verbally in 2–5 minutes
-- Make it relevant to the actual work they would do in the {position if position else 'role'}
-- Extract the main technology/topic from your question and append it at the end like this: [TOPIC: topic_name]
-
-Return ONLY the question text with the topic tag, nothing else.
-"""
-    
-    raw = call_groq_api(prompt, timeout=180)
-    
+    return NEW_TOPIC_QUESTION.render_messages(
+        tech_stack=tech_stack,
+        experience_level=experience_band(experience)[1],
+        position=position,
+        difficulty=difficulty,
+        covered_topics=covered_topics
+    )
+
+def _clean_new_topic_question(raw: str, covered_topics: list) -> str:
     # Extract topic if present
-    topic_match = re.search(r'\[TOPIC:\s*([^\]]+)\]', raw)
+    topic_match = _TOPIC_TAG.search(raw)
     if topic_match:
         topic = topic_match.group(1).strip()
         covered_topics.append(topic)
         # Remove the topic tag from the question
-        raw = re.sub(r'\[TOPIC:\s*[^\]]+\]', '', raw).strip()
+        raw = _TOPIC_TAG.sub('', raw).strip()
     
     # If the model adds an intro ending with a colon, strip it
     if ":" in raw.split("\n", 1)[0]:
         raw = raw.split(":", 1)[-1].strip()
     
     # Remove emojis and non-ASCII symbols
-    raw = re.sub(r"[^\x00-\x7F]+", "", raw)
+    raw = _NON_ASCII.sub("", raw)
     
     # Remove wrapping quotes if any
     raw = raw.strip().strip('"')
     
     return raw
 
-def evaluate_answer(question: str, answer: str, difficulty: float, time_taken: int) -> dict:
+def ask_new_topic_question(tech_stack: str, difficulty: float, position: str, experience: float,
+                          covered_topics: list, question_history: list) -> str:
     """
-    Evaluates the candidate's answer and provides a score out of 10.
-    
-    Args:
-        question (str): The question asked.
-        answer (str): The candidate's answer.
-        difficulty (float): Difficulty level of the question (1-5).
-        time_taken (int): Time taken to answer in seconds.
-    
-    Returns:
-        dict: Contains 'passed' (bool) and 'score' (float out of 10)
+    Generates a technical question from a NEW topic in the tech stack.
+    The extracted topic is appended to covered_topics. See _new_topic_question_prompt for the arguments.
     """
-    
-    # Handle skipped or timeout answers
-    if answer.lower().strip() in {"pass", "skip", "idk", "i don't know", "don't know", "no idea", "not sure", "n/a"}:
-        return {"passed": False, "score": 0.0}
-    
-    if "[AUTO-SUBMITTED: TIME EXPIRED]" in answer:
-        return {"passed": False, "score": 0.0}
-    
-    prompt = f"""
-You are an expert technical interviewer evaluating a candidate's answer.
-
-Interview Question (Difficulty: {difficulty}/5):
-{question}
+    prompt = _new_topic_question_prompt(tech_stack, difficulty, position, experience,
+                                        covered_topics, question_history)
+    return _clean_new_topic_question(call_groq_api(prompt, timeout=180, call_site="new_topic_question"), covered_topics)
 
-Candidate's Answer:
-{answer}
+async def ask_new_topic_question_async(tech_stack: str, difficulty: float, position: str, experience: float,
+                                       covered_topics: list, question_history: list, on_delta=None) -> str:
+    """
+    Asyncio version of ask_new_topic_question.
+    If on_delta is given, the question is streamed (see ask_followup_question_async).
+    """
+    prompt = _new_topic_question_prompt(tech_stack, difficulty, position, experience,
+                                        covered_topics, question_history)
+    if on_delta is not None:
+        raw = await _stream_question_async(prompt, on_delta, timeout=180, call_site="new_topic_question")
+    else:
+        raw = await call_groq_api_async(prompt, timeout=180, call_site="new_topic_question")
+    return _clean_new_topic_question(raw, covered_topics)
 
-Time taken to answer: {time_taken} seconds (out of 180 seconds limit)
+def _short_circuit_evaluation(question: str, answer: str):
+    """
+    Returns a local evaluation for skipped, timed out, empty or nonsensical
+    answers (see prescorer.py), or None if the answer needs to be sent to
+    the LLM.
+    """
+    return PRESCORER.prescore(question, answer)
 
-Evaluation criteria:
+# Shared by the single and batch evaluation prompts so re-grades use the same rubric
+EVALUATION_CRITERIA = """Evaluation criteria:
 1. Technical Accuracy (30%): Is the answer technically correct?
 2. Depth of Understanding (25%): Does it show deep understanding or just surface knowledge?
 3. Clarity and Communication (20%): Is the explanation clear and well-structured?
 4. Practical Application (15%): Does the answer show practical experience?
-5. Completeness (10%): Does it address all aspects of the question?
+5. Completeness (10%): Does it address all aspects of the question?"""
 
-Time efficiency bonus:
+TIME_EFFICIENCY_RULES = """Time efficiency bonus:
 - Answered in < 90 seconds: +0.5 points
 - Answered in 90-150 seconds: No change
-- Answered in > 150 seconds: -0.3 points
+- Answered in > 150 seconds: -0.3 points"""
+
+DIFFICULTY_EXPECTATIONS = """Consider the difficulty level when scoring:
+- For difficulty 1-2 (junior): Basic understanding is sufficient for passing
+- For difficulty 3-4 (mid-level): Expect good practical knowledge
+- For difficulty 5 (senior): Expect deep expertise and optimization thinking"""
+
+# Static instructions go in the system message, ahead of the answer being
+# scored, so every evaluation request starts with the same cacheable prefix
+EVALUATION_SYSTEM = f"""
+You are an expert technical interviewer evaluating a candidate's answer.
+
+{EVALUATION_CRITERIA}
+
+{TIME_EFFICIENCY_RULES}
+
+{DIFFICULTY_EXPECTATIONS}
 
 Respond with ONLY a JSON object in this exact format (no markdown, no extra text):
 {{"score": X.X, "passed": true/false}}
@@ -349,52 +651,226 @@ Respond with ONLY a JSON object in this exact format (no markdown, no extra text
 Where:
 - score: A decimal number between 0.0 and 10.0
 - passed: true if score >= 5.0, false otherwise
+""".strip()
 
-Consider the difficulty level when scoring:
-- For difficulty 1-2 (junior): Basic understanding is sufficient for passing
-- For difficulty 3-4 (mid-level): Expect good practical knowledge
-- For difficulty 5 (senior): Expect deep expertise and optimization thinking
-"""
+def _evaluation_prompt(question: str, answer: str, difficulty: float, time_taken: int) -> list:
+    return chat_messages(EVALUATION_SYSTEM, f"""Interview Question (Difficulty: {difficulty}/5):
+{question}
+
+Candidate's Answer:
+{answer}
+
+Time taken to answer: {time_taken} seconds (out of 180 seconds limit)
+""")
 
-    raw = call_groq_api(prompt, timeout=180)
+def _parse_evaluation(raw: str):
+    """Returns {'passed', 'score'} or None if the response can't be parsed"""
+    result = parse_response(raw, EvaluationResult, "evaluation")
+    if result is None:
+        return None
+    return {"passed": result.passed, "score": result.score}
+
+def evaluate_answer(question: str, answer: str, difficulty: float, time_taken: int) -> dict:
+    """
+    Evaluates the candidate's answer and provides a score out of 10.
     
-    # Clean up response - remove markdown code blocks if present
-    raw = re.sub(r'```json\s*|\s*```', '', raw).strip()
+    Args:
+        question (str): The question asked.
+        answer (str): The candidate's answer.
+        difficulty (float): Difficulty level of the question (1-5).
+        time_taken (int): Time taken to answer in seconds.
     
+    Returns:
+        dict: Contains 'passed' (bool) and 'score' (float out of 10).
+        Scores from the local model (EVAL_BACKEND, see local_scorer.py)
+        also carry 'provisional': True.
+    """
+    shortcut = _short_circuit_evaluation(question, answer)
+    if shortcut is not None:
+        return shortcut
+    if EVAL_BACKEND == "local" and LOCAL_SCORER.available:
+        return LOCAL_SCORER.evaluate(question, answer, difficulty)
+
     try:
-        # Replace JavaScript boolean values with Python ones
-        raw = raw.replace('true', 'True').replace('false', 'False')
-        result = eval(raw)  # Using eval for simple dict parsing
-        score = float(result.get("score", 0.0))
-        passed = result.get("passed", False)
-        
-        # Ensure score is within bounds
-        score = max(0.0, min(10.0, score))
-        
-        return {"passed": passed, "score": score}
-    except Exception as e:
-        print(f"⚠️ Error parsing evaluation result: {e}")
-        print(f"Raw response: {raw}")
-        # Fallback: basic keyword check
-        if any(word in answer.lower() for word in ["correct", "yes", "good", "right"]):
-            return {"passed": True, "score": 6.0}
-        return {"passed": False, "score": 3.0}
-    
-def rate_candidate(candidate_info: dict, questions_data: list) -> float:
+        evaluation = _evaluate_with_llm(question, answer, difficulty, time_taken)
+    except TransientError as e:
+        if not _local_fallback_enabled():
+            raise
+        _falling_back_to_local(e)
+        return LOCAL_SCORER.evaluate(question, answer, difficulty)
+    if EVAL_BACKEND == "shadow" and LOCAL_SCORER.available:
+        _record_shadow(LOCAL_SCORER.evaluate(question, answer, difficulty), evaluation)
+    return evaluation
+
+def _evaluate_with_llm(question: str, answer: str, difficulty: float, time_taken: int) -> dict:
+    prompt = _evaluation_prompt(question, answer, difficulty, time_taken)
+    for _ in range(LLM_PARSE_RETRIES + 1):
+        evaluation = _parse_evaluation(call_groq_api(prompt, timeout=180, call_site="evaluation"))
+        if evaluation is not None:
+            return evaluation
+    # A made-up score would be stored as if it were real; let the caller retry later
+    raise InvalidLLMResponseError("Evaluation response could not be parsed")
+
+def _local_fallback_enabled() -> bool:
+    return EVAL_BACKEND == "fallback" and LOCAL_SCORER.available
+
+def _falling_back_to_local(error: Exception):
+    metrics.increment("local_scorer_fallback")
+    print(f"🧮 LLM evaluation unavailable ({error}), using a provisional local score")
+
+def _record_shadow(local: dict, evaluation: dict):
+    LOCAL_SCORER.record_shadow(local["score"], evaluation["score"])
+    metrics.increment("local_scorer_shadow")
+    if local["passed"] != evaluation["passed"]:
+        metrics.increment("local_scorer_shadow_disagree")
+
+async def evaluate_answer_async(question: str, answer: str, difficulty: float, time_taken: int) -> dict:
+    """Asyncio version of evaluate_answer. The local model runs in a worker thread."""
+    shortcut = _short_circuit_evaluation(question, answer)
+    if shortcut is not None:
+        return shortcut
+    if EVAL_BACKEND == "local" and LOCAL_SCORER.available:
+        return await asyncio.to_thread(LOCAL_SCORER.evaluate, question, answer, difficulty)
+
+    try:
+        evaluation = await _evaluate_with_llm_async(question, answer, difficulty, time_taken)
+    except TransientError as e:
+        if not _local_fallback_enabled():
+            raise
+        _falling_back_to_local(e)
+        return await asyncio.to_thread(LOCAL_SCORER.evaluate, question, answer, difficulty)
+    if EVAL_BACKEND == "shadow" and LOCAL_SCORER.available:
+        _record_shadow(await asyncio.to_thread(LOCAL_SCORER.evaluate, question, answer, difficulty), evaluation)
+    return evaluation
+
+async def _evaluate_with_llm_async(question: str, answer: str, difficulty: float, time_taken: int) -> dict:
+    prompt = _evaluation_prompt(question, answer, difficulty, time_taken)
+    for _ in range(LLM_PARSE_RETRIES + 1):
+        raw = await call_groq_api_async(prompt, timeout=180, call_site="evaluation")
+        evaluation = _parse_evaluation(raw)
+        if evaluation is not None:
+            return evaluation
+    raise InvalidLLMResponseError("Evaluation response could not be parsed")
+    
+BATCH_EVALUATION_SYSTEM = f"""
+You are an expert technical interviewer evaluating candidates' answers.
+Score each item independently; items are unrelated to each other.
+
+{EVALUATION_CRITERIA}
+
+{TIME_EFFICIENCY_RULES}
+Apply the time bonus only to items where the time was recorded.
+
+{DIFFICULTY_EXPECTATIONS}
+
+Respond with ONLY a JSON object holding a JSON array with one result for every item (no markdown, no extra text):
+{{"results": [{{"id": 0, "score": X.X, "passed": true/false}}, ...]}}
+
+Where:
+- id: the item number
+- score: A decimal number between 0.0 and 10.0
+- passed: true if score >= 5.0, false otherwise
+""".strip()
+
+def _batch_evaluation_prompt(items: list) -> list:
     """
-    Rates the candidate out of 5 based on overall interview performance.
-    
+    One prompt scoring several answers. Items are numbered by their position
+    in `items`; time_taken is optional (historical rows don't record it).
+    """
+    blocks = []
+    for i, item in enumerate(items):
+        time_taken = item.get("time_taken")
+        timing = f"{time_taken} seconds (out of 180 seconds limit)" if time_taken is not None else "not recorded"
+        blocks.append(f"""--- Item {i} ---
+Interview Question (Difficulty: {item["difficulty"]}/5):
+{item["question"]}
+
+Candidate's Answer:
+{item["answer"]}
+
+Time taken to answer: {timing}""")
+    items_text = "\n\n".join(blocks)
+    return chat_messages(BATCH_EVALUATION_SYSTEM, f"Score these {len(items)} items:\n\n{items_text}\n")
+
+def _parse_batch_evaluation(raw: str, count: int) -> dict:
+    """Returns {item number: evaluation} for the items the model scored"""
+    data = parse_object(raw, "batch_evaluation")
+    if data is None:
+        return {}
+    return {
+        item.id: {"passed": item.passed, "score": item.score}
+        for item in validate_items(data.get("results"), BatchEvaluationItem, "batch_evaluation")
+        if 0 <= item.id < count
+    }
+
+async def evaluate_answers_batch_async(items: list) -> list:
+    """
+    Evaluates several answers with one LLM call.
+
     Args:
-        candidate_info (dict): Contains name, experience, position, tech_stack
-        questions_data (list): List of dicts with question, answer, score, difficulty
-    
+        items (list): Dicts with question, answer, difficulty and optionally
+            time_taken.
+
     Returns:
-        float: Rating out of 5.0
+        list: One {'passed', 'score'} dict per item, in order. Items the model
+        left out of its response are evaluated individually.
     """
-    
-    if not questions_data:
-        return 0.0
-    
+    results = [_short_circuit_evaluation(item["question"], item["answer"]) for item in items]
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+
+    raw = await call_groq_api_async(
+        _batch_evaluation_prompt([items[i] for i in pending]), timeout=180, call_site="batch_evaluation"
+    )
+    scored = _parse_batch_evaluation(raw, len(pending))
+    missing = []
+    for position, i in enumerate(pending):
+        if position in scored:
+            results[i] = scored[position]
+        else:
+            missing.append(i)
+
+    if missing:
+        metrics.increment("batch_evaluation_fallback", len(missing))
+        fallbacks = await asyncio.gather(*(
+            evaluate_answer_async(
+                items[i]["question"], items[i]["answer"], items[i]["difficulty"], items[i].get("time_taken") or 120
+            )
+            for i in missing
+        ))
+        for i, result in zip(missing, fallbacks):
+            results[i] = result
+    return results
+
+RATING_SYSTEM = """
+You are an expert technical hiring manager evaluating a candidate's overall interview performance.
+
+Rating criteria:
+1. Consistency (25%): Did they perform consistently across questions?
+2. Score Quality (30%): Average score relative to difficulty level
+3. Pass Rate (20%): Percentage of questions passed
+4. Experience Alignment (15%): Performance matches their experience level?
+5. Technical Depth (10%): Showed deep understanding vs surface knowledge
+
+Consider:
+- For junior candidates (0-2 years): Passing 60%+ is good
+- For mid-level (3-5 years): Passing 70%+ is expected
+- For senior (6+ years): Passing 80%+ is expected
+- Higher difficulty questions should be weighted more positively
+
+Respond with ONLY a JSON object in this exact format (no markdown, no extra text):
+{"rating": X.X, "justification": "brief reason"}
+
+Where rating is a decimal between 0.0 and 5.0:
+- 0.0-1.0: Poor performance, not recommended
+- 1.5-2.5: Below average, needs improvement
+- 3.0-3.5: Average, meets basic requirements
+- 4.0-4.5: Good performance, recommended
+- 4.5-5.0: Excellent performance, highly recommended
+""".strip()
+
+def _rating_prompt(candidate_info: dict, questions_data: list) -> list:
     # Calculate statistics
     total_questions = len(questions_data)
     total_score = sum(q["score"] for q in questions_data)
@@ -408,10 +884,7 @@ def rate_candidate(candidate_info: dict, questions_data: list) -> float:
         for i, q in enumerate(questions_data)
     ])
     
-    prompt = f"""
-You are an expert technical hiring manager evaluating a candidate's overall interview performance.
-
-Candidate Profile:
+    return chat_messages(RATING_SYSTEM, f"""Candidate Profile:
 - Name: {candidate_info.get('name', 'Unknown')}
 - Experience: {candidate_info.get('experience', 0)} years
 - Position Applied: {candidate_info.get('position', 'Unknown')}
@@ -425,50 +898,42 @@ Interview Performance Summary:
 
 Detailed Scores:
 {questions_summary}
+""")
 
-Rating criteria:
-1. Consistency (25%): Did they perform consistently across questions?
-2. Score Quality (30%): Average score relative to difficulty level
-3. Pass Rate (20%): Percentage of questions passed
-4. Experience Alignment (15%): Performance matches their experience level?
-5. Technical Depth (10%): Showed deep understanding vs surface knowledge
+def _parse_rating(raw: str, questions_data: list) -> float:
+    result = parse_response(raw, RatingResult, "rating")
+    if result is not None:
+        print(f"📊 Candidate Rating: {result.rating}/5.0")
+        print(f"💬 Justification: {result.justification or 'N/A'}")
+        return result.rating
 
-Consider:
-- For junior candidates (0-2 years): Passing 60%+ is good
-- For mid-level (3-5 years): Passing 70%+ is expected
-- For senior (6+ years): Passing 80%+ is expected
-- Higher difficulty questions should be weighted more positively
-
-Respond with ONLY a JSON object in this exact format (no markdown, no extra text):
-{{"rating": X.X, "justification": "brief reason"}}
+    # Fallback calculation from the stored scores, which are real
+    avg_score = sum(q["score"] for q in questions_data) / len(questions_data)
+    fallback_rating = (avg_score / 10.0) * 5.0
+    return round(min(5.0, max(0.0, fallback_rating)), 1)
 
-Where rating is a decimal between 0.0 and 5.0:
-- 0.0-1.0: Poor performance, not recommended
-- 1.5-2.5: Below average, needs improvement
-- 3.0-3.5: Average, meets basic requirements
-- 4.0-4.5: Good performance, recommended
-- 4.5-5.0: Excellent performance, highly recommended
-"""
-
-    raw = call_groq_api(prompt, timeout=180)
+def rate_candidate(candidate_info: dict, questions_data: list) -> float:
+    """
+    Rates the candidate out of 5 based on overall interview performance.
+    
+    Args:
+        candidate_info (dict): Contains name, experience, position, tech_stack
+        questions_data (list): List of dicts with question, answer, score, difficulty
     
-    # Clean up response
-    raw = re.sub(r'```json\s*|\s*```', '', raw).strip()
+    Returns:
+        float: Rating out of 5.0
+    """
     
-    try:
-        result = eval(raw)
-        rating = float(result.get("rating", 0.0))
-        
-        # Ensure rating is within bounds
-        rating = max(0.0, min(5.0, rating))
-        
-        print(f"📊 Candidate Rating: {rating}/5.0")
-        print(f"💬 Justification: {result.get('justification', 'N/A')}")
-        
-        return rating
-    except Exception as e:
-        print(f"⚠️ Error parsing rating result: {e}")
-        print(f"Raw response: {raw}")
-        # Fallback calculation
-        fallback_rating = (avg_score / 10.0) * 5.0
-        return round(min(5.0, max(0.0, fallback_rating)), 1)
\ No newline at end of file
+    if not questions_data:
+        return 0.0
+
+    raw = call_groq_api(_rating_prompt(candidate_info, questions_data), timeout=180, call_site="rating")
+    return _parse_rating(raw, questions_data)
+
+async def rate_candidate_async(candidate_info: dict, questions_data: list) -> float:
+    """Asyncio version of rate_candidate."""
+    if not questions_data:
+        return 0.0
+
+    raw = await call_groq_api_async(_rating_prompt(candidate_info, questions_data), timeout=180, call_site="rating")
+    return _parse_rating(raw, questions_data)
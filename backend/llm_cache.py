@@ -0,0 +1,217 @@
+# backend/llm_cache.py
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+load_dotenv()
+import metrics
+
+# Responses are cached per call site; call sites without a policy (answer
+# evaluation, follow-ups built from the candidate's answer, ratings) bypass it.
+LLM_CACHE = os.getenv("LLM_CACHE", "true").lower() in {"1", "true", "yes"}
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")  # Empty disables the on-disk tier
+LLM_CACHE_DISK_MAX_ENTRIES = int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "100000"))
+LLM_CACHE_QUESTION_VARIANTS = int(os.getenv("LLM_CACHE_QUESTION_VARIANTS", "3"))
+
+
+class CachePolicy:
+    """
+    How responses of one call site are cached.
+
+    Args:
+        ttl (float): Seconds a cached response stays valid.
+        variants (int): Distinct responses collected per prompt before the
+            cache starts answering; hits pick one of them at random so
+            candidates with the same profile don't all get the same text.
+    """
+
+    def __init__(self, ttl: float, variants: int = 1):
+        self.ttl = ttl
+        self.variants = max(1, variants)
+
+
+CACHE_POLICIES = {
+    "technical_question": CachePolicy(LLM_CACHE_TTL, LLM_CACHE_QUESTION_VARIANTS),
+}
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapses case and whitespace so trivially different prompts share an entry"""
+    prompt = re.sub(r"\s+", " ", prompt.strip().lower())
+    return re.sub(r"\s*,\s*", ",", prompt)
+
+
+def cache_key(call_site: str, payload: dict) -> str:
+    """Content address of a request: the call site, model parameters and normalized prompt"""
+    # max_tokens is left out: it is tuned from observed completion lengths
+    # and only bounds the output, so it must not split existing entries
+    material = {
+        "call_site": call_site,
+        "model": payload.get("model"),
+        "temperature": payload.get("temperature"),
+        "stop": payload.get("stop"),
+        "messages": [
+            {"role": m["role"], "content": normalize_prompt(m["content"])}
+            for m in payload.get("messages", [])
+        ]
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of raw LLM responses.
+
+    The memory tier is an LRU bounded to `size` keys. The optional disk tier
+    is a SQLite file shared by every worker on the host; it is bounded to
+    `disk_max_entries` rows, evicting the least recently used. Each entry
+    holds up to `variants` responses, all of which expire together.
+    """
+
+    def __init__(self, size: int = LLM_CACHE_SIZE, path: str = LLM_CACHE_PATH,
+                 disk_max_entries: int = LLM_CACHE_DISK_MAX_ENTRIES):
+        self.size = size
+        self.path = path
+        self.disk_max_entries = disk_max_entries
+        self._memory = OrderedDict()  # key -> (expires_at, [responses])
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if self.path:
+            conn = self._conn()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " call_site TEXT,"
+                " responses TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed ON llm_cache (accessed_at)")
+
+    @property
+    def disk_enabled(self) -> bool:
+        return bool(self.path)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _memory_get(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return entry
+
+    def _memory_put(self, key: str, expires_at: float, responses: list):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._memory[key] = (expires_at, responses)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.size:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str):
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT responses, expires_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] <= time.time():
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            return None
+        conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return row[1], json.loads(row[0])
+
+    def _disk_put(self, key: str, call_site: str, expires_at: float, responses: list):
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, call_site, responses, expires_at, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (key, call_site, json.dumps(responses), expires_at, now)
+        )
+        count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.disk_max_entries:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)",
+                (count - self.disk_max_entries,)
+            )
+            metrics.increment("llm_cache_disk_evictions", count - self.disk_max_entries)
+
+    def _entry(self, key: str):
+        entry = self._memory_get(key)
+        if entry is not None:
+            return entry, "memory"
+        if self.disk_enabled:
+            entry = self._disk_get(key)
+            if entry is not None:
+                self._memory_put(key, *entry)
+                return entry, "disk"
+        return None, None
+
+    def get(self, call_site: str, payload: dict):
+        """Returns a cached response for the request, or None on a miss or when the call site is not cacheable."""
+        policy = CACHE_POLICIES.get(call_site)
+        if not LLM_CACHE or policy is None:
+            return None
+
+        entry, tier = self._entry(cache_key(call_site, payload))
+        if entry is None or len(entry[1]) < policy.variants:
+            metrics.increment(f"llm_cache_miss.{call_site}")
+            return None
+        metrics.increment(f"llm_cache_hit.{call_site}.{tier}")
+        return random.choice(entry[1])
+
+    def put(self, call_site: str, payload: dict, response: str):
+        """Adds a fresh response for the request, if its call site is cacheable."""
+        policy = CACHE_POLICIES.get(call_site)
+        if not LLM_CACHE or policy is None:
+            return
+
+        key = cache_key(call_site, payload)
+        entry, _ = self._entry(key)
+        if entry is None:
+            entry = (time.time() + policy.ttl, [])
+        expires_at, responses = entry
+        if response in responses or len(responses) >= policy.variants:
+            return
+        responses = responses + [response]
+        self._memory_put(key, expires_at, responses)
+        if self.disk_enabled:
+            self._disk_put(key, call_site, expires_at, responses)
+
+    def cacheable(self, call_site: str) -> bool:
+        return LLM_CACHE and call_site in CACHE_POLICIES
+
+    def stats(self) -> dict:
+        with self._lock:
+            memory_entries = len(self._memory)
+        stats = {"memory_entries": memory_entries, "memory_size": self.size}
+        if self.disk_enabled:
+            stats["disk_entries"] = self._conn().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return stats
+
+
+CACHE = LLMResponseCache()
@@ -0,0 +1,146 @@
+# backend/llm_json.py
+import json
+import re
+
+from pydantic import ValidationError
+import metrics
+
+_FENCE = re.compile(r"```(?:json)?")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PYTHON_LITERAL = re.compile(r"\b(True|False|None)\b")
+_NUMBER_TAIL = re.compile(r"-?\d+(\.\d*)?([eE][+-]?\d*)?\s*$")
+
+
+def _scan(text: str):
+    """
+    Walks JSON text once and returns (closers for the brackets still open,
+    whether it ends inside a string, positions of commas outside strings,
+    end of the first complete top-level value or None).
+    """
+    stack, commas = [], []
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return stack, False, commas, i + 1
+        elif char == ",":
+            commas.append(i)
+    return stack, in_string, commas, None
+
+
+def _close(text: str) -> str:
+    stack, in_string, _, _ = _scan(text)
+    text = text.rstrip()
+    if in_string:
+        text += '"'
+    text = text.rstrip().rstrip(",:")
+    return text + "".join(reversed(stack))
+
+
+def repair_json(raw: str) -> str:
+    """
+    Best-effort fix for the ways models break JSON: code fences, text around
+    the object, Python literals, and output cut off by max_tokens (open
+    strings and brackets are closed, a dangling last member is dropped).
+    """
+    text = _FENCE.sub("", raw).strip()
+    start = text.find("{")
+    if start < 0:
+        return text
+    text = text[start:]
+
+    stack, _, commas, end = _scan(text)
+    if end is not None:
+        # Complete object: ignore anything the model wrote after it
+        text = text[:end]
+    text = _PYTHON_LITERAL.sub(lambda m: _PYTHON_LITERALS[m.group(1)], text)
+    if end is not None:
+        return text
+
+    # A number at the cut may be missing digits ("score": 1 of 10), so it is
+    # dropped rather than trusted
+    if not _NUMBER_TAIL.search(text):
+        candidate = _close(text)
+        try:
+            json.loads(candidate)
+            return candidate
+        except ValueError:
+            pass
+    # Drop members from the end until what is left closes into valid JSON
+    for comma in reversed(commas):
+        candidate = _close(text[:comma])
+        try:
+            json.loads(candidate)
+            return candidate
+        except ValueError:
+            continue
+    return text
+
+
+def parse_response(raw: str, model: type, call_site: str):
+    """
+    Validates an LLM response against a Pydantic model. The common case is a
+    single pass of pydantic-core over the raw string; the repair pass only
+    runs when that fails. Returns None (and counts a parse failure) if the
+    response can't be salvaged.
+    """
+    try:
+        return model.model_validate_json(raw)
+    except ValidationError:
+        pass
+
+    try:
+        result = model.model_validate_json(repair_json(raw))
+    except ValidationError as e:
+        metrics.increment(f"llm_parse_failure.{call_site}")
+        print(f"⚠️ Could not parse {call_site} response: {e.errors()[0]['msg'] if e.errors() else e}")
+        print(f"Raw response: {raw[:500]}")
+        return None
+    metrics.increment(f"llm_parse_repaired.{call_site}")
+    return result
+
+
+def _loads_object(text: str):
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_object(raw: str, call_site: str):
+    """Like parse_response, for responses validated piecewise: returns the decoded dict or None"""
+    data = _loads_object(raw)
+    if data is not None:
+        return data
+    data = _loads_object(repair_json(raw))
+    if data is not None:
+        metrics.increment(f"llm_parse_repaired.{call_site}")
+        return data
+    metrics.increment(f"llm_parse_failure.{call_site}")
+    print(f"⚠️ Could not parse {call_site} response: {raw[:500]}")
+    return None
+
+
+def validate_items(items, model: type, call_site: str) -> list:
+    """Validates each entry separately so one bad item doesn't discard the rest"""
+    valid = []
+    for item in items if isinstance(items, list) else []:
+        try:
+            valid.append(model.model_validate(item))
+        except ValidationError:
+            metrics.increment(f"llm_parse_failure.{call_site}.item")
+    return valid
@@ -0,0 +1,259 @@
+# backend/local_scorer.py
+"""
+CPU-only answer scoring model trained on historical (question, answer,
+difficulty, score) rows.
+
+Features: a TF-IDF (word 1-2 grams) of the answer reduced with truncated
+SVD, the TF-IDF cosine between question and answer, the difficulty, and
+the prescorer's length/language features. A gradient-boosted regressor
+predicts the 0-10 score. Needs the optional scikit-learn package
+(`pip install scikit-learn`); without it, or without a trained model file,
+the local backend reports itself unavailable and the LLM is used.
+
+Usage:
+    python local_scorer.py train                  # fit, print the agreement report, save
+    python local_scorer.py report --limit 2000    # agreement of the saved model on answers scored since training
+
+Serving is selected with EVAL_BACKEND (see llm.evaluate_answer):
+    llm       LLM only (default)
+    fallback  LLM, with a provisional local score when the LLM is unavailable
+    shadow    LLM, also scoring locally to track agreement in /metrics
+    local     local model only
+"""
+import argparse
+import os
+import threading
+from collections import deque
+
+import numpy as np
+from dotenv import load_dotenv
+load_dotenv()
+from prescorer import features as prescore_features, FEATURE_NAMES as PRESCORE_FEATURES
+import metrics
+
+EVAL_BACKEND = os.getenv("EVAL_BACKEND", "llm").lower()
+LOCAL_SCORER_MODEL = os.getenv("LOCAL_SCORER_MODEL", "local_scorer.joblib")
+
+_SVD_COMPONENTS = 64
+_MIN_TRAINING_ROWS = 200
+# Scores within this distance of the LLM's count as agreeing
+_AGREEMENT_TOLERANCE = 1.0
+_SHADOW_WINDOW = 1000
+
+
+def sklearn_available() -> bool:
+    try:
+        import sklearn  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _text_features(vectorizer, svd, questions: list, answers: list) -> np.ndarray:
+    answer_tfidf = vectorizer.transform(answers)
+    question_tfidf = vectorizer.transform(questions)
+    # Rows are L2-normalized, so the row-wise dot product is the cosine
+    overlap = np.asarray(answer_tfidf.multiply(question_tfidf).sum(axis=1))
+    return np.hstack([svd.transform(answer_tfidf), overlap])
+
+
+def _features(model: dict, questions: list, answers: list, difficulties: list) -> np.ndarray:
+    return np.hstack([
+        _text_features(model["vectorizer"], model["svd"], questions, answers),
+        np.array(difficulties, dtype=float).reshape(-1, 1),
+        np.array([prescore_features(q, a) for q, a in zip(questions, answers)])
+    ])
+
+
+def agreement_report(predicted, actual) -> dict:
+    """How closely local scores track LLM scores (0-10 scale, pass at 5)"""
+    predicted = np.asarray(predicted, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    if len(actual) == 0:
+        return {"samples": 0}
+    correlation = np.corrcoef(predicted, actual)[0, 1] if len(actual) > 1 and actual.std() and predicted.std() else None
+    return {
+        "samples": int(len(actual)),
+        "mae": round(float(np.abs(predicted - actual).mean()), 3),
+        "pearson_r": round(float(correlation), 3) if correlation is not None else None,
+        "within_1_point": round(float((np.abs(predicted - actual) <= _AGREEMENT_TOLERANCE).mean()), 3),
+        "pass_fail_agreement": round(float(((predicted >= 5.0) == (actual >= 5.0)).mean()), 3)
+    }
+
+
+def print_report(title: str, report: dict):
+    print(f"📊 {title}: {report['samples']} answers")
+    if report["samples"]:
+        print(f"   MAE {report['mae']}, r={report['pearson_r']}, within 1 point {report['within_1_point']:.1%}, "
+              f"pass/fail agreement {report['pass_fail_agreement']:.1%}")
+
+
+class LocalScorer:
+    """
+    In-process scorer loaded from a joblib file written by train(). Also
+    accumulates shadow-mode comparisons with live LLM scores.
+    """
+
+    def __init__(self, model: dict = None):
+        self.model = model
+        # Recent (local, LLM) score pairs from shadow mode
+        self._shadow = deque(maxlen=_SHADOW_WINDOW)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = LOCAL_SCORER_MODEL):
+        if not path or not os.path.exists(path):
+            return cls()
+        if not sklearn_available():
+            print(f"⚠️ {path} found but scikit-learn is not installed, local scoring disabled")
+            return cls()
+        import joblib
+        model = joblib.load(path)
+        if model.get("prescore_features") != PRESCORE_FEATURES:
+            print(f"⚠️ Ignoring {path}: trained on different features, retrain with `python local_scorer.py train`")
+            return cls()
+        print(f"🧮 Loaded local scoring model ({model['samples']} training answers)")
+        return cls(model)
+
+    @property
+    def available(self) -> bool:
+        return self.model is not None
+
+    def predict(self, questions: list, answers: list, difficulties: list) -> np.ndarray:
+        x = _features(self.model, questions, answers, difficulties)
+        return np.clip(self.model["regressor"].predict(x), 0.0, 10.0)
+
+    def evaluate(self, question: str, answer: str, difficulty: float) -> dict:
+        """Provisional evaluation in the shape evaluate_answer returns"""
+        with metrics.timed("local_scorer"):
+            score = round(float(self.predict([question], [answer], [difficulty])[0]), 1)
+        return {"passed": score >= 5.0, "score": score, "provisional": True, "source": "local"}
+
+    def record_shadow(self, local_score: float, llm_score: float):
+        with self._lock:
+            self._shadow.append((local_score, llm_score))
+
+    def stats(self) -> dict:
+        with self._lock:
+            pairs = list(self._shadow)
+        shadow = agreement_report([local for local, _ in pairs], [llm for _, llm in pairs])
+        return {
+            "backend": EVAL_BACKEND,
+            "model_loaded": self.available,
+            "training_report": self.model["report"] if self.model else None,
+            "shadow_agreement": shadow
+        }
+
+
+LOCAL_SCORER = LocalScorer.load() if EVAL_BACKEND != "llm" else LocalScorer()
+
+
+def train(rows) -> dict:
+    """
+    Fits the model on (id, question_text, answer_text, difficulty, score)
+    rows. A fifth of the rows (by id) is held out for the agreement report;
+    the saved model is then refit on all rows, and remembers the newest row
+    it saw so later reports only use unseen answers.
+    """
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    if len(rows) < _MIN_TRAINING_ROWS:
+        raise ValueError(f"Need at least {_MIN_TRAINING_ROWS} scored answers to train, have {len(rows)}")
+    questions = [r.question_text or "" for r in rows]
+    answers = [r.answer_text or "" for r in rows]
+    difficulties = [r.difficulty if r.difficulty is not None else 3.0 for r in rows]
+    scores = np.array([r.score for r in rows], dtype=float)
+    holdout = np.array([r.id % 5 == 0 for r in rows])
+
+    def fit(index) -> dict:
+        fit_questions = [questions[i] for i in index]
+        fit_answers = [answers[i] for i in index]
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=2, max_features=20000, sublinear_tf=True)
+        vectorizer.fit(fit_answers + fit_questions)
+        svd = TruncatedSVD(min(_SVD_COMPONENTS, len(vectorizer.vocabulary_) - 1), random_state=0)
+        svd.fit(vectorizer.transform(fit_answers))
+        model = {"vectorizer": vectorizer, "svd": svd}
+        x = _features(model, fit_questions, fit_answers, [difficulties[i] for i in index])
+        model["regressor"] = HistGradientBoostingRegressor(max_iter=300, learning_rate=0.05, random_state=0)
+        model["regressor"].fit(x, scores[index])
+        return model
+
+    held_out = np.flatnonzero(holdout)
+    evaluation = LocalScorer(fit(np.flatnonzero(~holdout)))
+    predicted = evaluation.predict([questions[i] for i in held_out], [answers[i] for i in held_out],
+                                   [difficulties[i] for i in held_out])
+    report = agreement_report(predicted, scores[held_out])
+    print_report("Holdout agreement with LLM scores", report)
+
+    model = fit(np.arange(len(rows)))
+    model.update({
+        "samples": len(rows),
+        "max_training_id": max(r.id for r in rows),
+        "prescore_features": PRESCORE_FEATURES,
+        "report": report
+    })
+    return model
+
+
+def load_rows(limit: int = None, after_id: int = None) -> list:
+    """LLM-scored answers; the model must not learn from its own provisional scores"""
+    from database import SessionLocal
+    from models import Question
+    from sqlalchemy import or_
+    db = SessionLocal()
+    try:
+        query = db.query(
+            Question.id, Question.question_text, Question.answer_text, Question.difficulty, Question.score
+        ).filter(
+            Question.answer_text.isnot(None),
+            Question.score.isnot(None),
+            or_(Question.score_source.is_(None), Question.score_source == "llm")
+        ).order_by(Question.id.desc())
+        if after_id is not None:
+            query = query.filter(Question.id > after_id)
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or check the local answer scoring model")
+    parser.add_argument("command", choices=["train", "report"])
+    parser.add_argument("--model", default=LOCAL_SCORER_MODEL, help="Model file")
+    parser.add_argument("--limit", type=int, help="Use only the most recent N scored answers")
+    args = parser.parse_args()
+
+    if not sklearn_available():
+        raise SystemExit("scikit-learn is required: pip install scikit-learn")
+    import joblib
+
+    if args.command == "train":
+        joblib.dump(train(load_rows(args.limit)), args.model)
+        print(f"✅ Wrote {args.model}")
+        return
+
+    scorer = LocalScorer.load(args.model)
+    if not scorer.available:
+        raise SystemExit(f"No usable model at {args.model}, run `python local_scorer.py train` first")
+    # The model was refit on every row up to max_training_id; scoring those
+    # again would only measure how well it remembers them
+    max_training_id = scorer.model.get("max_training_id")
+    rows = load_rows(args.limit, after_id=max_training_id) if max_training_id is not None else []
+    if not rows:
+        print("ℹ️ No answers scored since the model was trained, showing its training-time holdout report")
+        print_report("Holdout agreement with LLM scores (at training time)", scorer.model["report"])
+        return
+    predicted = scorer.predict(
+        [r.question_text or "" for r in rows],
+        [r.answer_text or "" for r in rows],
+        [r.difficulty if r.difficulty is not None else 3.0 for r in rows]
+    )
+    print_report("Agreement with LLM scores on answers newer than the training set", agreement_report(predicted, [r.score for r in rows]))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,62 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 import interview
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from schemas import CandidateCreate, AnswerRequest
 from interview import initial_difficulty, next_difficulty
-from llm import ask_technical_question, evaluate_answer
-import threading
+from llm import (
+    ask_technical_question_async,
+    ask_followup_question_async,
+    ask_new_topic_question_async,
+    evaluate_answer_async,
+    rate_candidate_async,
+    TransientError
+)
+from providers import ROUTER as LLM_ROUTER
+from generation import OUTPUT_LENGTHS as LLM_OUTPUT_LENGTHS
+from prescorer import PRESCORER, SKIP_ANSWERS, TIMEOUT_MARKER
+from local_scorer import LOCAL_SCORER, EVAL_BACKEND
+from rate_limiter import llm_priority, PRIORITY_BACKGROUND
+import asyncio
 import time
 import random
-from database import engine
-from models import Base
+import socket
+from database import engine, add_missing_columns
+from models import Base, Question, BankQuestion
+from http_client import close_clients, aclose_clients
+from llm_cache import CACHE as LLM_RESPONSE_CACHE
+from timers import DeadlineScheduler
+from session_store import get_session_store
+from events import EventBroker, format_sse
+from question_bank import QuestionBank, QUESTION_BANK
+from dedupe import near_duplicates, DEDUPE_QUESTIONS, DEDUPE_MAX_ATTEMPTS
+import metrics
 
 app = FastAPI(title="TalentScout Backend")
 
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(Question.__table__)
+    add_missing_columns(BankQuestion.__table__)
+    EVENTS.bind(asyncio.get_running_loop())
+    TIMERS.start()
+    if QUESTION_BANK:
+        BANK.start()
+    await recover_sessions()
+    LEASE_WATCH.append(spawn_background(watch_processing_leases()))
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    for task in LEASE_WATCH:
+        task.cancel()
+    await TIMERS.stop()
+    await BANK.stop()
+    close_clients()
+    await aclose_clients()
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -30,9 +69,172 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-INTERVIEWS = {}
-INTERVIEW_ID = 1
+# Live interview state lives behind a pluggable store (see session_store.py) so
+# several workers can share it. Endpoints read snapshots and write changes back
+# through the store; status transitions use compare-and-set. Code on the event
+# loop uses the awaitable a*() variants so a blocking store never stalls it.
+STORE = get_session_store()
+BOOT_TIME = datetime.utcnow()
+
+# The worker processing an answer holds a lease on it, renewed while it works
+# (including while waiting to retry). Other workers only take over answers
+# whose lease has expired, i.e. whose worker died or hung.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{BOOT_TIME.isoformat()}"
+PROCESSING_LEASE_SECONDS = float(os.getenv("PROCESSING_LEASE_SECONDS", "30"))
+LEASE_WATCH = []  # Task re-queueing answers with expired leases
+
+# Wakes /events streams when an interview changes state in this worker; streams
+# also re-read the store every tick, which picks up changes made by other workers
+EVENTS = EventBroker()
+SSE_TICK_SECONDS = float(os.getenv("SSE_TICK_SECONDS", "1"))
 OTP_STORE = {}  # Store OTPs with expiration
+
+# Background work runs as tasks on the event loop instead of one OS thread
+# per answer. The semaphore bounds how many answers are processed at once.
+BACKGROUND_CONCURRENCY = int(os.getenv("BACKGROUND_CONCURRENCY", "200"))
+BACKGROUND_SEMAPHORE = asyncio.Semaphore(BACKGROUND_CONCURRENCY)
+BACKGROUND_TASKS = set()  # Strong references so running tasks are not garbage collected
+
+def spawn_background(coro) -> asyncio.Task:
+    """Schedules a coroutine on the running event loop and keeps a reference to it"""
+    task = asyncio.create_task(coro)
+    BACKGROUND_TASKS.add(task)
+    task.add_done_callback(BACKGROUND_TASKS.discard)
+    return task
+
+async def run_bounded(coro):
+    """Runs a coroutine once a background concurrency slot is free"""
+    async with BACKGROUND_SEMAPHORE:
+        return await coro
+
+def schedule_processing(interview_id: int):
+    """Queues process_next_question for an interview on the event loop"""
+    spawn_background(hold_processing_lease(interview_id, run_bounded(process_next_question(interview_id))))
+
+def processing_lease() -> dict:
+    """Session fields claiming (or renewing) an answer for this worker"""
+    return {
+        "processing_owner": WORKER_ID,
+        "processing_lease_until": datetime.utcnow() + timedelta(seconds=PROCESSING_LEASE_SECONDS)
+    }
+
+async def hold_processing_lease(interview_id: int, coro):
+    """Awaits coro while renewing this worker's lease on the interview's answer"""
+    async def renew():
+        while True:
+            await asyncio.sleep(PROCESSING_LEASE_SECONDS / 3)
+            if not await STORE.acompare_and_set(
+                interview_id, {"status": "processing", "processing_owner": WORKER_ID}, processing_lease()
+            ):
+                return
+
+    heartbeat = asyncio.create_task(renew())
+    try:
+        return await coro
+    finally:
+        heartbeat.cancel()
+
+# When the LLM provider is still failing (rate limited, 5xx, timeouts, open
+# circuit) after the call layer's own retries, the answer is processed again
+# later instead of ending the interview
+LLM_RECOVERY_ATTEMPTS = int(os.getenv("LLM_RECOVERY_ATTEMPTS", "5"))
+LLM_RECOVERY_MIN_DELAY = 2.0
+
+def recovery_delay(error: TransientError) -> float:
+    return max(error.retry_after, LLM_ROUTER.paused_for(), LLM_RECOVERY_MIN_DELAY)
+
+async def defer_processing(interview_id: int, delay: float) -> bool:
+    """Re-queues an answer whose evaluation failed transiently; False once out of attempts"""
+    attempts = await STORE.aincrement(interview_id, "llm_recovery_retries")
+    if attempts is None or attempts > LLM_RECOVERY_ATTEMPTS:
+        return False
+
+    async def retry_later():
+        await asyncio.sleep(delay)
+        schedule_processing(interview_id)
+
+    spawn_background(hold_processing_lease(interview_id, retry_later()))
+    return True
+
+# Speculative mode pre-generates the next new-topic question while the
+# candidate is still answering, and overlaps evaluation with generation
+SPECULATIVE_QUESTIONS = os.getenv("SPECULATIVE_QUESTIONS", "false").lower() in {"1", "true", "yes"}
+SPECULATIONS = {}  # interview_id -> pending speculative question
+# Speculations not used this long after their question's deadline are dropped
+SPECULATION_GRACE_SECONDS = 60
+
+# Pipelined mode generates the next question at a predicted difficulty while the
+# answer is evaluated, and writes the score to the DB off the critical path.
+# A predicted question is kept when it is within the tolerance of the real
+# next difficulty, otherwise it is regenerated. The interview always continues
+# from the evaluated difficulty. Difficulty moves +0.2 on a pass and -0.5 on a
+# fail, so the default keeps a question only when the outcome matched or the
+# miss was the smaller pass step.
+PIPELINED_PROCESSING = os.getenv("PIPELINED_PROCESSING", "false").lower() in {"1", "true", "yes"}
+PIPELINE_DIFFICULTY_TOLERANCE = float(os.getenv("PIPELINE_DIFFICULTY_TOLERANCE", "0.25"))
+PENDING_WRITES = {}  # interview_id -> DB write tasks not awaited yet
+
+# Stream the next question from the LLM and push it to /events as it is written.
+# Only questions generated after the evaluation are streamed; speculative and
+# pipelined ones may be discarded, so they are not shown early.
+STREAM_QUESTIONS = os.getenv("STREAM_QUESTIONS", "true").lower() in {"1", "true", "yes"}
+
+# One deadline heap for all interviews replaces the per-question timer threads
+TIMERS = DeadlineScheduler()
+
+# Pre-generated first and new-topic questions (enabled with QUESTION_BANK)
+BANK = QuestionBank()
+
+def schedule_timeout(interview_id: int, interview: dict):
+    """Arms the auto-submit deadline for the interview's current question"""
+    deadline = interview["question_started_at"] + timedelta(seconds=interview["time_limit"])
+    question_count = interview["question_count"]
+    TIMERS.schedule(interview_id, deadline, lambda key: spawn_background(handle_timeout(key, question_count)))
+
+async def recover_sessions():
+    """
+    Resume interviews that were live before a restart: re-arm the deadline of
+    every ready question and re-queue answers that were left half-processed.
+    """
+    for interview_id in await STORE.aids_with_status(["ready"]):
+        interview = await STORE.aget(interview_id)
+        if interview:
+            schedule_timeout(interview_id, interview)
+    await recover_expired_leases()
+
+async def recover_expired_leases():
+    """Re-queues answers whose processing lease expired without being renewed"""
+    now = datetime.utcnow()
+    for interview_id in await STORE.aids_with_status(["processing"]):
+        interview = await STORE.aget(interview_id)
+        if not interview:
+            continue
+        # Sessions written before leases existed expire a lease after they started processing
+        lease_until = interview.get("processing_lease_until") or (
+            interview.get("processing_started_at", now) + timedelta(seconds=PROCESSING_LEASE_SECONDS)
+        )
+        if lease_until > now:
+            continue
+        # The CAS on the old lease ensures a single worker takes it over
+        if await STORE.acompare_and_set(
+            interview_id,
+            {
+                "status": "processing",
+                "processing_owner": interview.get("processing_owner"),
+                "processing_lease_until": interview.get("processing_lease_until")
+            },
+            processing_lease()
+        ):
+            print(f"♻️ Recovering interview {interview_id} from expired lease of {interview.get('processing_owner')}")
+            schedule_processing(interview_id)
+
+async def watch_processing_leases():
+    while True:
+        await asyncio.sleep(PROCESSING_LEASE_SECONDS)
+        try:
+            await recover_expired_leases()
+        except Exception as e:
+            print(f"❌ Lease recovery failed: {e}")
     
 @app.get("/")
 def root():
@@ -41,12 +243,322 @@ def root():
         "status": "ok", 
         "message": "TalentScout Backend is running",
         "version": "1.0.0",
-        "active_interviews": len(INTERVIEWS)
+        "active_interviews": STORE.count(),
+        "background_tasks": len(BACKGROUND_TASKS),
+        "pending_timers": TIMERS.pending(),
+        "event_streams": EVENTS.subscriber_count()
     }
 
-def process_next_question(interview_id: int):
-    """Process the next question after evaluating the previous answer"""
-    interview = INTERVIEWS.get(interview_id)
+def save_question_score(interview_id: int, question: str, answer: str, difficulty: float, score: float,
+                        source: str = "llm"):
+    """Persist an evaluated answer (blocking, run off the event loop)"""
+    from database import SessionLocal
+    from models import Question
+
+    db = SessionLocal()
+
+    db_question = Question(
+        interview_id=interview_id,
+        question_text=question,
+        answer_text=answer,
+        difficulty=difficulty,
+        score=score,
+        score_source=source
+    )
+
+    db.add(db_question)
+    db.commit()
+    db.close()
+
+def score_source(evaluation: dict) -> str:
+    """Questions.score_source value for an evaluation (see models.Question)"""
+    return evaluation.get("source", "local" if evaluation.get("provisional") else "llm")
+
+def load_questions_data(interview_id: int) -> list:
+    """
+    Build the rating input from the stored answers. Provisional local scores
+    are left out (unless the local model is the only scorer); the rescore job
+    re-rates the interview once they are re-scored.
+    """
+    from database import SessionLocal
+    from models import Question
+    from sqlalchemy import or_
+
+    db = SessionLocal()
+    try:
+        query = db.query(Question).filter(Question.interview_id == interview_id)
+        if EVAL_BACKEND != "local":
+            query = query.filter(or_(Question.score_source.is_(None), Question.score_source != "local"))
+        rows = query.order_by(Question.id).all()
+        return [
+            {
+                "question": row.question_text,
+                "answer": row.answer_text,
+                "score": row.score if row.score else 0.0,
+                "difficulty": row.difficulty
+            }
+            for row in rows
+        ]
+    finally:
+        db.close()
+
+def save_candidate_rating(interview_id: int, candidate_rating: float):
+    """Store the final rating and close the interview record"""
+    from database import SessionLocal
+    from models import Interview
+
+    db = SessionLocal()
+
+    db_interview = db.query(Interview).filter(Interview.id == interview_id).first()
+    if db_interview:
+        db_interview.candidate_rating = candidate_rating
+        db_interview.ended_at = datetime.utcnow()
+        db_interview.status = "completed"
+        db.commit()
+
+    db.close()
+
+def choose_question_type(interview: dict, last: dict, question_number: int) -> str:
+    """Decide whether the next question is a 'followup' or a 'new_topic' one"""
+    # Check if answer was skipped (PASS) or timed out
+    was_skipped = last["answer"].lower().strip() in SKIP_ANSWERS
+    was_timeout = TIMEOUT_MARKER in last["answer"]
+
+    print(f"   Choosing next question type (skipped={was_skipped}, timeout={was_timeout})")
+
+    if was_skipped:
+        # User skipped - generate from new topic
+        return "new_topic"
+    if was_timeout:
+        # Timeout - 50% chance new topic, 50% followup
+        if random.random() < 0.5 or interview["last_question_type"] == "followup":
+            return "new_topic"
+        return "followup"
+    # Normal answer - alternate between followup and new topic
+    if interview["last_question_type"] == "followup" or question_number % 2 == 0:
+        return "new_topic"
+    return "followup"
+
+def predict_next_difficulty(interview: dict, last: dict = None) -> float:
+    """
+    Predict the difficulty of the next question before the evaluation returns.
+    Skipped and timed out answers always fail; otherwise the candidate is
+    assumed to repeat their previous result (pass for the first question).
+    """
+    if last is not None and evaluation_is_certain_fail(last["answer"]):
+        predicted_pass = False
+    else:
+        predicted_pass = interview.get("last_passed", True)
+    return next_difficulty(interview["difficulty"], predicted_pass)
+
+def evaluation_is_certain_fail(answer: str) -> bool:
+    return answer.lower().strip() in SKIP_ANSWERS or TIMEOUT_MARKER in answer
+
+def start_speculation(interview_id: int, interview: dict):
+    """
+    Pre-generate a new-topic question while the candidate answers the current one.
+    A new-topic question does not depend on the answer, so it can be ready by the
+    time the answer arrives. Only used when SPECULATIVE_QUESTIONS is enabled.
+    """
+    if not SPECULATIVE_QUESTIONS or interview["question_count"] >= 5:
+        return
+
+    difficulty = predict_next_difficulty(interview) if PIPELINED_PROCESSING else interview["difficulty"]
+    covered_topics = list(interview["covered_topics"])
+    # Speculation must not take rate-limit budget from answers being processed
+    with llm_priority(PRIORITY_BACKGROUND):
+        task = spawn_background(ask_new_topic_question_async(
+            interview["tech_stack"],
+            difficulty,
+            interview["candidate_info"]["position"],
+            interview["candidate_info"]["experience"],
+            covered_topics,
+            list(interview["question_history"])
+        ))
+    SPECULATIONS[interview_id] = {
+        "question_count": interview["question_count"],
+        "difficulty": difficulty,
+        "covered_topics": covered_topics,
+        "task": task,
+        "expires_at": time.monotonic() + interview["time_limit"] + SPECULATION_GRACE_SECONDS
+    }
+    expire_speculations()
+
+def discard_speculation(interview_id: int):
+    """Drops the interview's speculation; safe to call from worker threads"""
+    speculation = SPECULATIONS.pop(interview_id, None)
+    if speculation and not speculation["task"].done():
+        task = speculation["task"]
+        task.get_loop().call_soon_threadsafe(task.cancel)
+
+def expire_speculations():
+    """Drops speculations of interviews that were abandoned or moved to another worker"""
+    now = time.monotonic()
+    for interview_id, speculation in list(SPECULATIONS.items()):
+        if speculation["expires_at"] <= now:
+            discard_speculation(interview_id)
+
+def release_interview(interview_id: int):
+    """
+    Forgets the per-interview work of an interview that ended. Score writes
+    already started still complete, they are just no longer waited for.
+    """
+    discard_speculation(interview_id)
+    PENDING_WRITES.pop(interview_id, None)
+
+async def generate_question(interview_id: int, interview: dict, question_type: str, last: dict,
+                            difficulty: float, timings: dict = None, stream: bool = False):
+    """
+    Generate the next question of the given type at the given difficulty.
+    Works on a copy of covered_topics and returns (question, covered_topics, difficulty)
+    so a question generated ahead of time never touches the live interview state.
+    With stream=True, the question is published to /events while it is generated.
+    """
+    on_delta = None
+    if stream and STREAM_QUESTIONS:
+        # Called after the question count was advanced to the new question
+        question_number = interview["question_count"]
+        on_delta = lambda text: EVENTS.publish_preview(interview_id, question_number, text)
+    asked = interview["question_history"] + [interview["current_question"]]
+    with metrics.timed("generate_question", timings):
+        next_q, covered_topics = await _generate_question(
+            interview_id, interview, question_type, last, difficulty, on_delta
+        )
+        # Regenerate scenarios that repeat an earlier question, or a banked one
+        # another candidate may be served, in other words
+        attempts = 1
+        while DEDUPE_QUESTIONS and attempts < DEDUPE_MAX_ATTEMPTS:
+            duplicates = near_duplicates(next_q, asked)
+            if duplicates:
+                metrics.increment("question_near_duplicate")
+                print(f"♻️ Generated question repeats an earlier one, regenerating: {duplicates[0][:80]}...")
+            elif QUESTION_BANK and BANK.near_duplicates(interview["tech_stack"], next_q):
+                metrics.increment("question_near_duplicate_banked")
+                print(f"♻️ Generated question repeats a banked one, regenerating: {next_q[:80]}...")
+            else:
+                break
+            attempts += 1
+            next_q, covered_topics = await _generate_question(
+                interview_id, interview, question_type, last, difficulty
+            )
+    return next_q, covered_topics, difficulty
+
+async def _generate_question(interview_id: int, interview: dict, question_type: str, last: dict,
+                             difficulty: float, on_delta=None):
+    if question_type == "new_topic":
+        speculation = SPECULATIONS.pop(interview_id, None)
+        if (speculation
+                and speculation["question_count"] == interview["question_count"]
+                and speculation["difficulty"] == difficulty):
+            try:
+                next_q = await speculation["task"]
+                print(f"⚡ Using speculative new-topic question for interview {interview_id}")
+                return next_q, speculation["covered_topics"]
+            except Exception as e:
+                print(f"⚠️ Speculative question failed, generating live: {e}")
+        elif speculation:
+            speculation["task"].cancel()
+
+        covered_topics = list(interview["covered_topics"])
+        if QUESTION_BANK:
+            banked = await asyncio.to_thread(
+                BANK.take,
+                "new_topic",
+                interview["tech_stack"],
+                difficulty,
+                interview["candidate_info"]["position"],
+                interview["candidate_info"]["experience"],
+                interview["question_history"],
+                covered_topics
+            )
+            if banked:
+                next_q, topic = banked
+                if topic and topic not in covered_topics:
+                    covered_topics.append(topic)
+                print(f"🏦 Using banked new-topic question for interview {interview_id}")
+                return next_q, covered_topics
+
+        next_q = await ask_new_topic_question_async(
+            interview["tech_stack"],
+            difficulty,
+            interview["candidate_info"]["position"],
+            interview["candidate_info"]["experience"],
+            covered_topics,
+            interview["question_history"],
+            on_delta=on_delta
+        )
+        return next_q, covered_topics
+
+    discard_speculation(interview_id)
+    covered_topics = list(interview["covered_topics"])
+    next_q = await ask_followup_question_async(
+        interview["tech_stack"],
+        difficulty,
+        interview["candidate_info"]["position"],
+        interview["candidate_info"]["experience"],
+        last["question"],
+        last["answer"],
+        covered_topics,
+        on_delta=on_delta
+    )
+    return next_q, covered_topics
+
+async def produce_next_question(interview_id: int, interview: dict, question_type: str, last: dict,
+                                generation, timings: dict):
+    """
+    Returns (question, covered_topics) for the next question, using the
+    pipelined `generation` task if one was started and its difficulty is
+    within the tolerance of the evaluated interview["difficulty"].
+    """
+    if generation is not None:
+        next_q, covered_topics, generated_difficulty = await generation
+        if abs(generated_difficulty - interview["difficulty"]) > PIPELINE_DIFFICULTY_TOLERANCE:
+            # Misprediction outside the tolerance - regenerate at the real difficulty
+            metrics.increment("pipeline_regenerated")
+            print(f"🔁 Difficulty mispredicted ({generated_difficulty} vs {interview['difficulty']}), regenerating")
+            next_q, covered_topics, _ = await generate_question(
+                interview_id, interview, question_type, last, interview["difficulty"], timings, stream=True
+            )
+        elif generated_difficulty != interview["difficulty"]:
+            # Close enough to keep; the interview still continues from the evaluated difficulty
+            metrics.increment("pipeline_mispredicted")
+        return next_q, covered_topics
+
+    next_q, covered_topics, _ = await generate_question(
+        interview_id, interview, question_type, last, interview["difficulty"], timings, stream=True
+    )
+    return next_q, covered_topics
+
+async def timed_write(*save_args):
+    try:
+        with metrics.timed("db_write"):
+            await asyncio.to_thread(*save_args)
+    except Exception as e:
+        print(f"❌ Background score write failed: {e}")
+        raise
+
+def forget_write(interview_id: int, task: asyncio.Task):
+    writes = PENDING_WRITES.get(interview_id)
+    if writes is None:
+        return
+    if task in writes:
+        writes.remove(task)
+    if not writes:
+        PENDING_WRITES.pop(interview_id, None)
+
+async def flush_pending_writes(interview_id: int):
+    """Wait for the off-critical-path score writes of an interview"""
+    writes = PENDING_WRITES.pop(interview_id, [])
+    if writes:
+        await asyncio.gather(*writes, return_exceptions=True)
+
+async def process_next_question(interview_id: int):
+    """
+    Process the next question after evaluating the previous answer.
+    Works on a snapshot of the session and publishes the result with a
+    compare-and-set on status, so a termination in the meantime is never undone.
+    """
+    interview = await STORE.aget(interview_id)
     if not interview:
         print(f"❌ process_next_question: Interview {interview_id} not found")
         return
@@ -60,207 +572,162 @@ def process_next_question(interview_id: int):
     time_taken = int((datetime.utcnow() - last.get("timestamp", datetime.utcnow())).total_seconds())
     time_taken = min(time_taken, 180)  # Cap at 180 seconds
 
-    # Evaluate answer and get score
-    evaluation = evaluate_answer(
-        last["question"], 
-        last["answer"],
-        interview["difficulty"],
-        time_taken
+    # The strategy only depends on the answer text and history, not on the score
+    is_last_question = interview["question_count"] >= 5
+    question_type = None if is_last_question else choose_question_type(
+        interview, last, interview["question_count"] + 1
     )
-    passed = evaluation["passed"]
-    score = evaluation["score"]
-
-    from database import SessionLocal
-    from models import Question
 
-    db = SessionLocal()
+    timings = {}
+    started = time.perf_counter()
+
+    # Speculative/pipelined modes generate the next question while the answer is
+    # evaluated: speculative mode at the current difficulty, pipelined mode at the
+    # predicted post-evaluation difficulty (reconciled below).
+    generation = None
+    if (SPECULATIVE_QUESTIONS or PIPELINED_PROCESSING) and question_type is not None:
+        predicted = predict_next_difficulty(interview, last) if PIPELINED_PROCESSING else interview["difficulty"]
+        generation = spawn_background(
+            generate_question(interview_id, interview, question_type, last, predicted, timings)
+        )
+    else:
+        discard_speculation(interview_id)
 
-    db_question = Question(
-        interview_id=interview_id,
-        question_text=last["question"],
-        answer_text=last["answer"],
-        difficulty=interview["difficulty"],
-        score=score
-    )
-
-    db.add(db_question)
-    db.commit()
-    db.close()
+    try:
+        # Evaluate answer and get score
+        with metrics.timed("evaluate_answer", timings):
+            evaluation = await evaluate_answer_async(
+                last["question"], 
+                last["answer"],
+                interview["difficulty"],
+                time_taken
+            )
+        passed = evaluation["passed"]
+        score = evaluation["score"]
+
+        save_args = (
+            save_question_score,
+            interview_id,
+            last["question"],
+            last["answer"],
+            interview["difficulty"],
+            score,
+            score_source(evaluation)
+        )
+        if PIPELINED_PROCESSING:
+            # The score is only read back when rating, so don't wait for the write
+            write = spawn_background(timed_write(*save_args))
+            PENDING_WRITES.setdefault(interview_id, []).append(write)
+            write.add_done_callback(lambda task: forget_write(interview_id, task))
+        else:
+            with metrics.timed("db_write", timings):
+                await asyncio.to_thread(*save_args)
+    except TransientError as e:
+        if generation is not None:
+            generation.cancel()
+        delay = recovery_delay(e)
+        if await defer_processing(interview_id, delay):
+            print(f"⏳ Evaluation failed ({e}), retrying interview {interview_id} in {delay:.1f}s")
+            return
+        print(f"❌ Evaluation still failing after {LLM_RECOVERY_ATTEMPTS} attempts: {e}")
+        await STORE.atransition_status(interview_id, "processing", "completed")
+        release_interview(interview_id)
+        EVENTS.notify(interview_id)
+        return
+    except Exception as e:
+        print(f"❌ Error evaluating answer: {e}")
+        import traceback
+        traceback.print_exc()
+        if generation is not None:
+            generation.cancel()
+        await STORE.atransition_status(interview_id, "processing", "completed")
+        release_interview(interview_id)
+        EVENTS.notify(interview_id)
+        print(f"⚠️ Marking interview {interview_id} as completed due to error")
+        return
 
     print(f"📝 Question scored: {score}/10 (Passed: {passed})")
+    if interview.get("llm_recovery_retries"):
+        await STORE.aupdate(interview_id, {"llm_recovery_retries": 0})
 
     interview["difficulty"] = next_difficulty(interview["difficulty"], passed)
+    interview["last_passed"] = passed
     interview["question_count"] += 1
     
     print(f"📊 Question count after increment: {interview['question_count']}")
 
     if interview["question_count"] > 5:
-        interview["status"] = "completed"
+        await STORE.atransition_status(interview_id, "processing", "completed", {
+            "difficulty": interview["difficulty"],
+            "last_passed": passed,
+            "question_count": interview["question_count"]
+        })
+        EVENTS.notify(interview_id)
         print(f"✅ Interview {interview_id} completed after {interview['question_count']} questions")
         
         # Calculate and save candidate rating
-        from llm import rate_candidate
-        from database import SessionLocal
-        from models import Interview
-        
-        db = SessionLocal()
-        
-        questions_data = [
-            {
-                "question": ans["question"],
-                "answer": ans["answer"],
-                "score": 0.0,
-                "difficulty": interview["difficulty"]
-            }
-            for ans in interview["answers"]
-        ]
-        
-        db_interview = db.query(Interview).filter(Interview.id == interview_id).first()
-        if db_interview and db_interview.questions:
-            for i, db_q in enumerate(db_interview.questions):
-                if i < len(questions_data):
-                    questions_data[i]["score"] = db_q.score if db_q.score else 0.0
-                    questions_data[i]["difficulty"] = db_q.difficulty
-        
-        candidate_rating = rate_candidate(interview["candidate_info"], questions_data)
-        
-        if db_interview:
-            db_interview.candidate_rating = candidate_rating
-            db_interview.ended_at = datetime.utcnow()
-            db_interview.status = "completed"
-            db.commit()
-        
-        db.close()
+        try:
+            await flush_pending_writes(interview_id)
+            questions_data = await asyncio.to_thread(load_questions_data, interview_id)
+            if not questions_data:
+                # Every score is provisional: leave the rating to the rescore job
+                await asyncio.to_thread(save_candidate_rating, interview_id, None)
+                print(f"⏳ Rating of interview {interview_id} deferred until its provisional scores are re-scored")
+                return
+            candidate_rating = await rate_candidate_async(interview["candidate_info"], questions_data)
+            await asyncio.to_thread(save_candidate_rating, interview_id, candidate_rating)
+        except Exception as e:
+            print(f"❌ Error rating candidate: {e}")
+            import traceback
+            traceback.print_exc()
+            return
         
         print(f"⭐ Candidate rated: {candidate_rating}/5.0")
         return  # EXIT FUNCTION - interview is complete
-    
-        print(f"➡️ Continuing to generate next question...")
-        
-        # Calculate candidate rating
-        from llm import rate_candidate
-        from database import SessionLocal
-        from models import Interview
-        
-        db = SessionLocal()
-        
-        # Prepare questions data for rating
-        questions_data = [
-            {
-                "question": ans["question"],
-                "answer": ans["answer"],
-                "score": 0.0,  # Will be fetched from DB
-                "difficulty": interview["difficulty"]
-            }
-            for ans in interview["answers"]
-        ]
-        
-        # Fetch actual scores from database
-        db_interview = db.query(Interview).filter(Interview.id == interview_id).first()
-        if db_interview and db_interview.questions:
-            for i, db_q in enumerate(db_interview.questions):
-                if i < len(questions_data):
-                    questions_data[i]["score"] = db_q.score if db_q.score else 0.0
-                    questions_data[i]["difficulty"] = db_q.difficulty
-        
-        # Rate candidate
-        candidate_rating = rate_candidate(interview["candidate_info"], questions_data)
-        
-        # Update interview record with rating and end time
-        if db_interview:
-            db_interview.candidate_rating = candidate_rating
-            db_interview.ended_at = datetime.utcnow()
-            db_interview.status = "completed"
-            db.commit()
-        
-        db.close()
-        
-        print(f"⭐ Candidate rated: {candidate_rating}/5.0")
-        
-        return
 
-    # Determine question type based on context and strategy
     try:
-        from llm import ask_followup_question, ask_new_topic_question
-
-        # Check if answer was skipped (PASS) or timed out
-        was_skipped = last["answer"].lower().strip() in {
-            "pass", "skip", "idk", "i don't know", "don't know",
-            "no idea", "not sure", "n/a"
-        }
-        was_timeout = "[AUTO-SUBMITTED: TIME EXPIRED]" in last["answer"]
-
-        print(f"   Generating next question (skipped={was_skipped}, timeout={was_timeout})")
-
-        # Decide question strategy
-        if was_skipped:
-            # User skipped - generate from new topic
-            next_q = ask_new_topic_question(
-                interview["tech_stack"],
-                interview["difficulty"],
-                interview["candidate_info"]["position"],
-                interview["candidate_info"]["experience"],
-                interview["covered_topics"],
-                interview["question_history"]
-            )
-            interview["last_question_type"] = "new_topic"
-        elif was_timeout:
-            # Timeout - 50% chance new topic, 50% followup
-            import random
-            if random.random() < 0.5 or interview["last_question_type"] == "followup":
-                # Generate new topic
-                next_q = ask_new_topic_question(
-                    interview["tech_stack"],
-                    interview["difficulty"],
-                    interview["candidate_info"]["position"],
-                    interview["candidate_info"]["experience"],
-                    interview["covered_topics"],
-                    interview["question_history"]
-                )
-                interview["last_question_type"] = "new_topic"
-            else:
-                # Continue with followup
-                next_q = ask_followup_question(
-                    interview["tech_stack"],
-                    interview["difficulty"],
-                    interview["candidate_info"]["position"],
-                    interview["candidate_info"]["experience"],
-                    last["question"],
-                    last["answer"],
-                    interview["covered_topics"]
-                )
-                interview["last_question_type"] = "followup"
-        else:
-            # Normal answer - alternate between followup and new topic
-            if interview["last_question_type"] == "followup" or interview["question_count"] % 2 == 0:
-                # Generate new topic every alternate question
-                next_q = ask_new_topic_question(
-                    interview["tech_stack"],
-                    interview["difficulty"],
-                    interview["candidate_info"]["position"],
-                    interview["candidate_info"]["experience"],
-                    interview["covered_topics"],
-                    interview["question_history"]
-                )
-                interview["last_question_type"] = "new_topic"
-            else:
-                # Followup question
-                next_q = ask_followup_question(
-                    interview["tech_stack"],
-                    interview["difficulty"],
-                    interview["candidate_info"]["position"],
-                    interview["candidate_info"]["experience"],
-                    last["question"],
-                    last["answer"],
-                    interview["covered_topics"]
+        print(f"   Generating next question (type={question_type})")
+        # The score is already saved, so a transiently failed generation is
+        # retried here rather than re-processing the whole answer
+        for attempt in range(1, LLM_RECOVERY_ATTEMPTS + 1):
+            try:
+                next_q, covered_topics = await produce_next_question(
+                    interview_id, interview, question_type, last, generation, timings
                 )
-                interview["last_question_type"] = "followup"
+                break
+            except TransientError as e:
+                if attempt == LLM_RECOVERY_ATTEMPTS:
+                    raise
+                generation = None
+                delay = recovery_delay(e)
+                print(f"⏳ Question generation failed ({e}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        interview["covered_topics"] = covered_topics
+        interview["last_question_type"] = question_type
 
         # Store question in history
         interview["question_history"].append(next_q)
         interview["current_question"] = next_q
         interview["status"] = "ready"
         interview["question_started_at"] = datetime.utcnow()
+        published = await STORE.atransition_status(interview_id, "processing", "ready", {
+            field: interview[field] for field in (
+                "difficulty", "last_passed", "question_count", "covered_topics",
+                "last_question_type", "question_history", "current_question",
+                "question_started_at"
+            )
+        })
+        EVENTS.clear_preview(interview_id)
+        if not published:
+            print(f"⚠️ Interview {interview_id} changed state while processing, dropping next question")
+            release_interview(interview_id)
+            return
+        EVENTS.notify(interview_id)
+        schedule_timeout(interview_id, interview)
+        start_speculation(interview_id, interview)
+        timings["total"] = time.perf_counter() - started
+        metrics.observe("answer_to_ready", timings["total"])
+        print("⏱️ Stage timings: " + ", ".join(f"{k}={v:.2f}s" for k, v in timings.items()))
         print(f"✅ Next question ready for interview {interview_id}")
         print(f"   Question text: {next_q[:100]}...")
         print(f"   Status: {interview['status']}")
@@ -271,45 +738,54 @@ def process_next_question(interview_id: int):
         print(f"❌ Error generating next question: {e}")
         import traceback
         traceback.print_exc()
+        EVENTS.clear_preview(interview_id)
         # Mark as completed on error
-        interview["status"] = "completed"
+        await STORE.atransition_status(interview_id, "processing", "completed")
+        release_interview(interview_id)
+        EVENTS.notify(interview_id)
         print(f"⚠️ Marking interview {interview_id} as completed due to error")
 
 
-def monitor_timer(interview_id: int):
-    """Background thread that monitors timer and auto-submits on timeout"""
-    while True:
-        time.sleep(1)
-        
-        interview = INTERVIEWS.get(interview_id)
-        if not interview or interview["status"] != "ready":
-            break
-        
-        elapsed = (datetime.utcnow() - interview["question_started_at"]).total_seconds()
-        remaining = max(0, interview["time_limit"] - int(elapsed))
-        
-        if remaining == 0:
-            print(f"⏰ Timer expired for interview {interview_id}")
-            print(f"   Current question: {interview['current_question'][:100] if interview.get('current_question') else 'NONE'}...")
-            
-            # Save the current question BEFORE changing status
-            timed_out_question = interview.get("current_question", "")
-            
-            interview["answers"].append({
-                "question": timed_out_question,
-                "answer": "[AUTO-SUBMITTED: TIME EXPIRED]",
-                "timestamp": datetime.utcnow()
-            })
-            
-            print(f"   Timeout answer appended, starting processing...")
-            interview["status"] = "processing"
-            
-            threading.Thread(
-                target=process_next_question,
-                args=(interview_id,),
-                daemon=True
-            ).start()
-            break
+async def handle_timeout(interview_id: int, question_count: int):
+    """Deadline callback that auto-submits the current question on timeout"""
+    interview = await STORE.aget(interview_id)
+    if not interview or interview["status"] != "ready" or interview["question_count"] != question_count:
+        return
+
+    print(f"⏰ Timer expired for interview {interview_id}")
+    print(f"   Current question: {interview['current_question'][:100] if interview.get('current_question') else 'NONE'}...")
+    
+    # Save the current question BEFORE changing status
+    timed_out_question = interview.get("current_question", "")
+    
+    answers = interview["answers"] + [{
+        "question": timed_out_question,
+        "answer": TIMEOUT_MARKER,
+        "timestamp": datetime.utcnow()
+    }]
+
+    # Another worker (or the candidate) may have moved the question on already
+    if not await STORE.acompare_and_set(
+        interview_id,
+        {"status": "ready", "question_count": question_count},
+        {"status": "processing", "answers": answers, "processing_started_at": datetime.utcnow(), **processing_lease()}
+    ):
+        return
+    EVENTS.notify(interview_id)
+    
+    print(f"   Timeout answer appended, starting processing...")
+    schedule_processing(interview_id)
+
+@app.get("/metrics")
+def get_metrics():
+    """Per-stage timings and counters for answer processing"""
+    snapshot = metrics.snapshot()
+    snapshot["llm_cache"] = LLM_RESPONSE_CACHE.stats()
+    snapshot["llm_providers"] = LLM_ROUTER.stats()
+    snapshot["llm_output_lengths"] = LLM_OUTPUT_LENGTHS.stats()
+    snapshot["prescorer"] = PRESCORER.stats()
+    snapshot["local_scorer"] = LOCAL_SCORER.stats()
+    return snapshot
 
 @app.post("/check-duplicate")
 def check_duplicate(data: dict):
@@ -344,25 +820,12 @@ def check_duplicate(data: dict):
 # =========================
 # START INTERVIEW
 # =========================
-@app.post("/start")
-def start_interview(candidate: CandidateCreate):
-    """Start a new interview session"""
-    global INTERVIEW_ID
-
-    print(f"\n{'=' * 60}")
-    print(f"🎯 STARTING NEW INTERVIEW")
-    print(f"{'=' * 60}")
-    print(f"👤 Candidate: {candidate.name}")
-    print(f"📧 Email: {candidate.email}")
-    print(f"📱 Phone: {candidate.phone}")
-    print(f"💼 Experience: {candidate.experience} years")
-    print(f"🎯 Position: {candidate.position}")
-    print(f"📍 Location: {candidate.location}")
-    print(f"🔧 Tech stack: {candidate.tech_stack}")
-    
-    difficulty = initial_difficulty(candidate.experience)
-    print(f"📊 Initial difficulty: {difficulty}")
-
+def create_interview_records(candidate: CandidateCreate) -> int:
+    """
+    Insert the candidate and interview rows (blocking, run off the event loop).
+    Returns the database interview ID, which is also the live session ID: the
+    database sequence hands out unique IDs to every worker without coordination.
+    """
     from database import SessionLocal
     from models import Candidate, Interview
 
@@ -391,18 +854,49 @@ def start_interview(candidate: CandidateCreate):
     db.add(db_interview)
     db.commit()
     db.refresh(db_interview)
+    interview_id = db_interview.id
 
     db.close()
+    return interview_id
+
+@app.post("/start")
+async def start_interview(candidate: CandidateCreate):
+    """Start a new interview session"""
+
+    print(f"\n{'=' * 60}")
+    print(f"🎯 STARTING NEW INTERVIEW")
+    print(f"{'=' * 60}")
+    print(f"👤 Candidate: {candidate.name}")
+    print(f"📧 Email: {candidate.email}")
+    print(f"📱 Phone: {candidate.phone}")
+    print(f"💼 Experience: {candidate.experience} years")
+    print(f"🎯 Position: {candidate.position}")
+    print(f"📍 Location: {candidate.location}")
+    print(f"🔧 Tech stack: {candidate.tech_stack}")
     
-    question = ask_technical_question(
-        candidate.tech_stack, 
-        difficulty, 
-        candidate.position, 
-        candidate.experience
-    )
+    difficulty = initial_difficulty(candidate.experience)
+    print(f"📊 Initial difficulty: {difficulty}")
+
+    interview_id = await asyncio.to_thread(create_interview_records, candidate)
+    
+    banked = None
+    if QUESTION_BANK:
+        banked = await asyncio.to_thread(
+            BANK.take, "technical", candidate.tech_stack, difficulty, candidate.position, candidate.experience
+        )
+    if banked:
+        question = banked[0]
+        print(f"🏦 First question served from the question bank")
+    else:
+        question = await ask_technical_question_async(
+            candidate.tech_stack, 
+            difficulty, 
+            candidate.position, 
+            candidate.experience
+        )
     print(f"❓ First question generated: {question[:100]}...")
 
-    INTERVIEWS[INTERVIEW_ID] = {
+    interview = {
         "difficulty": difficulty,
         "current_question": question,
         "question_count": 1,
@@ -427,32 +921,30 @@ def start_interview(candidate: CandidateCreate):
         "last_question_type": None,  # Track if last question was 'followup' or 'new_topic'
         "question_history": [],  # Store all questions asked to avoid repetition
     }
+    await STORE.acreate(interview_id, interview)
 
-    # Start timer monitoring
-    threading.Thread(
-        target=monitor_timer,
-        args=(INTERVIEW_ID,),
-        daemon=True
-    ).start()
+    # Arm the auto-submit deadline
+    schedule_timeout(interview_id, interview)
+    start_speculation(interview_id, interview)
 
     response = {
-        "interview_id": INTERVIEW_ID,
+        "interview_id": interview_id,
         "question": question,
         "message": "Interview started successfully",
-        "time_limit": 180
+        "time_limit": 180,
+        **question_deadline(interview)
     }
     
-    print(f"🆔 Interview ID: {INTERVIEW_ID}")
+    print(f"🆔 Interview ID: {interview_id}")
     print(f"✅ Interview session created successfully")
     print(f"{'=' * 60}\n")
 
-    INTERVIEW_ID += 1
     return response
 
 @app.post("/answer")
-def submit_answer(data: AnswerRequest):
+async def submit_answer(data: AnswerRequest):
     """Submit an answer to the current question"""
-    interview = INTERVIEWS.get(data.interview_id)
+    interview = await STORE.aget(data.interview_id)
 
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
@@ -461,39 +953,48 @@ def submit_answer(data: AnswerRequest):
         print(f"⚠️ Answer submission rejected - already processing")
         return {"status": "already_processing"}
 
+    if interview["status"] != "ready":
+        print(f"⚠️ Answer submission rejected - status {interview['status']}")
+        return {"status": interview["status"], "message": "No question is awaiting an answer"}
+
     print(f"\n📝 Answer submitted for interview {data.interview_id}")
     print(f"   Question: {data.question[:80]}...")
     print(f"   Answer: {data.answer[:80]}...")
     print(f"   Current status: {interview['status']}")
 
-    interview["status"] = "processing"
-
     # Calculate time taken for this question
     question_start_time = interview.get("question_started_at", datetime.utcnow())
     time_taken = int((datetime.utcnow() - question_start_time).total_seconds())
 
-    interview["answers"].append({
+    answers = interview["answers"] + [{
         "question": data.question,
         "answer": data.answer,
         "timestamp": datetime.utcnow(),
         "time_taken": time_taken
-    })
+    }]
+
+    # Only one submission (or the timeout) may move this question to processing
+    if not await STORE.acompare_and_set(
+        data.interview_id,
+        {"status": "ready", "question_count": interview["question_count"]},
+        {"status": "processing", "answers": answers, "processing_started_at": datetime.utcnow(), **processing_lease()}
+    ):
+        print(f"⚠️ Answer submission rejected - already processing")
+        return {"status": "already_processing"}
+    TIMERS.cancel(data.interview_id)
+    EVENTS.notify(data.interview_id)
 
     print(f"   Starting background processing...")
     
     # Process next question in background
-    threading.Thread(
-        target=process_next_question,
-        args=(data.interview_id,),
-        daemon=True
-    ).start()
+    schedule_processing(data.interview_id)
 
     return {"status": "processing", "message": "Answer submitted successfully"}
 
 @app.get("/next-question/{interview_id}")
-def get_next_question(interview_id: int):
+async def get_next_question(interview_id: int):
     """Get the next question after processing"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = await STORE.aget(interview_id)
 
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
@@ -509,30 +1010,122 @@ def get_next_question(interview_id: int):
         print(f"⏳ Still processing interview {interview_id}")
         return {"status": "processing", "message": "Processing your answer..."}
 
-    # Ready to show question - start timer
+    # Ready to show question (its deadline was armed when it became ready)
     if current_status == "ready":
         print(f"✅ Returning question {interview['question_count']} for interview {interview_id}")
-        
-        threading.Thread(
-            target=monitor_timer,
-            args=(interview_id,),
-            daemon=True
-        ).start()
 
         return {
             "question": interview["current_question"],
             "question_number": interview["question_count"],
-            "total_questions": 5
+            "total_questions": 5,
+            **question_deadline(interview)
         }
     
     # Unknown/unexpected status
     print(f"⚠️ Unexpected status '{current_status}' for interview {interview_id}")
     return {"status": current_status, "message": "Processing..."}
 
+def question_clock(interview: dict):
+    """Returns (elapsed, remaining) seconds for the current question"""
+    elapsed = (datetime.utcnow() - interview["question_started_at"]).total_seconds()
+    remaining = max(0, interview["time_limit"] - int(elapsed))
+    return elapsed, remaining
+
+def question_deadline(interview: dict):
+    """
+    Absolute deadline of the current question, sent once with the question so
+    clients can count down locally instead of polling /timer.
+    Both values are Unix timestamps; server_time lets clients correct for clock skew.
+    """
+    started = interview["question_started_at"].replace(tzinfo=timezone.utc).timestamp()
+    return {
+        "deadline": started + interview["time_limit"],
+        "server_time": time.time()
+    }
+
+def interview_event(interview: dict):
+    """Maps the interview state to the (event, data) pushed on /events"""
+    status = interview["status"]
+    if status == "ready":
+        _, remaining = question_clock(interview)
+        return "question", {
+            "question": interview["current_question"],
+            "question_number": interview["question_count"],
+            "total_questions": 5,
+            "time_limit": interview["time_limit"],
+            "remaining": remaining,
+            **question_deadline(interview)
+        }
+    if status == "completed":
+        return "completed", {"completed": True, "message": "Interview completed successfully"}
+    if status == "terminated":
+        return "terminated", {"terminated": True, "message": "Interview terminated due to policy violations"}
+    return "status", {"status": status, "question_number": interview["question_count"]}
+
+async def event_stream(interview_id: int, request: Request):
+    """
+    Pushes every state change of an interview, plus a timer tick while a
+    question is open, until the interview ends or the client disconnects.
+    """
+    wakeup = EVENTS.subscribe(interview_id)
+    last_state = None
+    preview_sent = 0
+    try:
+        while True:
+            wakeup.clear()
+            interview = await STORE.aget(interview_id)
+            if interview is None:
+                break
+
+            state = (interview["status"], interview["question_count"])
+            if state != last_state:
+                last_state = state
+                preview_sent = 0
+                yield format_sse(*interview_event(interview))
+                if interview["status"] in ["completed", "terminated"]:
+                    break
+            elif interview["status"] == "ready":
+                _, remaining = question_clock(interview)
+                yield format_sse("timer", {"remaining": remaining})
+
+            # Stream the next question while it is being generated
+            preview = EVENTS.preview(interview_id) if interview["status"] == "processing" else None
+            if preview and preview[0] == interview["question_count"] + 1 and len(preview[1]) > preview_sent:
+                question_number, text = preview
+                yield format_sse("question_delta", {
+                    "question_number": question_number,
+                    "delta": text[preview_sent:]
+                })
+                preview_sent = len(text)
+            elif interview["status"] == "processing" and state == last_state:
+                # Keep the connection busy so clients can notice their own deadlines
+                yield ": ping\n\n"
+
+            if await request.is_disconnected():
+                break
+            try:
+                await asyncio.wait_for(wakeup.wait(), SSE_TICK_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        EVENTS.unsubscribe(interview_id, wakeup)
+
+@app.get("/events/{interview_id}")
+async def stream_events(interview_id: int, request: Request):
+    """Server-Sent Events stream of status changes, questions and timer ticks"""
+    if not await STORE.aget(interview_id):
+        raise HTTPException(status_code=404, detail="Invalid interview ID")
+
+    return StreamingResponse(
+        event_stream(interview_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/timer/{interview_id}")
 def get_timer(interview_id: int):
     """Get remaining time for current question"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = STORE.get(interview_id)
 
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
@@ -540,19 +1133,19 @@ def get_timer(interview_id: int):
     if interview["status"] != "ready":
         return {"remaining": 0, "timeout": interview["status"] == "timeout"}
 
-    elapsed = (datetime.utcnow() - interview["question_started_at"]).total_seconds()
-    remaining = max(0, interview["time_limit"] - int(elapsed))
+    elapsed, remaining = question_clock(interview)
 
     return {
         "remaining": remaining, 
         "timeout": False,
-        "elapsed": int(elapsed)
+        "elapsed": int(elapsed),
+        **question_deadline(interview)
     }
 
 @app.post("/violation/{interview_id}")
 def record_violation(interview_id: int, data: dict = None):
     """Record a policy violation (keyboard/interaction violations)"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = STORE.get(interview_id)
 
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
@@ -566,7 +1159,7 @@ def record_violation(interview_id: int, data: dict = None):
         }
 
     # Record the violation
-    interview["violation_count"] += 1
+    interview["violation_count"] = STORE.increment(interview_id, "violation_count")
     
     violation_type = data.get("type", "unknown") if data else "unknown"
     print(f"⚠️ Policy violation: {violation_type}")
@@ -576,8 +1169,9 @@ def record_violation(interview_id: int, data: dict = None):
     terminated = interview["violation_count"] >= 10
 
     if terminated:
-        interview["is_terminated"] = True
-        interview["status"] = "terminated"
+        STORE.update(interview_id, {"is_terminated": True, "status": "terminated"})
+        release_interview(interview_id)
+        EVENTS.notify(interview_id)
         print(f"❌ Interview {interview_id} TERMINATED due to violations")
     
     # Update database with violation count and termination details
@@ -617,7 +1211,7 @@ def record_violation(interview_id: int, data: dict = None):
 @app.get("/violation/{interview_id}")
 def get_violations(interview_id: int):
     """Get current violation count"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = STORE.get(interview_id)
 
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
@@ -664,13 +1258,14 @@ def get_fullscreen_status():
 @app.post("/terminate/{interview_id}")
 def terminate_interview(interview_id: int):
     """Terminate an interview due to policy violations"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = STORE.get(interview_id)
 
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
 
-    interview["is_terminated"] = True
-    interview["status"] = "terminated"
+    STORE.update(interview_id, {"is_terminated": True, "status": "terminated"})
+    release_interview(interview_id)
+    EVENTS.notify(interview_id)
     
     # Update database
     from database import SessionLocal
@@ -707,7 +1302,7 @@ def terminate_interview(interview_id: int):
 @app.get("/status/{interview_id}")
 def check_status(interview_id: int):
     """Check the current status of an interview"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = STORE.get(interview_id)
 
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
@@ -724,7 +1319,7 @@ def check_status(interview_id: int):
 @app.get("/check-interview/{interview_id}")
 def check_interview_exists(interview_id: int):
     """Check if an interview exists and its completion status"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = STORE.get(interview_id)
     
     if not interview:
         return {
@@ -751,7 +1346,7 @@ def check_interview_exists(interview_id: int):
 @app.get("/interview-summary/{interview_id}")
 def get_interview_summary(interview_id: int):
     """Get a summary of the interview (for admin/review purposes)"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = STORE.get(interview_id)
     
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
@@ -771,12 +1366,12 @@ def get_interview_summary(interview_id: int):
 @app.post("/fullscreen-status/{interview_id}")
 def update_fullscreen_status(interview_id: int, is_fullscreen: bool):
     """Update fullscreen status for an interview"""
-    interview = INTERVIEWS.get(interview_id)
+    interview = STORE.get(interview_id)
     
     if not interview:
         raise HTTPException(status_code=404, detail="Invalid interview ID")
     
-    interview["fullscreen_active"] = is_fullscreen
+    STORE.update(interview_id, {"fullscreen_active": is_fullscreen})
     
     if not is_fullscreen:
         print(f"⚠️ Fullscreen exited for interview {interview_id}")
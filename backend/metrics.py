@@ -0,0 +1,53 @@
+# backend/metrics.py
+import threading
+import time
+from contextlib import contextmanager
+
+_LOCK = threading.Lock()
+_COUNTERS = {}  # name -> int
+_TIMINGS = {}  # name -> {"count", "total", "max"}
+
+
+def increment(name: str, amount: int = 1):
+    """Adds `amount` to a named counter."""
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + amount
+
+
+def observe(name: str, seconds: float):
+    """Records one duration sample for a named stage."""
+    with _LOCK:
+        stats = _TIMINGS.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+
+
+@contextmanager
+def timed(name: str, timings: dict = None):
+    """
+    Times the enclosed block and records it under `name`.
+    If `timings` is given, the duration is also stored there for per-request logs.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe(name, elapsed)
+        if timings is not None:
+            timings[name] = elapsed
+
+
+def snapshot() -> dict:
+    """Returns a copy of all counters and timing aggregates."""
+    with _LOCK:
+        timings = {
+            name: {
+                "count": stats["count"],
+                "avg_ms": round(stats["total"] / stats["count"] * 1000, 1) if stats["count"] else 0.0,
+                "max_ms": round(stats["max"] * 1000, 1)
+            }
+            for name, stats in _TIMINGS.items()
+        }
+        return {"counters": dict(_COUNTERS), "timings": timings}
@@ -1,5 +1,5 @@
 # backend/models.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -46,6 +46,32 @@ class Question(Base):
     answer_text = Column(Text)
     difficulty = Column(Float)
     score = Column(Float) # Score out of 10 for the answer
+    # Who produced the score: "llm", "prescore" (local rules/model, failing answers
+    # only) or "local" (provisional local-model score, re-scored later). NULL
+    # rows predate the column and were scored by the LLM.
+    score_source = Column(String(20), default="llm")
     answered_at = Column(DateTime, default=datetime.utcnow)
 
-    interview = relationship("Interview", back_populates="questions")
\ No newline at end of file
+    interview = relationship("Interview", back_populates="questions")
+
+class BankQuestion(Base):
+    """Pre-generated question waiting to be served (see question_bank.py)"""
+    __tablename__ = "question_bank"
+    __table_args__ = (
+        Index("ix_question_bank_bucket", "kind", "stack_key", "difficulty_bucket", "seniority", "position_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20))  # "technical" (first question) or "new_topic"
+    stack_key = Column(String(255))  # Normalized, sorted tech-stack tokens
+    difficulty_bucket = Column(Integer)  # 1-5
+    seniority = Column(String(20))
+    position_key = Column(String(100), nullable=True)  # Normalized position (NULL on rows banked before it was keyed)
+    question_text = Column(Text)
+    topic = Column(String(100), nullable=True)
+    # Profile the question was generated for, reused when refilling the bucket
+    tech_stack = Column(Text)
+    position = Column(String(100))
+    experience = Column(Float)
+    difficulty = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
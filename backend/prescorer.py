@@ -0,0 +1,266 @@
+# backend/prescorer.py
+"""
+Local pre-scoring of answers before they are sent to the LLM.
+
+Deterministic rules settle skipped, timed out, empty and garbage answers.
+A small logistic-regression model over cheap features (length, overlap
+with the question's keywords, how much the text looks like language)
+settles answers it is confident would score near zero. Everything else
+goes upstream. Only failing scores are ever settled locally.
+
+The model is trained on stored questions.score values:
+    python prescorer.py train
+    python prescorer.py train --fail-score 1.5 --out prescorer_model.json
+"""
+import argparse
+import json
+import math
+import os
+import re
+import threading
+
+import numpy as np
+from dotenv import load_dotenv
+load_dotenv()
+import metrics
+
+PRESCORE = os.getenv("PRESCORE", "true").lower() in {"1", "true", "yes"}
+PRESCORER_MODEL = os.getenv("PRESCORER_MODEL", "prescorer_model.json")
+# Probability of a failing score above which the model settles an answer
+PRESCORE_THRESHOLD = float(os.getenv("PRESCORE_THRESHOLD", "0.95"))
+# Answers with fewer words are settled as too short. Terse answers such as
+# "Use indexes" can be right, so by default only wordless ones are.
+PRESCORE_MIN_WORDS = int(os.getenv("PRESCORE_MIN_WORDS", "1"))
+
+SKIP_ANSWERS = {"pass", "skip", "idk", "i don't know", "don't know", "no idea", "not sure", "n/a"}
+TIMEOUT_MARKER = "[AUTO-SUBMITTED: TIME EXPIRED]"
+
+# Function words: real English sentences are full of them, keyboard mashing
+# and copy-pasted noise are not
+_FUNCTION_WORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "for", "with", "is", "are", "was",
+    "be", "it", "this", "that", "as", "at", "by", "from", "if", "i", "we", "you", "would", "will",
+    "can", "should", "use", "so", "then", "when", "which", "not", "do", "have", "has", "because",
+}
+_WORD = re.compile(r"[a-z0-9+#']+")
+_LETTER_RUN = re.compile(r"(.)\1{3,}")
+_VOWELS = set("aeiouy")
+
+FEATURE_NAMES = [
+    "log_words",
+    "log_chars",
+    "keyword_overlap",
+    "letter_ratio",
+    "function_word_ratio",
+    "unique_word_ratio",
+    "vowel_ratio",
+    "nonword_ratio",
+]
+
+
+def _words(text: str) -> list:
+    return _WORD.findall(text.lower())
+
+
+def _is_nonword(word: str) -> bool:
+    """Long tokens without vowels or with a character repeated 4+ times ('sdfghjk', 'aaaaa')"""
+    return (len(word) >= 6 and not (_VOWELS & set(word))) or bool(_LETTER_RUN.search(word))
+
+
+def features(question: str, answer: str) -> list:
+    words = _words(answer)
+    visible = [c for c in answer if not c.isspace()]
+    letters = [c for c in answer.lower() if c.isalpha()]
+    keywords = {w for w in _words(question) if len(w) > 2 and w not in _FUNCTION_WORDS}
+    return [
+        math.log1p(len(words)),
+        math.log1p(len(answer)),
+        len(keywords & set(words)) / len(keywords) if keywords else 0.0,
+        len(letters) / len(visible) if visible else 0.0,
+        sum(w in _FUNCTION_WORDS for w in words) / len(words) if words else 0.0,
+        len(set(words)) / len(words) if words else 0.0,
+        sum(c in _VOWELS for c in letters) / len(letters) if letters else 0.0,
+        sum(_is_nonword(w) for w in words) / len(words) if words else 0.0,
+    ]
+
+
+def rule_reason(answer: str, extended: bool = True):
+    """
+    Name of the rule that settles the answer, or None. Skips and timeouts
+    are always settled; `extended` adds the empty/short/garbage rules.
+    """
+    text = answer.strip()
+    if text.lower() in SKIP_ANSWERS:
+        return "skip"
+    if TIMEOUT_MARKER in answer:
+        return "timeout"
+    if not extended:
+        return None
+    words = _words(text)
+    if not any(c.isalpha() for c in text):
+        return "empty"
+    if len(words) < PRESCORE_MIN_WORDS:
+        return "too_short"
+    nonwords = sum(_is_nonword(w) for w in words)
+    function_words = sum(w in _FUNCTION_WORDS for w in words)
+    if nonwords * 2 > len(words) and not function_words:
+        return "garbage"
+    return None
+
+
+class Prescorer:
+    """
+    Rules plus an optional logistic-regression model loaded from JSON
+    (see train()). Without a model only the rules settle answers.
+    """
+
+    def __init__(self, model: dict = None, threshold: float = PRESCORE_THRESHOLD):
+        self.threshold = threshold
+        self.model = model
+        if model:
+            self._mean = np.array(model["mean"])
+            self._std = np.array(model["std"])
+            self._weights = np.array(model["weights"])
+            self._bias = model["bias"]
+        self._settled = 0
+        self._upstream = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = PRESCORER_MODEL):
+        if not path or not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            model = json.load(f)
+        if model.get("features") != FEATURE_NAMES:
+            print(f"⚠️ Ignoring {path}: trained on different features, retrain with `python prescorer.py train`")
+            return cls()
+        print(f"🧮 Loaded pre-scoring model ({model['samples']} training answers)")
+        return cls(model)
+
+    def fail_probability(self, question: str, answer: str) -> float:
+        x = (np.array(features(question, answer)) - self._mean) / self._std
+        return float(1 / (1 + np.exp(-(x @ self._weights + self._bias))))
+
+    def _count(self, settled: bool, reason: str = None):
+        with self._lock:
+            if settled:
+                self._settled += 1
+            else:
+                self._upstream += 1
+        metrics.increment(f"prescore_settled.{reason}" if settled else "prescore_upstream")
+
+    def prescore(self, question: str, answer: str):
+        """
+        Returns {'passed': False, 'score', 'source': 'prescore'} for answers
+        that can be settled locally, or None if the answer needs the LLM.
+        """
+        reason = rule_reason(answer, extended=PRESCORE)
+        if reason is not None:
+            self._count(True, reason)
+            return {"passed": False, "score": 0.0, "source": "prescore"}
+        if PRESCORE and self.model and self.fail_probability(question, answer) >= self.threshold:
+            self._count(True, "model")
+            return {"passed": False, "score": self.model["settled_score"], "source": "prescore"}
+        self._count(False)
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._settled + self._upstream
+            return {
+                "model_loaded": bool(self.model),
+                "settled": self._settled,
+                "upstream": self._upstream,
+                "short_circuit_rate": round(self._settled / total, 3) if total else 0.0
+            }
+
+
+PRESCORER = Prescorer.load() if PRESCORE else Prescorer()
+
+
+def _fit(x: np.ndarray, y: np.ndarray, epochs: int = 2000, lr: float = 0.5, l2: float = 1e-3):
+    """
+    Batch gradient descent on the log loss with L2. Classes are not
+    re-weighted: the probabilities must stay calibrated for the threshold.
+    """
+    weights = np.zeros(x.shape[1])
+    bias = 0.0
+    for _ in range(epochs):
+        p = 1 / (1 + np.exp(-(x @ weights + bias)))
+        error = p - y
+        weights -= lr * (x.T @ error / len(y) + l2 * weights)
+        bias -= lr * error.mean()
+    return weights, bias
+
+
+def train(rows, fail_score: float, threshold: float = PRESCORE_THRESHOLD) -> dict:
+    """
+    Fits the model on (id, question, answer, score) rows the rules don't
+    settle. A fifth of the rows (by id) is held out to report how many
+    answers the threshold would settle and how many of those truly failed.
+    """
+    rows = [r for r in rows if rule_reason(r.answer_text) is None]
+    if len(rows) < 50:
+        raise ValueError(f"Need at least 50 scored answers to train, have {len(rows)}")
+    x = np.array([features(r.question_text or "", r.answer_text) for r in rows])
+    y = np.array([1.0 if r.score <= fail_score else 0.0 for r in rows])
+    holdout = np.array([r.id % 5 == 0 for r in rows])
+
+    mean = x[~holdout].mean(axis=0)
+    std = x[~holdout].std(axis=0)
+    std[std == 0] = 1.0
+    z = (x - mean) / std
+    weights, bias = _fit(z[~holdout], y[~holdout])
+
+    p = 1 / (1 + np.exp(-(z[holdout] @ weights + bias)))
+    settled = p >= threshold
+    print(f"📊 {len(rows)} answers, {int(y.sum())} at or below {fail_score}; holdout {int(holdout.sum())}")
+    print(f"   holdout settled: {settled.mean():.1%}, of which truly failing: "
+          f"{y[holdout][settled].mean() if settled.any() else 0:.1%}")
+
+    failing = np.array([r.score for r in rows])[y == 1]
+    return {
+        "features": FEATURE_NAMES,
+        "samples": len(rows),
+        "fail_score": fail_score,
+        "settled_score": round(float(np.median(failing)), 1) if len(failing) else 0.0,
+        "mean": mean.tolist(),
+        "std": std.tolist(),
+        "weights": weights.tolist(),
+        "bias": float(bias)
+    }
+
+
+def load_training_rows() -> list:
+    """LLM-scored answers; scores the prescorer settled itself would only reinforce it"""
+    from database import SessionLocal
+    from models import Question
+    from sqlalchemy import or_
+    db = SessionLocal()
+    try:
+        return db.query(Question.id, Question.question_text, Question.answer_text, Question.score).filter(
+            Question.answer_text.isnot(None),
+            Question.score.isnot(None),
+            or_(Question.score_source.is_(None), Question.score_source == "llm")
+        ).all()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local answer pre-scoring model")
+    parser.add_argument("command", choices=["train"])
+    parser.add_argument("--fail-score", type=float, default=1.0, help="Scores at or below this count as failing")
+    parser.add_argument("--threshold", type=float, default=PRESCORE_THRESHOLD)
+    parser.add_argument("--out", default=PRESCORER_MODEL)
+    args = parser.parse_args()
+
+    model = train(load_training_rows(), args.fail_score, args.threshold)
+    with open(args.out, "w") as f:
+        json.dump(model, f, indent=2)
+    print(f"✅ Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# backend/prompts.py
+from string import Formatter
+
+# Experience bands: (upper bound in years, inclusive?, band, description used in prompts)
+EXPERIENCE_LADDER = [
+    (1, False, "entry", "entry-level with less than 1 year of experience"),
+    (2, True, "junior", "junior with 1-2 years of experience"),
+    (5, True, "mid", "mid-level with 3-5 years of experience"),
+    (10, True, "senior", "senior with 6-10 years of experience"),
+]
+_TOP_BAND = ("very_senior", "very senior with 10+ years of experience")
+_UNKNOWN_BAND = ("unknown", "unknown experience level")
+
+
+def experience_band(experience: float) -> tuple:
+    """Returns (band, description) for years of experience"""
+    if experience is None:
+        return _UNKNOWN_BAND
+    for limit, inclusive, band, description in EXPERIENCE_LADDER:
+        if experience < limit or (inclusive and experience == limit):
+            return band, description
+    return _TOP_BAND
+
+
+def text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def number(value) -> str:
+    return str(value)
+
+
+def topic_list(topics) -> str:
+    return ", ".join(topics) if topics else "None yet"
+
+
+def optional_line(label: str):
+    """Slot type rendering '\\n<label>: value', or nothing when the value is empty"""
+    def render(value) -> str:
+        return f"\n{label}: {value}" if value else ""
+    return render
+
+
+def chat_messages(system: str, user: str) -> list:
+    """Chat messages with the static instructions as the system message"""
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user}
+    ]
+
+
+class PromptTemplate:
+    """
+    A prompt split into a static system message and a user message parsed
+    once at import into literal segments and typed slots.
+
+    Slots are `{name}` fields of the user message; `slots` maps each name to
+    a function that turns the value into text (text, number, topic_list,
+    ...). The system message holds every instruction that doesn't depend on
+    the call, so the request starts with the same tokens each time and
+    providers can reuse their cached prefix. Rendering is a single join over
+    the precomputed literals and rendered slot values.
+    """
+
+    def __init__(self, system: str, template: str, **slots):
+        self.system = system.strip()
+        segments = []  # literal text, or (slot name, renderer)
+        names = set()
+        for literal, field, spec, conversion in Formatter().parse(template.strip() + "\n"):
+            if literal:
+                segments.append(literal)
+            if field is None:
+                continue
+            if spec or conversion or field not in slots:
+                raise ValueError(f"Unsupported or undeclared slot {{{field}}} in prompt template")
+            segments.append((field, slots[field]))
+            names.add(field)
+        unused = set(slots) - names
+        if unused:
+            raise ValueError(f"Prompt template declares unused slots: {sorted(unused)}")
+        self.slots = frozenset(names)
+
+        # Literal text between slots: _literals[i] follows slot i, _head precedes the first
+        self._head, literals, fields = "", [], []
+        for segment in segments:
+            if isinstance(segment, str):
+                if fields:
+                    literals[-1] += segment
+                else:
+                    self._head += segment
+            else:
+                fields.append(segment)
+                literals.append("")
+        self._slots = tuple(zip(fields, literals))
+
+    def render(self, **values) -> str:
+        """The user message"""
+        parts = [self._head]
+        for (name, render), literal in self._slots:
+            parts.append(render(values[name]))
+            parts.append(literal)
+        return "".join(parts)
+
+    def render_messages(self, **values) -> list:
+        return chat_messages(self.system, self.render(**values))
+
+
+# Rules shared by every question type
+_QUESTION_RULES = """- The question MUST be scenario-based (realistic workplace situation)
+- Tailor the complexity to the candidate's experience level
+- The scenario should be small and focused (not a full system design)
+- For junior roles: focus on fundamentals, basic problem-solving, and core concepts
+- For mid-level roles: focus on practical application, best practices, and trade-offs
+- For senior roles: focus on complex scenarios, architecture decisions, and optimization
+- Ask what the candidate would do, explain, or expect to happen
+- DO NOT ask full system design or architecture questions
+- The question should be answerable verbally in 2–5 minutes
+- Make it relevant to the actual work they would do in the position they are applying for"""
+
+_TOPIC_TAG_RULE = "- Extract the main technology/topic from your question and append it at the end like this: [TOPIC: topic_name]"
+
+_CANDIDATE_PROFILE = """Candidate profile:
+- Tech stack: {tech_stack}
+- Experience level: {experience_level}{position}
+- Interview difficulty (internal): {difficulty} out of 5"""
+
+_PROFILE_SLOTS = {
+    "tech_stack": text,
+    "experience_level": text,
+    "position": optional_line("Position applying for"),
+    "difficulty": number,
+}
+
+_INTERVIEWER = "You are a technical interviewer conducting a live screening interview."
+
+TECHNICAL_QUESTION = PromptTemplate(f"""
+{_INTERVIEWER}
+
+Question requirements:
+- Ask ONLY ONE question relevant to their tech stack AND position
+{_QUESTION_RULES}
+- DO NOT use words like: design an entire system, architect, end-to-end solution
+
+Return ONLY the question text, nothing else.
+""", _CANDIDATE_PROFILE, **_PROFILE_SLOTS)
+
+FOLLOWUP_QUESTION = PromptTemplate(f"""
+{_INTERVIEWER}
+
+Question requirements:
+- Generate ONE follow-up question that builds upon or relates to their previous answer
+- If they mentioned a specific technology, tool, or concept in their answer, you can ask about it
+- If their answer was strong, ask a slightly deeper question on a related topic
+- If their answer was weak or they skipped, move to a different but related area
+- Maintain the same tech stack focus
+{_QUESTION_RULES}
+- If continuing on the same topic, you may go deeper; otherwise feel free to connect to related areas within their tech stack
+- Try to touch upon different aspects of their tech stack over the course of the interview
+{_TOPIC_TAG_RULE}
+
+Return ONLY the question text, nothing else.
+""", _CANDIDATE_PROFILE + """
+
+Previous question asked:
+{previous_question}
+
+Candidate's answer:
+{previous_answer}
+
+Topics already covered in interview: {covered_topics}
+""", previous_question=text, previous_answer=text, covered_topics=topic_list, **_PROFILE_SLOTS)
+
+NEW_TOPIC_QUESTION = PromptTemplate(f"""
+{_INTERVIEWER}
+
+Question requirements:
+- Ask ONE question from a DIFFERENT topic/technology from their tech stack that hasn't been thoroughly explored yet
+- Focus on technologies or concepts from their stack that are NOT in the covered topics list
+{_QUESTION_RULES}
+{_TOPIC_TAG_RULE}
+
+Return ONLY the question text with the topic tag, nothing else.
+""", _CANDIDATE_PROFILE + """
+
+Topics already covered: {covered_topics}
+""", covered_topics=topic_list, **_PROFILE_SLOTS)
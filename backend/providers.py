@@ -0,0 +1,178 @@
+# backend/providers.py
+import json
+import os
+import random
+import threading
+
+from dotenv import load_dotenv
+load_dotenv()
+from rate_limiter import LIMITER, RateLimiter
+from resilience import ResilientCaller, CircuitBreaker
+import metrics
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+MODEL_NAME = os.getenv("MODEL_NAME", "llama-3.3-70b-versatile")
+
+# JSON list of OpenAI-compatible endpoints, e.g.
+# [{"name": "groq", "url": "...", "api_key_env": "GROQ_API_KEY", "model": "...",
+#   "rpm": 30, "tpm": 6000, "cost_per_1k_tokens": 0.0006},
+#  {"name": "local", "url": "http://localhost:8080/v1/chat/completions",
+#   "model": "llama3", "call_sites": ["evaluation", "rating"]}]
+# Empty uses the single Groq endpoint configured above.
+LLM_PROVIDERS = os.getenv("LLM_PROVIDERS", "")
+
+# Routing: score = latency EWMA * (1 + penalty * error EWMA) + cost weight * cost,
+# with the EWMAs kept per call site (a provider can be fast for short questions
+# and slow for long evaluations). A small share of calls goes to a random
+# eligible provider with a closed circuit to keep every provider's EWMAs fresh.
+LLM_ROUTER_EWMA_ALPHA = float(os.getenv("LLM_ROUTER_EWMA_ALPHA", "0.2"))
+LLM_ROUTER_ERROR_PENALTY = float(os.getenv("LLM_ROUTER_ERROR_PENALTY", "4"))
+LLM_ROUTER_COST_WEIGHT = float(os.getenv("LLM_ROUTER_COST_WEIGHT", "0"))
+LLM_ROUTER_EXPLORE = float(os.getenv("LLM_ROUTER_EXPLORE", "0.05"))
+
+
+class Provider:
+    """
+    One OpenAI-compatible chat-completions endpoint with its own model,
+    quota (rate limiter), circuit breaker and health statistics.
+
+    Args:
+        name (str): Label used in logs and metrics.
+        url (str): Full chat-completions URL.
+        model (str): Model name sent with each request.
+        api_key (str): Bearer token; omitted from requests if empty.
+        limiter (RateLimiter): The endpoint's RPM/TPM budget.
+        cost_per_1k_tokens (float): Price used for cost accounting and routing.
+        call_sites (set): Call sites this provider may serve (None = all).
+    """
+
+    def __init__(self, name: str, url: str, model: str, api_key: str = None, limiter: RateLimiter = None,
+                 cost_per_1k_tokens: float = 0.0, call_sites=None):
+        self.name = name
+        self.url = url
+        self.model = model
+        self.headers = {"Content-Type": "application/json"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.limiter = limiter or RateLimiter(0, 0)
+        self.resilience = ResilientCaller(CircuitBreaker(name))
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.call_sites = set(call_sites) if call_sites else None
+
+        self._health = {}  # call site -> [latency EWMA in seconds or None, error EWMA]
+        self.calls = 0
+        self.errors = 0
+        self.tokens = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0  # prompt tokens served from the provider's prefix cache
+        self._lock = threading.Lock()
+
+    def serves(self, call_site: str) -> bool:
+        return self.call_sites is None or call_site in self.call_sites
+
+    def record_result(self, call_site: str, seconds: float = None, failed: bool = False):
+        """Updates the call site's health EWMAs after an attempt (latency only on success)"""
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            health = self._health.setdefault(call_site, [None, 0.0])
+            health[1] += LLM_ROUTER_EWMA_ALPHA * ((1.0 if failed else 0.0) - health[1])
+            if seconds is not None:
+                if health[0] is None:
+                    health[0] = seconds
+                else:
+                    health[0] += LLM_ROUTER_EWMA_ALPHA * (seconds - health[0])
+
+    def record_tokens(self, tokens: int, prompt_tokens: int = 0, cached_tokens: int = 0):
+        with self._lock:
+            self.tokens += tokens
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+
+    def score(self, call_site: str) -> float:
+        """Lower is better. Providers without samples for the call site score 0 so they get tried."""
+        with self._lock:
+            latency, error = self._health.get(call_site, (None, 0.0))
+        return ((latency or 0.0) * (1 + LLM_ROUTER_ERROR_PENALTY * error)
+                + LLM_ROUTER_COST_WEIGHT * self.cost_per_1k_tokens
+                + self.limiter.paused_for())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "model": self.model,
+                "calls": self.calls,
+                "errors": self.errors,
+                "call_sites": {
+                    call_site: {
+                        "latency_ewma_ms": round(latency * 1000) if latency is not None else None,
+                        "error_ewma": round(error, 3)
+                    }
+                    for call_site, (latency, error) in self._health.items()
+                },
+                "tokens": self.tokens,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_prompt_ratio": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else None,
+                "cost_usd": round(self.tokens / 1000 * self.cost_per_1k_tokens, 4),
+                "rate_limiter": self.limiter.stats(),
+                **self.resilience.stats()
+            }
+
+
+def load_providers(config: str = LLM_PROVIDERS) -> list:
+    """Builds the provider list from LLM_PROVIDERS, or the default Groq endpoint"""
+    if not config.strip():
+        return [Provider("groq", GROQ_API_URL, MODEL_NAME, GROQ_API_KEY, limiter=LIMITER)]
+
+    providers = []
+    for entry in json.loads(config):
+        api_key = entry.get("api_key") or (os.getenv(entry["api_key_env"]) if entry.get("api_key_env") else None)
+        providers.append(Provider(
+            entry["name"],
+            entry["url"],
+            entry.get("model", MODEL_NAME),
+            api_key,
+            limiter=RateLimiter(float(entry.get("rpm", 0)), float(entry.get("tpm", 0))),
+            cost_per_1k_tokens=float(entry.get("cost_per_1k_tokens", 0)),
+            call_sites=entry.get("call_sites")
+        ))
+    if not providers:
+        raise ValueError("LLM_PROVIDERS is empty")
+    return providers
+
+
+class Router:
+    """
+    Orders the providers that serve a call site by their recent latency and
+    error EWMAs for that call site. Callers try them in that order, failing
+    over to the next one when a provider's attempt fails.
+    """
+
+    def __init__(self, providers: list):
+        self.providers = providers
+
+    def candidates(self, call_site: str) -> list:
+        eligible = [p for p in self.providers if p.serves(call_site)] or list(self.providers)
+        # Providers with an open circuit go last rather than being dropped, so
+        # the call still has somewhere to go if every circuit is open
+        open_circuit = [p for p in eligible if p.resilience.breaker.state == "open"]
+        ranked = sorted(eligible, key=lambda p: (p in open_circuit, p.score(call_site)))
+        explorable = [p for p in ranked[1:] if p not in open_circuit]
+        if explorable and random.random() < LLM_ROUTER_EXPLORE:
+            explored = random.choice(explorable)
+            ranked.remove(explored)
+            ranked.insert(0, explored)
+            metrics.increment("llm_router_explore")
+        return ranked
+
+    def paused_for(self) -> float:
+        """Shortest rate-limit pause across providers (0 if any can take calls)"""
+        return min(p.limiter.paused_for() for p in self.providers)
+
+    def stats(self) -> dict:
+        return {p.name: p.stats() for p in self.providers}
+
+
+ROUTER = Router(load_providers())
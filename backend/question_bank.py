@@ -0,0 +1,342 @@
+# backend/question_bank.py
+import asyncio
+import os
+import re
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+load_dotenv()
+from sqlalchemy import func
+from database import SessionLocal
+from models import BankQuestion
+from llm import ask_technical_question_async, ask_new_topic_question_async
+from dedupe import PartitionedIndex, is_near_duplicate, DEDUPE_QUESTIONS
+from rate_limiter import llm_priority, PRIORITY_BACKGROUND
+from prompts import experience_band
+import metrics
+
+# Serve first and new-topic questions from a pre-generated bank instead of
+# calling the LLM on the request path. Each bucket that candidates ask for is
+# kept filled to BANK_TARGET_DEPTH questions by a background warmer.
+QUESTION_BANK = os.getenv("QUESTION_BANK", "false").lower() in {"1", "true", "yes"}
+BANK_TARGET_DEPTH = int(os.getenv("BANK_TARGET_DEPTH", "5"))
+BANK_WARM_INTERVAL = float(os.getenv("BANK_WARM_INTERVAL", "30"))
+BANK_WARM_CONCURRENCY = int(os.getenv("BANK_WARM_CONCURRENCY", "2"))
+# Buckets nobody asked for within BANK_DEMAND_TTL seconds stop being warmed and
+# their banked questions are deleted; at most BANK_MAX_BUCKETS are warmed.
+BANK_DEMAND_TTL = float(os.getenv("BANK_DEMAND_TTL", "86400"))
+BANK_MAX_BUCKETS = int(os.getenv("BANK_MAX_BUCKETS", "50"))
+
+# How many rows of a bucket are scanned for one the interview hasn't seen yet
+_TAKE_SCAN = 20
+
+
+def normalize_stack(tech_stack: str) -> str:
+    """
+    Canonical bucket key for a tech stack: lowercased tokens, sorted and
+    de-duplicated, so "Python, SQL" and "sql / python" share a bucket.
+    """
+    tokens = re.split(r"[,;/|&\n]+|\band\b", (tech_stack or "").lower())
+    tokens = sorted({re.sub(r"\s+", " ", t).strip() for t in tokens} - {""})
+    return ",".join(tokens)[:255]
+
+
+def difficulty_bucket(difficulty: float) -> int:
+    """Maps the 1.0-5.0 difficulty scale to whole-number buckets"""
+    return min(5, max(1, int(difficulty + 0.5)))
+
+
+def seniority_band(experience: float) -> str:
+    """Same experience bands the question prompts describe"""
+    return experience_band(experience)[0]
+
+
+def normalize_position(position: str) -> str:
+    """Questions are tailored to the position, so "Backend Engineer" and "backend  engineer" share a bucket"""
+    return re.sub(r"\s+", " ", (position or "").lower()).strip()[:100]
+
+
+def bucket_key(kind: str, tech_stack: str, difficulty: float, position: str, experience: float) -> tuple:
+    return (
+        kind,
+        normalize_stack(tech_stack),
+        difficulty_bucket(difficulty),
+        seniority_band(experience),
+        normalize_position(position)
+    )
+
+
+_BUCKET_COLUMNS = (
+    BankQuestion.kind,
+    BankQuestion.stack_key,
+    BankQuestion.difficulty_bucket,
+    BankQuestion.seniority,
+    BankQuestion.position_key
+)
+
+
+def _in_bucket(key: tuple) -> list:
+    return [column == value for column, value in zip(_BUCKET_COLUMNS, key)]
+
+
+class QuestionBank:
+    """
+    Persistent pool of pre-generated questions, indexed by
+    (kind, stack key, difficulty bucket, seniority band, position).
+
+    take() and add() are blocking DB calls (run them with asyncio.to_thread).
+    A served question is deleted, so no two candidates get the same banked
+    question; the warmer refills the bucket in the background.
+
+    Banked questions are also kept in a near-duplicate index partitioned by
+    stack key, so the bank does not fill up with the same scenario reworded.
+
+    Only recently demanded buckets are warmed: a bucket idle for longer than
+    BANK_DEMAND_TTL is forgotten and its banked questions are deleted.
+    """
+
+    def __init__(self):
+        self._demand = {}  # bucket key -> profile to generate with
+        self._last_demand = {}  # bucket key -> when it was last asked for (UTC)
+        self._index = PartitionedIndex()  # stack key -> question ids
+        self._task = None
+
+    def note_demand(self, kind: str, tech_stack: str, difficulty: float, position: str, experience: float,
+                    at: datetime = None):
+        key = bucket_key(kind, tech_stack, difficulty, position, experience)
+        self._demand[key] = {
+            "tech_stack": tech_stack,
+            "position": position,
+            "experience": experience,
+            "difficulty": difficulty
+        }
+        self._last_demand[key] = max(at or datetime.utcnow(), self._last_demand.get(key, datetime.min))
+
+    def take(self, kind: str, tech_stack: str, difficulty: float, position: str, experience: float,
+             exclude_questions=(), exclude_topics=()):
+        """
+        Removes and returns (question, topic) from the matching bucket, skipping
+        questions the interview already had (or near-duplicates of them) and
+        covered topics. Returns None on a miss.
+        """
+        self.note_demand(kind, tech_stack, difficulty, position, experience)
+        key = bucket_key(kind, tech_stack, difficulty, position, experience)
+        stack_key = key[1]
+        exclude_questions = list(exclude_questions)
+        exclude_topics = {t.lower() for t in exclude_topics}
+
+        db = SessionLocal()
+        try:
+            rows = db.query(BankQuestion).filter(
+                *_in_bucket(key)
+            ).order_by(BankQuestion.id).limit(_TAKE_SCAN).all()
+
+            for row in rows:
+                if row.topic and row.topic.lower() in exclude_topics:
+                    continue
+                if row.question_text in exclude_questions or (
+                        DEDUPE_QUESTIONS and is_near_duplicate(row.question_text, exclude_questions)):
+                    continue
+                # Claim the row; another worker may have served it first
+                claimed = db.query(BankQuestion).filter(BankQuestion.id == row.id).delete()
+                db.commit()
+                self._index.remove(stack_key, row.id)
+                if claimed:
+                    metrics.increment(f"question_bank_hit.{kind}")
+                    return row.question_text, row.topic
+        finally:
+            db.close()
+
+        metrics.increment(f"question_bank_miss.{kind}")
+        return None
+
+    def add(self, kind: str, profile: dict, question: str, topic: str = None) -> bool:
+        key = bucket_key(kind, profile["tech_stack"], profile["difficulty"], profile["position"], profile["experience"])
+        kind, stack_key, bucket, band, position_key = key
+        db = SessionLocal()
+        try:
+            duplicate = db.query(BankQuestion.id).filter(
+                *_in_bucket(key),
+                BankQuestion.question_text == question
+            ).first()
+            if duplicate:
+                return False
+            if DEDUPE_QUESTIONS and self._index.query(stack_key, question):
+                metrics.increment("question_bank_near_duplicate")
+                return False
+            row = BankQuestion(
+                kind=kind,
+                stack_key=stack_key,
+                difficulty_bucket=bucket,
+                seniority=band,
+                position_key=position_key,
+                question_text=question,
+                topic=topic[:100] if topic else None,
+                tech_stack=profile["tech_stack"],
+                position=profile["position"],
+                experience=profile["experience"],
+                difficulty=profile["difficulty"]
+            )
+            db.add(row)
+            db.commit()
+            self._index.add(stack_key, row.id, question)
+            return True
+        finally:
+            db.close()
+
+    def near_duplicates(self, tech_stack: str, question: str) -> list:
+        """Ids of banked questions for the stack that repeat `question` in other words"""
+        return [question_id for question_id, _ in self._index.query(normalize_stack(tech_stack), question)]
+
+    def depths(self) -> dict:
+        """Returns {bucket key: number of banked questions}"""
+        db = SessionLocal()
+        try:
+            rows = db.query(*_BUCKET_COLUMNS, func.count(BankQuestion.id)).group_by(*_BUCKET_COLUMNS).all()
+            return {tuple(row[:5]): row[5] for row in rows}
+        finally:
+            db.close()
+
+    def load_index(self):
+        """Indexes the questions already in the bank for near-duplicate checks"""
+        db = SessionLocal()
+        try:
+            rows = db.query(BankQuestion.id, BankQuestion.stack_key, BankQuestion.question_text).yield_per(1000)
+            for question_id, stack_key, question in rows:
+                self._index.add(stack_key, question_id, question)
+        finally:
+            db.close()
+        print(f"🏦 Question bank index loaded ({len(self._index)} questions)")
+
+    def load_demand(self):
+        """
+        Resumes warming the banked buckets refilled within BANK_DEMAND_TTL
+        (e.g. after a restart). The warmer refills a bucket right after it is
+        served from, so its newest question stands in for its last demand.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=BANK_DEMAND_TTL)
+        db = SessionLocal()
+        try:
+            latest = db.query(func.max(BankQuestion.id)).group_by(*_BUCKET_COLUMNS).having(
+                func.max(BankQuestion.created_at) >= cutoff
+            ).all()
+            ids = [row[0] for row in latest]
+            for row in db.query(BankQuestion).filter(BankQuestion.id.in_(ids)).all() if ids else []:
+                self.note_demand(row.kind, row.tech_stack, row.difficulty, row.position, row.experience,
+                                 at=row.created_at)
+        finally:
+            db.close()
+
+    def expire_idle(self):
+        """
+        Forgets buckets not asked for within BANK_DEMAND_TTL and deletes the
+        banked questions of every bucket that is neither demanded here nor
+        refilled since the cutoff (another worker may still be warming it).
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=BANK_DEMAND_TTL)
+        for key, at in list(self._last_demand.items()):
+            if at < cutoff:
+                self._demand.pop(key, None)
+                self._last_demand.pop(key, None)
+
+        db = SessionLocal()
+        try:
+            latest = db.query(*_BUCKET_COLUMNS, func.max(BankQuestion.created_at)).group_by(*_BUCKET_COLUMNS).all()
+            idle = [
+                tuple(row[:5]) for row in latest
+                if tuple(row[:5]) not in self._demand and (row[5] is None or row[5] < cutoff)
+            ]
+            for key in idle:
+                ids = [row[0] for row in db.query(BankQuestion.id).filter(*_in_bucket(key)).all()]
+                db.query(BankQuestion).filter(BankQuestion.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+                for question_id in ids:
+                    self._index.remove(key[1], question_id)
+                metrics.increment("question_bank_expired", len(ids))
+            if idle:
+                print(f"🏦 Question bank expired {len(idle)} idle buckets")
+        finally:
+            db.close()
+
+    def start(self):
+        """Starts the background warmer (must be called from the event loop)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        # Warming only uses rate-limit budget that live interviews leave over
+        with llm_priority(PRIORITY_BACKGROUND):
+            await self._warm_forever()
+
+    async def _warm_forever(self):
+        try:
+            await asyncio.to_thread(self.load_demand)
+            if DEDUPE_QUESTIONS:
+                await asyncio.to_thread(self.load_index)
+        except Exception as e:
+            print(f"⚠️ Could not load question bank buckets: {e}")
+
+        while True:
+            try:
+                await self.warm_once()
+            except Exception as e:
+                print(f"❌ Question bank warming failed: {e}")
+            await asyncio.sleep(BANK_WARM_INTERVAL)
+
+    async def warm_once(self):
+        """Tops up the BANK_MAX_BUCKETS most recently demanded buckets to BANK_TARGET_DEPTH"""
+        await asyncio.to_thread(self.expire_idle)
+        depths = await asyncio.to_thread(self.depths)
+        semaphore = asyncio.Semaphore(BANK_WARM_CONCURRENCY)
+        fills = []
+        recent = sorted(list(self._last_demand.items()), key=lambda item: item[1], reverse=True)
+        for key, _ in recent[:BANK_MAX_BUCKETS]:
+            missing = BANK_TARGET_DEPTH - depths.get(key, 0)
+            if missing > 0 and key in self._demand:
+                fills.append(self._fill(key[0], self._demand[key], missing, semaphore))
+        if fills:
+            await asyncio.gather(*fills)
+
+    async def _fill(self, kind: str, profile: dict, missing: int, semaphore: asyncio.Semaphore):
+        for _ in range(missing):
+            async with semaphore:
+                try:
+                    question, topic = await self._generate(kind, profile)
+                except Exception as e:
+                    print(f"⚠️ Question bank generation failed: {e}")
+                    return
+            if not question or not await asyncio.to_thread(self.add, kind, profile, question, topic):
+                # The model is repeating itself for this bucket, retry next cycle
+                return
+            metrics.increment(f"question_bank_generated.{kind}")
+
+    async def _generate(self, kind: str, profile: dict):
+        if kind == "technical":
+            question = await ask_technical_question_async(
+                profile["tech_stack"],
+                profile["difficulty"],
+                profile["position"],
+                profile["experience"],
+                use_cache=False
+            )
+            return question, None
+
+        topics = []
+        question = await ask_new_topic_question_async(
+            profile["tech_stack"],
+            profile["difficulty"],
+            profile["position"],
+            profile["experience"],
+            topics,
+            []
+        )
+        return question, topics[0] if topics else None
@@ -0,0 +1,251 @@
+# backend/rate_limiter.py
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+load_dotenv()
+import metrics
+
+# Provider quotas; 0 disables that limit. Set these to your Groq plan's limits.
+LLM_RPM = float(os.getenv("LLM_RPM", "0"))
+LLM_TPM = float(os.getenv("LLM_TPM", "0"))
+
+# Lower numbers are served first when the quota is exhausted
+PRIORITY_LIVE = 0  # Question the candidate is waiting for
+PRIORITY_EVALUATION = 1
+PRIORITY_RATING = 2
+PRIORITY_BACKGROUND = 3  # Speculation, question bank warming
+
+CALL_SITE_PRIORITIES = {
+    "technical_question": PRIORITY_LIVE,
+    "followup_question": PRIORITY_LIVE,
+    "new_topic_question": PRIORITY_LIVE,
+    "evaluation": PRIORITY_EVALUATION,
+    "rating": PRIORITY_RATING,
+    "batch_evaluation": PRIORITY_BACKGROUND,
+}
+
+_PRIORITY_OVERRIDE = contextvars.ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def llm_priority(priority: int):
+    """
+    Runs the enclosed LLM calls (and tasks created inside) at `priority`,
+    e.g. to push background generation behind live traffic.
+    """
+    token = _PRIORITY_OVERRIDE.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY_OVERRIDE.reset(token)
+
+
+def priority_for(call_site: str) -> int:
+    override = _PRIORITY_OVERRIDE.get()
+    if override is not None:
+        return override
+    return CALL_SITE_PRIORITIES.get(call_site, PRIORITY_EVALUATION)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English prompts)"""
+    return max(1, len(text) // 4)
+
+
+# Running average of completion tokens per call site, seeded conservatively
+_COMPLETION_ESTIMATES = {}
+_DEFAULT_COMPLETION_ESTIMATE = 300
+
+
+def estimate_request_tokens(call_site: str, payload: dict) -> int:
+    """Prompt tokens plus the expected completion length for this call site"""
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in payload.get("messages", []))
+    completion = _COMPLETION_ESTIMATES.get(call_site, _DEFAULT_COMPLETION_ESTIMATE)
+    return prompt_tokens + min(int(completion), payload.get("max_tokens") or int(completion))
+
+
+def record_completion_tokens(call_site: str, tokens: int):
+    previous = _COMPLETION_ESTIMATES.get(call_site)
+    _COMPLETION_ESTIMATES[call_site] = tokens if previous is None else 0.8 * previous + 0.2 * tokens
+
+
+class TokenBucket:
+    """Refills continuously at `per_minute / 60` per second up to `per_minute`."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (after refill)"""
+        if not self.enabled or self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class _Waiter:
+    def __init__(self, tokens: int, loop=None):
+        self.tokens = tokens
+        self.loop = loop
+        self.future = loop.create_future() if loop else None
+        self.event = None if loop else threading.Event()
+        self.enqueued = time.monotonic()
+        # Set under the limiter lock; the future only resolves later on the loop
+        self.granted = False
+
+    def grant(self):
+        self.granted = True
+        if self.future is not None:
+            self.loop.call_soon_threadsafe(self._resolve)
+        else:
+            self.event.set()
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(True)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute budget shared by every LLM call
+    in the process, with a priority queue in front of it.
+
+    A call reserves one request and its estimated tokens; if the budget is
+    short it queues, and waiters are granted strictly in (priority, arrival)
+    order so live questions overtake evaluations and ratings. settle()
+    corrects the token bucket once the real usage is known.
+    """
+
+    def __init__(self, rpm: float = LLM_RPM, tpm: float = LLM_TPM):
+        self._requests = TokenBucket(rpm)
+        self._tokens = TokenBucket(tpm)
+        self._queue = []  # [priority, seq, waiter]
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._requests.enabled or self._tokens.enabled
+
+    def _clamp(self, tokens: int) -> int:
+        # A request larger than the whole bucket would never be granted
+        return min(tokens, int(self._tokens.capacity)) if self._tokens.enabled else tokens
+
+    def _grant_locked(self) -> float:
+        """Grants queued waiters that fit the budget; returns seconds until the head fits"""
+        now = time.monotonic()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        while self._queue:
+            if now < self._paused_until:
+                return self._paused_until - now
+            _, _, waiter = self._queue[0]
+            wait = max(self._requests.wait_time(1), self._tokens.wait_time(waiter.tokens))
+            if wait > 0:
+                return wait
+            heapq.heappop(self._queue)
+            if self._requests.enabled:
+                self._requests.level -= 1
+            if self._tokens.enabled:
+                self._tokens.level -= waiter.tokens
+            metrics.observe("llm_rate_limit_wait", now - waiter.enqueued)
+            waiter.grant()
+        return 0.0
+
+    def _enqueue(self, priority: int, tokens: int, loop=None) -> _Waiter:
+        waiter = _Waiter(self._clamp(tokens), loop)
+        heapq.heappush(self._queue, [priority, next(self._counter), waiter])
+        return waiter
+
+    def acquire(self, tokens: int, priority: int = PRIORITY_EVALUATION):
+        """Blocks the calling thread until the request fits the budget."""
+        if not self.enabled and not self.paused_for():
+            return
+        with self._lock:
+            waiter = self._enqueue(priority, tokens)
+        while True:
+            with self._lock:
+                wait = self._grant_locked()
+            if waiter.event.wait(min(wait, 1.0) if wait > 0 else 0.05):
+                return
+
+    async def acquire_async(self, tokens: int, priority: int = PRIORITY_EVALUATION):
+        """Waits on the event loop until the request fits the budget."""
+        if not self.enabled and not self.paused_for():
+            return
+        with self._lock:
+            waiter = self._enqueue(priority, tokens, asyncio.get_running_loop())
+        try:
+            while True:
+                with self._lock:
+                    wait = self._grant_locked()
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), min(wait, 1.0) if wait > 0 else 0.05)
+                    return
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    # Granted before the cancellation, even if the future has not
+                    # resolved yet: give the budget back
+                    self._requests.level += 1 if self._requests.enabled else 0
+                    self._tokens.level += waiter.tokens if self._tokens.enabled else 0
+                else:
+                    self._queue = [entry for entry in self._queue if entry[2] is not waiter]
+                    heapq.heapify(self._queue)
+            raise
+
+    def settle(self, reserved: int, actual: int):
+        """Charges or refunds the difference between the estimated and real token usage."""
+        if not self._tokens.enabled or actual is None:
+            return
+        with self._lock:
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + self._clamp(reserved) - actual)
+
+    def pause(self, seconds: float):
+        """Holds every queued and new call for `seconds` (after a 429 with Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        metrics.increment("llm_rate_limited")
+
+    def paused_for(self) -> float:
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            by_priority = {}
+            for priority, _, _ in self._queue:
+                by_priority[priority] = by_priority.get(priority, 0) + 1
+            return {
+                "enabled": self.enabled,
+                "queue_depth": len(self._queue),
+                "queue_by_priority": by_priority,
+                "requests_available": round(self._requests.level, 1) if self._requests.enabled else None,
+                "tokens_available": round(self._tokens.level) if self._tokens.enabled else None,
+                "paused_for": round(max(0.0, self._paused_until - now), 1)
+            }
+
+
+LIMITER = RateLimiter()
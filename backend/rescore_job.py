@@ -0,0 +1,299 @@
+# backend/rescore_job.py
+"""
+Resumable offline re-scoring of the whole questions table.
+
+Phase 1 streams Question rows in keyset-paginated chunks (id > last id),
+re-evaluates them with the current rubric through batch_eval and
+bulk-writes the scores. Phase 2 walks completed interviews the same way and
+recomputes Interview.candidate_rating from the new scores.
+
+At most about 2 x `--workers` chunks are held in memory. After each chunk
+the highest id below which everything is done is written to the checkpoint
+file, so a stopped job continues where it left off.
+
+Usage:
+    python rescore_job.py --workers 4 --chunk-size 200
+    python rescore_job.py --restart          # ignore the checkpoint
+    python rescore_job.py --skip-ratings     # phase 1 only
+    python rescore_job.py --provisional      # only provisional local scores, then re-rate their interviews
+
+Provisional scores are the ones the local model gave while the LLM was
+unavailable (EVAL_BACKEND=fallback). They are excluded from ratings and
+training until this job re-scores them; re-scored rows stop matching the
+filter, so a --provisional run needs no checkpoint.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from dotenv import load_dotenv
+load_dotenv()
+from sqlalchemy import or_
+
+from database import SessionLocal, add_missing_columns
+from models import Question, Interview, Candidate
+from batch_eval import rescore_questions
+from llm import rate_candidate_async
+from rate_limiter import llm_priority, PRIORITY_BACKGROUND
+
+RESCORE_CHUNK_SIZE = int(os.getenv("RESCORE_CHUNK_SIZE", "200"))
+RESCORE_WORKERS = int(os.getenv("RESCORE_WORKERS", "4"))
+RESCORE_CHECKPOINT = os.getenv("RESCORE_CHECKPOINT", "rescore_checkpoint.json")
+
+# Seconds between progress lines
+_PROGRESS_INTERVAL = 10
+
+
+class Checkpoint:
+    """Last fully processed id per phase, persisted as JSON (atomic replace)"""
+
+    def __init__(self, path: str, restart: bool = False, persist: bool = True):
+        self.path = path
+        self.persist = persist
+        self.state = {"questions": 0, "ratings": 0}
+        if not restart and os.path.exists(path):
+            with open(path) as f:
+                self.state.update(json.load(f))
+
+    def get(self, phase: str) -> int:
+        return self.state[phase]
+
+    def save(self, phase: str, last_id: int):
+        self.state[phase] = last_id
+        if not self.persist:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+
+class Progress:
+    def __init__(self, phase: str, total: int):
+        self.phase = phase
+        self.total = total
+        self.done = 0
+        self.started = time.perf_counter()
+        self.reported = self.started
+
+    def add(self, count: int, force: bool = False):
+        self.done += count
+        now = time.perf_counter()
+        if not force and now - self.reported < _PROGRESS_INTERVAL:
+            return
+        self.reported = now
+        rate = self.done / max(now - self.started, 1e-9)
+        remaining = (self.total - self.done) / rate if rate and self.total > self.done else 0
+        print(f"📈 {self.phase}: {self.done}/{self.total} ({rate:.1f}/s, ~{remaining / 60:.0f} min left)")
+
+
+def count_after(model, after_id: int, *filters) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(model).filter(model.id > after_id, *filters).count()
+    finally:
+        db.close()
+
+
+def fetch_question_chunk(after_id: int, size: int, provisional: bool = False) -> list:
+    """Next `size` answered questions with id > after_id (keyset pagination)"""
+    db = SessionLocal()
+    try:
+        query = db.query(
+            Question.id,
+            Question.interview_id,
+            Question.question_text,
+            Question.answer_text,
+            Question.difficulty,
+            Question.score
+        ).filter(
+            Question.id > after_id,
+            Question.answer_text.isnot(None)
+        )
+        if provisional:
+            query = query.filter(Question.score_source == "local")
+        return query.order_by(Question.id).limit(size).all()
+    finally:
+        db.close()
+
+
+def fetch_interview_chunk(after_id: int, size: int, interview_ids=None) -> list:
+    """
+    Next `size` rated interviews with id > after_id (terminated ones keep a
+    NULL rating), or the completed ones among `interview_ids`.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(Interview.id).filter(Interview.id > after_id)
+        if interview_ids is None:
+            query = query.filter(Interview.candidate_rating.isnot(None))
+        else:
+            query = query.filter(Interview.id.in_(interview_ids), Interview.status == "completed")
+        return query.order_by(Interview.id).limit(size).all()
+    finally:
+        db.close()
+
+
+def load_rating_input(interview_id: int):
+    """Candidate profile and stored per-question scores for one interview"""
+    db = SessionLocal()
+    try:
+        candidate = db.query(Candidate).join(Interview).filter(Interview.id == interview_id).first()
+        # Provisional scores stay out of ratings until they are re-scored
+        questions = db.query(Question.question_text, Question.answer_text, Question.score, Question.difficulty) \
+            .filter(
+                Question.interview_id == interview_id,
+                or_(Question.score_source.is_(None), Question.score_source != "local")
+            ).order_by(Question.id).all()
+        candidate_info = {
+            "name": candidate.name,
+            "experience": candidate.experience,
+            "position": candidate.position,
+            "tech_stack": candidate.tech_stack
+        } if candidate else {}
+        questions_data = [
+            {"question": q.question_text, "answer": q.answer_text, "score": q.score or 0.0, "difficulty": q.difficulty}
+            for q in questions
+        ]
+        return candidate_info, questions_data
+    finally:
+        db.close()
+
+
+def write_ratings(ratings: dict):
+    if not ratings:
+        return
+    db = SessionLocal()
+    try:
+        db.bulk_update_mappings(Interview, [
+            {"id": interview_id, "candidate_rating": rating} for interview_id, rating in ratings.items()
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_phase(phase: str, checkpoint: Checkpoint, fetch, process, total: int,
+                    chunk_size: int, workers: int):
+    """
+    Reads chunks with `fetch(after_id, size)` and runs `process(rows)` on up
+    to `workers` chunks at once. Chunks can finish out of order, so the
+    checkpoint only advances past a chunk once every earlier one is done.
+    """
+    progress = Progress(phase, total)
+    queue = asyncio.Queue(maxsize=workers)
+    pending = []  # [last id of chunk, done] in read order
+    lock = asyncio.Lock()
+
+    async def reader():
+        after_id = checkpoint.get(phase)
+        while True:
+            rows = await asyncio.to_thread(fetch, after_id, chunk_size)
+            if not rows:
+                break
+            after_id = rows[-1].id
+            entry = [after_id, False]
+            pending.append(entry)
+            await queue.put((rows, entry))
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def worker():
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            rows, entry = job
+            await process(rows)
+            async with lock:
+                entry[1] = True
+                last_done = None
+                while pending and pending[0][1]:
+                    last_done = pending.pop(0)[0]
+                if last_done is not None:
+                    await asyncio.to_thread(checkpoint.save, phase, last_done)
+            progress.add(len(rows))
+
+    await asyncio.gather(reader(), *(worker() for _ in range(workers)))
+    progress.add(0, force=True)
+
+
+async def run(chunk_size: int, workers: int, checkpoint: Checkpoint, skip_ratings: bool, dry_run: bool,
+              provisional: bool = False):
+    rescored_interviews = set()
+
+    async def rescore_chunk(rows):
+        rescored_interviews.update(row.interview_id for row in rows)
+        scores = await rescore_questions(rows, dry_run=dry_run)
+        if len(scores) < len(rows):
+            # Stop before the checkpoint moves past answers that were not re-scored
+            raise RuntimeError(f"{len(rows) - len(scores)} answers in ids {rows[0].id}-{rows[-1].id} "
+                               f"could not be evaluated; rerun to resume from the checkpoint")
+
+    async def rerate_chunk(rows):
+        ratings = {}
+        for row in rows:
+            candidate_info, questions_data = await asyncio.to_thread(load_rating_input, row.id)
+            if questions_data:
+                ratings[row.id] = await rate_candidate_async(candidate_info, questions_data)
+        if not dry_run:
+            await asyncio.to_thread(write_ratings, ratings)
+
+    # Everything this job sends queues behind live interviews
+    with llm_priority(PRIORITY_BACKGROUND):
+        question_filters = [Question.answer_text.isnot(None)]
+        if provisional:
+            question_filters.append(Question.score_source == "local")
+        total = await asyncio.to_thread(count_after, Question, checkpoint.get("questions"), *question_filters)
+        print(f"🔁 Re-scoring {total} {'provisional ' if provisional else ''}answers "
+              f"(after question id {checkpoint.get('questions')})")
+        await run_phase(
+            "questions", checkpoint,
+            lambda after_id, size: fetch_question_chunk(after_id, size, provisional),
+            rescore_chunk, total, chunk_size, workers
+        )
+
+        if skip_ratings:
+            return
+        if provisional:
+            # Only the interviews whose scores changed, including ones left unrated
+            interview_ids = sorted(rescored_interviews)
+            interview_filters = [Interview.id.in_(interview_ids), Interview.status == "completed"]
+        else:
+            interview_ids = None
+            interview_filters = [Interview.candidate_rating.isnot(None)]
+        total = await asyncio.to_thread(count_after, Interview, checkpoint.get("ratings"), *interview_filters)
+        print(f"⭐ Re-rating {total} interviews (after interview id {checkpoint.get('ratings')})")
+        await run_phase(
+            "ratings", checkpoint,
+            lambda after_id, size: fetch_interview_chunk(after_id, size, interview_ids),
+            rerate_chunk, total, chunk_size, workers
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score every stored answer and recompute candidate ratings")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--workers", type=int, default=RESCORE_WORKERS, help="Chunks processed in parallel")
+    parser.add_argument("--checkpoint", default=RESCORE_CHECKPOINT, help="Checkpoint file")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    parser.add_argument("--skip-ratings", action="store_true", help="Don't recompute candidate ratings")
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate but don't write scores or the checkpoint")
+    parser.add_argument("--provisional", action="store_true",
+                        help="Only re-score provisional local scores and re-rate their interviews")
+    args = parser.parse_args()
+
+    add_missing_columns(Question.__table__)
+    if args.provisional:
+        checkpoint = Checkpoint(args.checkpoint, restart=True, persist=False)
+    else:
+        checkpoint = Checkpoint(args.checkpoint, args.restart, persist=not args.dry_run)
+    started = time.perf_counter()
+    asyncio.run(run(args.chunk_size, args.workers, checkpoint, args.skip_ratings, args.dry_run, args.provisional))
+    print(f"✅ Re-scoring finished in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+# backend/resilience.py
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import httpx
+from dotenv import load_dotenv
+load_dotenv()
+import metrics
+
+# Each attempt gets its own short deadline; the caller's timeout bounds the
+# whole call including retries and backoff.
+LLM_ATTEMPT_TIMEOUT = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+
+# Hedging sends a second copy of a slow request once it has taken longer than
+# the call site's p95 latency and uses whichever answers first. It costs extra
+# quota, so it is off by default and limited to calls a candidate waits on.
+LLM_HEDGE = os.getenv("LLM_HEDGE", "false").lower() in {"1", "true", "yes"}
+LLM_HEDGE_CALL_SITES = {
+    s.strip() for s in os.getenv(
+        "LLM_HEDGE_CALL_SITES", "technical_question,followup_question,new_topic_question"
+    ).split(",") if s.strip()
+}
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))
+
+# After this many consecutive failures the provider is skipped for the cooldown
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+# Latency samples kept per call site for the hedge delay
+_LATENCY_WINDOW = 200
+_MIN_HEDGE_SAMPLES = 20
+
+
+class TransientError(RuntimeError):
+    """
+    A failure that may succeed later (rate limit, 5xx, timeout, open
+    circuit). retry_after is the suggested wait in seconds.
+    """
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitedError(TransientError):
+    """The provider rejected the call with 429; retry_after is in seconds."""
+
+
+class CircuitOpenError(TransientError):
+    """The circuit breaker is open; the call was not sent."""
+
+
+# Network-level failures worth another attempt (asyncio.TimeoutError is the
+# builtin TimeoutError on Python 3.11+)
+_TRANSIENT_NETWORK_ERRORS = (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError)
+
+
+def is_transient(error: Exception) -> bool:
+    return isinstance(error, (TransientError,) + _TRANSIENT_NETWORK_ERRORS)
+
+
+def backoff_delay(attempt: int, retry_after: float = 0.0) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+    ceiling = min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * (2 ** attempt))
+    return max(retry_after, random.uniform(0, ceiling))
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per call site."""
+
+    def __init__(self, window: int = _LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_site: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(call_site)
+            if samples is None:
+                samples = self._samples[call_site] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def call_sites(self) -> list:
+        with self._lock:
+            return list(self._samples)
+
+    def percentile(self, call_site: str, q: float):
+        """Returns the q-th percentile in seconds, or None without enough samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(call_site, ()))
+        if len(samples) < _MIN_HEDGE_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: calls pass. After `threshold` consecutive transient failures it
+    opens and rejects calls for `cooldown` seconds, then lets a single probe
+    through (half-open); the probe's outcome closes or re-opens it.
+    """
+
+    def __init__(self, name: str, threshold: int = LLM_BREAKER_THRESHOLD, cooldown: float = LLM_BREAKER_COOLDOWN):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if now - self._opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self):
+        """Raises CircuitOpenError if the call must not be sent."""
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(now)
+            if state == "closed":
+                return
+            if state == "half_open" and not self._probing:
+                self._probing = True
+                return
+            retry_after = max(0.0, self.cooldown - (now - self._opened_at))
+        metrics.increment(f"llm_circuit_rejected.{self.name}")
+        raise CircuitOpenError(f"Circuit open for {self.name}", retry_after or 1.0)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or (self._opened_at is None and self._failures >= self.threshold > 0):
+                self._opened_at = time.monotonic()
+                self._probing = False
+                metrics.increment(f"llm_circuit_opened.{self.name}")
+                print(f"🔌 Circuit opened for {self.name} after {self._failures} failures")
+
+
+class ResilientCaller:
+    """
+    Runs LLM attempts with per-attempt deadlines, jittered retries on
+    transient failures, optional hedging and a circuit breaker.
+
+    An attempt is a callable taking the attempt timeout in seconds, which it
+    must enforce on the request itself (time spent queued in the rate limiter
+    doesn't count against it). Rate limits (429) are retried but don't count
+    against the breaker: they say nothing about the provider's health.
+    """
+
+    def __init__(self, breaker: CircuitBreaker, latencies: LatencyTracker = None):
+        self.breaker = breaker
+        self.latencies = latencies or LatencyTracker()
+
+    def _attempt_timeout(self, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TransientError("LLM call deadline exceeded")
+        return min(LLM_ATTEMPT_TIMEOUT, remaining)
+
+    def record(self, call_site: str, started: float, error: Exception = None):
+        """Feeds an attempt's outcome to the breaker and latency tracker"""
+        if error is None:
+            self.breaker.record_success()
+            self.latencies.record(call_site, time.monotonic() - started)
+        elif is_transient(error) and not isinstance(error, (RateLimitedError, CircuitOpenError)):
+            self.breaker.record_failure()
+
+    def _retry_delay(self, call_site: str, attempt: int, retries: int, error: Exception, deadline: float):
+        """Returns the backoff before the next attempt, or None to give up"""
+        if not is_transient(error) or attempt >= retries:
+            return None
+        delay = backoff_delay(attempt, getattr(error, "retry_after", 0.0))
+        if time.monotonic() + delay >= deadline:
+            return None
+        metrics.increment(f"llm_retry.{call_site}")
+        print(f"⏳ LLM call failed ({call_site}: {type(error).__name__}), retrying in {delay:.1f}s")
+        return delay
+
+    @staticmethod
+    def _final(error: Exception) -> Exception:
+        # Timeouts and connection errors surface as TransientError so callers
+        # only need to handle one family of retryable failures
+        if isinstance(error, _TRANSIENT_NETWORK_ERRORS):
+            detail = f": {error}" if str(error) else ""
+            wrapped = TransientError(f"LLM call failed: {type(error).__name__}{detail}")
+            wrapped.__cause__ = error
+            return wrapped
+        return error
+
+    def call(self, call_site: str, attempt_fn, timeout: float, retries: int = None):
+        """Runs attempt_fn until it succeeds, fails permanently or `retries` (default LLM_MAX_RETRIES) run out"""
+        retries = LLM_MAX_RETRIES if retries is None else retries
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                self.breaker.allow()
+                result = attempt_fn(self._attempt_timeout(deadline))
+            except Exception as e:
+                self.record(call_site, started, e)
+                delay = self._retry_delay(call_site, attempt, retries, e, deadline)
+                if delay is None:
+                    raise self._final(e)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.record(call_site, started)
+            return result
+
+    async def call_async(self, call_site: str, attempt_fn, timeout: float, retries: int = None):
+        """asyncio version of call(); attempt_fn returns a coroutine. Hedges live call sites."""
+        retries = LLM_MAX_RETRIES if retries is None else retries
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            try:
+                self.breaker.allow()
+                return await self._hedged(call_site, attempt_fn, self._attempt_timeout(deadline))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                delay = self._retry_delay(call_site, attempt, retries, e, deadline)
+                if delay is None:
+                    raise self._final(e)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _timed_attempt(self, call_site: str, attempt_fn, attempt_timeout: float):
+        started = time.monotonic()
+        try:
+            result = await attempt_fn(attempt_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.record(call_site, started, e)
+            raise
+        self.record(call_site, started)
+        return result
+
+    async def _hedged(self, call_site: str, attempt_fn, attempt_timeout: float):
+        hedge_after = self.hedge_delay(call_site)
+        primary = asyncio.ensure_future(self._timed_attempt(call_site, attempt_fn, attempt_timeout))
+        if hedge_after is None or hedge_after >= attempt_timeout:
+            return await primary
+
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done:
+                return primary.result()
+
+            metrics.increment(f"llm_hedge_sent.{call_site}")
+            hedge = asyncio.ensure_future(
+                self._timed_attempt(call_site, attempt_fn, attempt_timeout - hedge_after)
+            )
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            metrics.increment(f"llm_hedge_won.{call_site}")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def hedge_delay(self, call_site: str):
+        """Seconds to wait before hedging a call, or None if it is not hedged"""
+        if not LLM_HEDGE or call_site not in LLM_HEDGE_CALL_SITES:
+            return None
+        p95 = self.latencies.percentile(call_site, 95)
+        if p95 is None:
+            return None
+        return max(LLM_HEDGE_MIN_DELAY, p95)
+
+    def stats(self) -> dict:
+        return {
+            "breaker": self.breaker.state,
+            "p95_ms": {
+                call_site: round(p95 * 1000)
+                for call_site in self.latencies.call_sites()
+                if (p95 := self.latencies.percentile(call_site, 95)) is not None
+            }
+        }
@@ -1,5 +1,7 @@
 # backend/schemas.py
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, field_validator, model_validator
 
 class CandidateCreate(BaseModel):
     name: str
@@ -13,4 +15,33 @@ class CandidateCreate(BaseModel):
 class AnswerRequest(BaseModel):
     interview_id: int
     question: str
-    answer: str
\ No newline at end of file
+    answer: str
+
+# LLM response schemas (see llm_json.py)
+
+class EvaluationResult(BaseModel):
+    score: float
+    passed: Optional[bool] = None
+
+    @field_validator("score")
+    @classmethod
+    def clamp_score(cls, score: float) -> float:
+        return max(0.0, min(10.0, score))
+
+    @model_validator(mode="after")
+    def default_passed(self):
+        if self.passed is None:
+            self.passed = self.score >= 5.0
+        return self
+
+class BatchEvaluationItem(EvaluationResult):
+    id: int
+
+class RatingResult(BaseModel):
+    rating: float
+    justification: str = ""
+
+    @field_validator("rating")
+    @classmethod
+    def clamp_rating(cls, rating: float) -> float:
+        return max(0.0, min(5.0, rating))
@@ -0,0 +1,268 @@
+# backend/session_store.py
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# "memory" keeps sessions in this process only; "sqlite" shares them between
+# worker processes through a WAL-mode database file and survives restarts.
+SESSION_STORE = os.getenv("SESSION_STORE", "memory").lower()
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.db")
+
+
+class SessionStore:
+    """
+    Interface for live interview state, keyed by the database interview ID.
+
+    get() returns a snapshot; changes are only visible to other callers once
+    written back with update(), compare_and_set() or increment(). Every write
+    is atomic per interview, and compare_and_set() is the way to perform
+    status transitions (e.g. ready -> processing) exactly once across workers.
+
+    Code on the event loop uses the awaitable a*() variants, which run the call
+    in a worker thread for stores whose calls block (`blocking = True`).
+    """
+
+    blocking = False
+
+    def create(self, interview_id: int, state: dict):
+        raise NotImplementedError
+
+    def get(self, interview_id: int):
+        raise NotImplementedError
+
+    def update(self, interview_id: int, changes: dict) -> bool:
+        """Merges `changes` into the state. Returns False if the interview is unknown."""
+        raise NotImplementedError
+
+    def compare_and_set(self, interview_id: int, expected: dict, changes: dict) -> bool:
+        """Applies `changes` only if every field in `expected` currently has that value."""
+        raise NotImplementedError
+
+    def increment(self, interview_id: int, field: str, amount: int = 1):
+        """Atomically adds `amount` to a numeric field and returns the new value."""
+        raise NotImplementedError
+
+    def ids_with_status(self, statuses) -> list:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def transition_status(self, interview_id: int, from_status: str, to_status: str, changes: dict = None) -> bool:
+        """Moves the interview from `from_status` to `to_status` if nobody else did first."""
+        changes = dict(changes or {})
+        changes["status"] = to_status
+        return self.compare_and_set(interview_id, {"status": from_status}, changes)
+
+    async def _offload(self, method, *args):
+        if self.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def acreate(self, interview_id: int, state: dict):
+        return await self._offload(self.create, interview_id, state)
+
+    async def aget(self, interview_id: int):
+        return await self._offload(self.get, interview_id)
+
+    async def aupdate(self, interview_id: int, changes: dict) -> bool:
+        return await self._offload(self.update, interview_id, changes)
+
+    async def acompare_and_set(self, interview_id: int, expected: dict, changes: dict) -> bool:
+        return await self._offload(self.compare_and_set, interview_id, expected, changes)
+
+    async def aincrement(self, interview_id: int, field: str, amount: int = 1):
+        return await self._offload(self.increment, interview_id, field, amount)
+
+    async def aids_with_status(self, statuses) -> list:
+        return await self._offload(self.ids_with_status, statuses)
+
+    async def atransition_status(self, interview_id: int, from_status: str, to_status: str,
+                                 changes: dict = None) -> bool:
+        return await self._offload(self.transition_status, interview_id, from_status, to_status, changes)
+
+
+class InMemorySessionStore(SessionStore):
+    """Process-local store (single uvicorn worker)."""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self, interview_id: int, state: dict):
+        with self._lock:
+            self._sessions[interview_id] = copy.deepcopy(state)
+
+    def get(self, interview_id: int):
+        with self._lock:
+            state = self._sessions.get(interview_id)
+            return copy.deepcopy(state) if state is not None else None
+
+    def update(self, interview_id: int, changes: dict) -> bool:
+        with self._lock:
+            state = self._sessions.get(interview_id)
+            if state is None:
+                return False
+            state.update(copy.deepcopy(changes))
+            return True
+
+    def compare_and_set(self, interview_id: int, expected: dict, changes: dict) -> bool:
+        with self._lock:
+            state = self._sessions.get(interview_id)
+            if state is None:
+                return False
+            if any(state.get(key) != value for key, value in expected.items()):
+                return False
+            state.update(copy.deepcopy(changes))
+            return True
+
+    def increment(self, interview_id: int, field: str, amount: int = 1):
+        with self._lock:
+            state = self._sessions.get(interview_id)
+            if state is None:
+                return None
+            state[field] = state.get(field, 0) + amount
+            return state[field]
+
+    def ids_with_status(self, statuses) -> list:
+        with self._lock:
+            return [i for i, state in self._sessions.items() if state.get("status") in statuses]
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode(obj):
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Store shared by every worker process on a host, backed by SQLite in WAL mode.
+
+    Each write runs in a BEGIN IMMEDIATE transaction, which takes the database
+    write lock up front, so read-check-write sequences are atomic across processes.
+    Calls can wait up to 30 s for the lock, so they block.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str = SESSION_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " id INTEGER PRIMARY KEY,"
+                " status TEXT,"
+                " state TEXT NOT NULL,"
+                " updated_at TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_sessions_status ON sessions (status)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        store = self
+
+        class _Tx:
+            def __enter__(self):
+                self.conn = store._conn()
+                self.conn.execute("BEGIN IMMEDIATE")
+                return self.conn
+
+            def __exit__(self, exc_type, exc, tb):
+                self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+                return False
+
+        return _Tx()
+
+    def _load(self, conn, interview_id: int):
+        row = conn.execute("SELECT state FROM sessions WHERE id = ?", (interview_id,)).fetchone()
+        return json.loads(row[0], object_hook=_decode) if row else None
+
+    def _save(self, conn, interview_id: int, state: dict):
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (id, status, state, updated_at) VALUES (?, ?, ?, ?)",
+            (interview_id, state.get("status"), json.dumps(state, default=_encode), datetime.utcnow().isoformat())
+        )
+
+    def create(self, interview_id: int, state: dict):
+        with self._transaction() as conn:
+            self._save(conn, interview_id, state)
+
+    def get(self, interview_id: int):
+        return self._load(self._conn(), interview_id)
+
+    def update(self, interview_id: int, changes: dict) -> bool:
+        with self._transaction() as conn:
+            state = self._load(conn, interview_id)
+            if state is None:
+                return False
+            state.update(changes)
+            self._save(conn, interview_id, state)
+            return True
+
+    def compare_and_set(self, interview_id: int, expected: dict, changes: dict) -> bool:
+        with self._transaction() as conn:
+            state = self._load(conn, interview_id)
+            if state is None:
+                return False
+            if any(state.get(key) != value for key, value in expected.items()):
+                return False
+            state.update(changes)
+            self._save(conn, interview_id, state)
+            return True
+
+    def increment(self, interview_id: int, field: str, amount: int = 1):
+        with self._transaction() as conn:
+            state = self._load(conn, interview_id)
+            if state is None:
+                return None
+            state[field] = state.get(field, 0) + amount
+            self._save(conn, interview_id, state)
+            return state[field]
+
+    def ids_with_status(self, statuses) -> list:
+        statuses = list(statuses)
+        placeholders = ", ".join("?" for _ in statuses)
+        rows = self._conn().execute(
+            f"SELECT id FROM sessions WHERE status IN ({placeholders})", statuses
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def get_session_store() -> SessionStore:
+    """Builds the store selected by the SESSION_STORE environment variable."""
+    if SESSION_STORE == "sqlite":
+        print(f"🗄️ Using SQLite session store at {SESSION_DB_PATH}")
+        return SQLiteSessionStore(SESSION_DB_PATH)
+    if SESSION_STORE != "memory":
+        raise ValueError(f"Unknown SESSION_STORE: {SESSION_STORE}")
+    return InMemorySessionStore()
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Backend modules import each other by bare name and read their settings at import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("SESSION_STORE", "memory")
+os.environ.setdefault("QUESTION_BANK", "false")
+os.environ.setdefault("LLM_CACHE", "false")
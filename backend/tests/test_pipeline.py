@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime
+
+import main
+from interview import next_difficulty
+
+
+def make_interview(difficulty: float, last_passed: bool) -> dict:
+    return {
+        "difficulty": difficulty,
+        "last_passed": last_passed,
+        "current_question": "How would you index a large orders table?",
+        "question_count": 1,
+        "tech_stack": "Python, PostgreSQL",
+        "answers": [{
+            "question": "How would you index a large orders table?",
+            "answer": "A composite index on customer_id and created_at, since most queries filter on both.",
+            "timestamp": datetime.utcnow()
+        }],
+        "status": "processing",
+        "question_started_at": datetime.utcnow(),
+        "processing_started_at": datetime.utcnow(),
+        "time_limit": 180,
+        "violation_count": 0,
+        "is_terminated": False,
+        "candidate_info": {"name": "Test", "position": "Backend Engineer", "experience": 3},
+        "covered_topics": [],
+        "last_question_type": "new_topic",
+        "question_history": [],
+    }
+
+
+def run_pipelined(monkeypatch, interview_id: int, interview: dict, passed: bool) -> list:
+    """Processes the interview's answer with a stubbed LLM; returns the difficulties questions were generated at"""
+    generated_at = []
+
+    async def fake_evaluate(question, answer, difficulty, time_taken):
+        return {"passed": passed, "score": 8.0 if passed else 2.0}
+
+    async def fake_generate(interview_id, interview, question_type, last, difficulty, timings=None, stream=False):
+        generated_at.append(difficulty)
+        return f"Question at {difficulty}", [], difficulty
+
+    monkeypatch.setattr(main, "PIPELINED_PROCESSING", True)
+    monkeypatch.setattr(main, "SPECULATIVE_QUESTIONS", False)
+    monkeypatch.setattr(main, "evaluate_answer_async", fake_evaluate)
+    monkeypatch.setattr(main, "generate_question", fake_generate)
+    monkeypatch.setattr(main, "save_question_score", lambda *args: None)
+    monkeypatch.setattr(main, "choose_question_type", lambda interview, last, number: "new_topic")
+
+    main.STORE.create(interview_id, interview)
+
+    async def run():
+        await main.process_next_question(interview_id)
+        main.TIMERS.cancel(interview_id)
+        await main.flush_pending_writes(interview_id)
+
+    asyncio.run(run())
+    return generated_at
+
+
+def test_mispredicted_pipeline_keeps_evaluated_difficulty(monkeypatch):
+    # The previous answer passed, so the pipeline predicts another pass; this one fails
+    interview = make_interview(3.5, last_passed=True)
+    generated_at = run_pipelined(monkeypatch, 9001, interview, passed=False)
+
+    evaluated = next_difficulty(3.5, False)
+    stored = main.STORE.get(9001)
+    assert stored["status"] == "ready"
+    assert stored["difficulty"] == evaluated
+    # The predicted question was outside the tolerance and regenerated at the evaluated difficulty
+    assert generated_at == [next_difficulty(3.5, True), evaluated]
+    assert stored["current_question"] == f"Question at {evaluated}"
+
+
+def test_correct_prediction_reuses_pipelined_question(monkeypatch):
+    interview = make_interview(3.5, last_passed=True)
+    generated_at = run_pipelined(monkeypatch, 9002, interview, passed=True)
+
+    stored = main.STORE.get(9002)
+    assert stored["difficulty"] == next_difficulty(3.5, True)
+    assert generated_at == [next_difficulty(3.5, True)]
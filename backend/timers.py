@@ -0,0 +1,98 @@
+# backend/timers.py
+import asyncio
+import heapq
+import itertools
+from datetime import datetime
+
+
+class DeadlineScheduler:
+    """
+    One heap of deadlines for every interview, driven by a single asyncio task.
+
+    schedule() and cancel() are O(log n); cancelled entries are dropped lazily
+    when they reach the top of the heap. The runner sleeps until the earliest
+    deadline and does not wake up at all while nothing is scheduled.
+    """
+
+    def __init__(self):
+        self._heap = []  # [when, seq, key, callback]
+        self._entries = {}  # key -> heap entry
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._wakeup = None
+        self._task = None
+
+    def start(self):
+        """Starts the runner task (must be called from the event loop)."""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def schedule(self, key, deadline: datetime, callback):
+        """
+        Fires callback(key) once at `deadline` (naive UTC datetime).
+        Scheduling an existing key replaces its previous deadline.
+        """
+        self.cancel(key)
+        loop = asyncio.get_running_loop()
+        delay = (deadline - datetime.utcnow()).total_seconds()
+        entry = [loop.time() + max(0.0, delay), next(self._counter), key, callback]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        # Only wake the runner if the new deadline is now the earliest one
+        if self._heap[0] is entry and self._wakeup is not None:
+            self._wakeup.set()
+
+    def cancel(self, key) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        entry[3] = None  # Mark as cancelled, removed lazily
+        self._cancelled += 1
+        # Rebuild once cancelled entries dominate, so the heap stays O(active)
+        if self._cancelled > 64 and self._cancelled > len(self._heap) // 2:
+            self._heap = [e for e in self._heap if e[3] is not None]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+        return True
+
+    def pending(self) -> int:
+        return len(self._entries)
+
+    def _pop_cancelled(self):
+        while self._heap and self._heap[0][3] is None:
+            heapq.heappop(self._heap)
+            self._cancelled = max(0, self._cancelled - 1)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._pop_cancelled()
+            if not self._heap:
+                timeout = None
+            else:
+                timeout = self._heap[0][0] - loop.time()
+
+            if timeout is None or timeout > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, key, callback = heapq.heappop(self._heap)
+            self._entries.pop(key, None)
+            try:
+                callback(key)
+            except Exception as e:
+                print(f"❌ Timer callback failed for {key}: {e}")
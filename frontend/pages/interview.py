@@ -107,6 +107,9 @@ if "collected_locations" not in st.session_state:
 if "timer_placeholder" not in st.session_state:
     st.session_state.timer_placeholder = None
 
+if "question_deadline" not in st.session_state:
+    st.session_state.question_deadline = None
+
 if "message_display_pending" not in st.session_state:
     st.session_state.message_display_pending = False
 
@@ -145,6 +148,8 @@ if "terminated_duplicate" not in st.session_state:
 # ============================================
 BACKEND_URL = os.getenv("BACKEND_URL", "https://talentscout-backend-c504.onrender.com")
 QUESTION_TIME_LIMIT = 180
+# The backend pings the event stream every tick, so a silent stream this long is dead
+EVENT_STREAM_IDLE_TIMEOUT = 10
 
 # ============================================
 # CHECK IF INTERVIEW IS TERMINATED
@@ -166,6 +171,16 @@ def get_remaining_time(interview_id):
     res = requests.get(f"{BACKEND_URL}/timer/{interview_id}", timeout=5)
     return res.json()["remaining"]
 
+def set_question_deadline(res):
+    """
+    Stores the deadline the backend sent with a question, converted to this
+    server's clock so the countdown is unaffected by clock skew.
+    """
+    if res.get("deadline") and res.get("server_time"):
+        st.session_state.question_deadline = time.time() + (res["deadline"] - res["server_time"])
+    else:
+        st.session_state.question_deadline = time.time() + QUESTION_TIME_LIMIT
+
 def backend_start_interview(candidate_data):
     try:
         response = requests.post(f"{BACKEND_URL}/start", json=candidate_data, timeout=180)
@@ -178,6 +193,12 @@ def backend_start_interview(candidate_data):
         st.error(f"❌ Connection error: {str(e)}")
         st.stop()
 
+def show_question_preview(placeholder):
+    """Returns an on_delta callback that renders a streamed question into placeholder"""
+    def render(text):
+        placeholder.markdown(f"<div class='question-box'>{text}</div>", unsafe_allow_html=True)
+    return render
+
 def backend_submit_answer(interview_id, question, answer):
     try:
         response = requests.post(
@@ -194,6 +215,62 @@ def backend_submit_answer(interview_id, question, answer):
         st.error(f"❌ Connection error: {str(e)}")
         st.stop()
 
+def poll_next_question(interview_id, previous_question, deadline):
+    """Fallback for backends without /events: poll /next-question until the (monotonic) deadline"""
+    while time.monotonic() < deadline:
+        time.sleep(1.5)
+        try:
+            res = requests.get(f"{BACKEND_URL}/next-question/{interview_id}", timeout=10).json()
+        except Exception as e:
+            print(f"❌ Polling error: {e}")
+            continue
+        if res.get("completed"):
+            return res
+        if res.get("question") and res["question"] != previous_question:
+            return res
+        print(f"🔍 Status = {res.get('status', 'unknown')}")
+    return {}
+
+def wait_for_next_question(interview_id, previous_question, timeout=60, on_delta=None):
+    """
+    Waits for the backend to push the next question over the /events stream.
+    Returns the question event ({"question", "question_number", ...}),
+    {"completed": True} or {"terminated": True}, or {} if nothing arrived in time.
+    If on_delta is given, it is called with the question text generated so far
+    while the backend streams it.
+    """
+    deadline = time.monotonic() + timeout
+    preview = ""
+    try:
+        with requests.get(
+            f"{BACKEND_URL}/events/{interview_id}",
+            stream=True,
+            timeout=(5, min(timeout, EVENT_STREAM_IDLE_TIMEOUT))
+        ) as res:
+            res.raise_for_status()
+            event = None
+            for line in res.iter_lines(decode_unicode=True):
+                # Checked on every line, keepalive comments included
+                if time.monotonic() >= deadline:
+                    return {}
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data = json.loads(line[len("data:"):])
+                    if event == "question_delta" and on_delta is not None:
+                        preview += data.get("delta", "")
+                        on_delta(preview)
+                    if event == "question" and data.get("question") and data["question"] != previous_question:
+                        return data
+                    if event in ("completed", "terminated"):
+                        return data
+        return {}
+    except Exception as e:
+        if time.monotonic() >= deadline:
+            return {}
+        print(f"⚠️ Event stream unavailable, falling back to polling: {e}")
+        return poll_next_question(interview_id, previous_question, deadline)
+
 # Apply CSS styles
 st.markdown(STYLES, unsafe_allow_html=True)
 
@@ -1178,58 +1255,90 @@ if (st.session_state.stage == "tech" and
     if last_msg["role"] == "assistant" and "question-box" in last_msg["content"]:
         if st.session_state.timer_placeholder is None:
             st.session_state.timer_placeholder = st.empty()
+        if st.session_state.question_deadline is None:
+            set_question_deadline({})
         
-        try:
-            timer_response = requests.get(
-                f"{BACKEND_URL}/timer/{st.session_state.interview_id}", 
-                timeout=2
-            ).json()
-            remaining = timer_response.get("remaining", 0)
-            timeout = timer_response.get("timeout", False)
+        remaining = max(0, int(st.session_state.question_deadline - time.time()))
+        
+        # The countdown runs in the browser; the script only reruns at the deadline
+        if remaining > 0:
+            minutes = remaining // 60
+            seconds = remaining % 60
             
-            print(f"⏱️ Timer check - Remaining: {remaining}s, Timeout flag: {timeout}")
+            if remaining > 60:
+                timer_class = "timer-normal"
+            elif remaining > 30:
+                timer_class = "timer-warning"
+            else:
+                timer_class = "timer-critical"
             
-            # CRITICAL: Trigger timeout when remaining hits 0
-            if remaining <= 0 or timeout:
-                # Only trigger if not already detected and not already processing
-                if not st.session_state.get("timeout_detected") and not st.session_state.get("input_locked"):
-                    print(f"🚨 TIMEOUT TRIGGERED - Remaining: {remaining}, Flag: {timeout}")
-                    print(f"Current question count: {st.session_state.tech_q_count}")
-                    
-                    # Clear timer display
-                    st.session_state.timer_placeholder = None
-                    
-                    # Set timeout detected flag
-                    st.session_state.timeout_detected = True
-                    st.session_state.input_locked = True
-                    
-                    print("🔄 Forcing rerun to handle timeout...")
+            with st.session_state.timer_placeholder.container():
+                st.markdown(
+                    f"""
+                    <div style="position: relative; margin-top: -50px; text-align: right; padding-right: 40px;">
+                        <span id="question-timer" class="timer-display {timer_class}">⏱️ {minutes:02d}:{seconds:02d}</span>
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
+                components.html(
+                    f"""
+                    <script>
+                    const end = Date.now() + {int((st.session_state.question_deadline - time.time()) * 1000)};
+                    function tick() {{
+                        const remaining = Math.max(0, Math.ceil((end - Date.now()) / 1000));
+                        const timer = window.parent.document.getElementById('question-timer');
+                        if (timer) {{
+                            const minutes = String(Math.floor(remaining / 60)).padStart(2, '0');
+                            const seconds = String(remaining % 60).padStart(2, '0');
+                            timer.textContent = `⏱️ ${{minutes}}:${{seconds}}`;
+                            timer.className = 'timer-display ' + (
+                                remaining > 60 ? 'timer-normal' : remaining > 30 ? 'timer-warning' : 'timer-critical'
+                            );
+                        }}
+                        if (remaining > 0) setTimeout(tick, 250);
+                    }}
+                    tick();
+                    </script>
+                    """,
+                    height=0
+                )
+        
+        @st.fragment(run_every=max(1, remaining))
+        def question_deadline_watcher():
+            """Runs once when the deadline passes and hands over to the timeout handler"""
+            if time.time() < st.session_state.question_deadline:
+                return
+            
+            try:
+                timer_response = requests.get(
+                    f"{BACKEND_URL}/timer/{st.session_state.interview_id}", 
+                    timeout=2
+                ).json()
+                print(f"⏱️ Deadline reached - backend remaining: {timer_response.get('remaining', 0)}s")
+                
+                # Clocks disagree: take the backend's deadline and wait for it
+                if timer_response.get("remaining", 0) > 0 and not timer_response.get("timeout", False):
+                    set_question_deadline(timer_response)
                     st.rerun()
+            except Exception as e:
+                print(f"❌ Timer check error: {e}")
             
-            # Display timer only if time remaining
-            if remaining > 0:
-                minutes = remaining // 60
-                seconds = remaining % 60
-                
-                if remaining > 60:
-                    timer_class = "timer-normal"
-                elif remaining > 30:
-                    timer_class = "timer-warning"
-                else:
-                    timer_class = "timer-critical"
+            # Only trigger if not already detected and not already processing
+            if not st.session_state.get("timeout_detected") and not st.session_state.get("input_locked"):
+                print(f"🚨 TIMEOUT TRIGGERED - Question count: {st.session_state.tech_q_count}")
                 
-                with st.session_state.timer_placeholder.container():
-                    st.markdown(
-                        f"""
-                        <div style="position: relative; margin-top: -50px; text-align: right; padding-right: 40px;">
-                            <span class="timer-display {timer_class}">⏱️ {minutes:02d}:{seconds:02d}</span>
-                        </div>
-                        """,
-                        unsafe_allow_html=True
-                    )
-        except Exception as e:
-            print(f"❌ Timer check error: {e}")
-            pass
+                # Clear timer display
+                st.session_state.timer_placeholder = None
+                
+                # Set timeout detected flag
+                st.session_state.timeout_detected = True
+                st.session_state.input_locked = True
+                
+                print("🔄 Forcing rerun to handle timeout...")
+                st.rerun()
+        
+        question_deadline_watcher()
 
 # Initial greeting
 if st.session_state.current_q == 0 and not st.session_state.messages:
@@ -1315,17 +1424,6 @@ else:
     st.chat_input("Processing... Please wait", disabled=True, key="disabled_input")
     user_input = None
 
-# Auto-refresh timer every 1 second during technical questions
-if (st.session_state.stage == "tech" and 
-    st.session_state.interview_id and 
-    st.session_state.current_tech_question and
-    not user_input and
-    not st.session_state.input_locked and
-    not st.session_state.get("timeout_detected", False) and
-    st.session_state.stage != "completed"):
-    time.sleep(1)  # Changed from 2 to 1 second
-    st.rerun()
-
 # HANDLE TIMEOUT
 if st.session_state.get("timeout_detected", False):
     print(f"🔴 TIMEOUT HANDLER TRIGGERED - Question count: {st.session_state.tech_q_count}")
@@ -1351,18 +1449,11 @@ if st.session_state.get("timeout_detected", False):
             )
             
             # Wait for completion
-            for attempt in range(15):
-                time.sleep(2)
-                try:
-                    res = requests.get(
-                        f"{BACKEND_URL}/next-question/{st.session_state.interview_id}",
-                        timeout=10
-                    ).json()
-                    
-                    if res.get("completed"):
-                        break
-                except Exception as e:
-                    print(f"⚠️ Completion check error: {e}")
+            wait_for_next_question(
+                st.session_state.interview_id,
+                st.session_state.current_tech_question,
+                timeout=30
+            )
         
         # Force completion
         end_msg = (
@@ -1391,33 +1482,27 @@ if st.session_state.get("timeout_detected", False):
         # Wait for next question
         next_question = None
         
-        for i in range(20):
-            time.sleep(1.5)
-            try:
-                res = requests.get(
-                    f"{BACKEND_URL}/next-question/{st.session_state.interview_id}",
-                    timeout=10
-                ).json()
-                
-                if "question" in res and res["question"]:
-                    next_question = res["question"]
-                    # Backend incremented count, so update frontend
-                    st.session_state.tech_q_count = res.get("question_number", st.session_state.tech_q_count + 1)
-                    print(f"✅ Next question received after {(i+1)*1.5} seconds")
-                    print(f"📊 Updated question count to: {st.session_state.tech_q_count}")
-                    break
-                    
-                status = res.get("status", "unknown")
-                print(f"🔍 Attempt {i+1}: Status = {status}")
-                
-                # If completed, break early
-                if res.get("completed"):
-                    print("✅ Backend reports interview completed")
-                    st.session_state.stage = "completed"
-                    st.rerun()
-                    
-            except Exception as e:
-                print(f"❌ Error on attempt {i+1}: {e}")
+        wait_started = time.time()
+        res = wait_for_next_question(
+            st.session_state.interview_id,
+            st.session_state.current_tech_question,
+            timeout=30,
+            on_delta=show_question_preview(st.empty())
+        )
+        
+        if res.get("question"):
+            next_question = res["question"]
+            set_question_deadline(res)
+            # Backend incremented count, so update frontend
+            st.session_state.tech_q_count = res.get("question_number", st.session_state.tech_q_count + 1)
+            print(f"✅ Next question received after {time.time() - wait_started:.1f} seconds")
+            print(f"📊 Updated question count to: {st.session_state.tech_q_count}")
+        
+        # If completed, stop waiting
+        if res.get("completed"):
+            print("✅ Backend reports interview completed")
+            st.session_state.stage = "completed"
+            st.rerun()
     
     if next_question:
         # Update current question
@@ -1741,6 +1826,7 @@ if st.session_state.get("message_display_pending") and st.session_state.pending_
                 data = backend_start_interview(payload)
                 st.session_state.interview_id = data["interview_id"]
                 st.session_state.current_tech_question = data["question"]
+                set_question_deadline(data)
 
             formatted_q = f"<div class='question-box'>{st.session_state.current_tech_question}</div>"
             st.session_state.messages.append({"role": "assistant", "content": formatted_q})
@@ -1766,20 +1852,12 @@ if st.session_state.get("message_display_pending") and st.session_state.pending_
                     )
                     
                     # Wait for backend to confirm completion
-                    completed = False
-                    for attempt in range(20):
-                        time.sleep(1.5)
-                        try:
-                            res = requests.get(
-                                f"{BACKEND_URL}/next-question/{st.session_state.interview_id}",
-                                timeout=10
-                            ).json()
-                            
-                            if res.get("completed"):
-                                completed = True
-                                break
-                        except Exception as e:
-                            print(f"⚠️ Completion check error: {e}")
+                    res = wait_for_next_question(
+                        st.session_state.interview_id,
+                        st.session_state.current_tech_question,
+                        timeout=30
+                    )
+                    completed = bool(res.get("completed"))
                 
                 end_msg = (
                     "<div class='assistant-box'>"
@@ -1801,23 +1879,17 @@ if st.session_state.get("message_display_pending") and st.session_state.pending_
                     user_input
                 )
                 
-                next_question = None
-                for attempt in range(20):
-                    time.sleep(1.5)
-                    try:
-                        res = requests.get(
-                            f"{BACKEND_URL}/next-question/{st.session_state.interview_id}",
-                            timeout=10
-                        ).json()
-                        
-                        if "question" in res and res["question"]:
-                            next_question = res["question"]
-                            break
-                    except Exception as e:
-                        print(f"❌ Error on attempt {attempt+1}: {e}")
+                res = wait_for_next_question(
+                    st.session_state.interview_id,
+                    st.session_state.current_tech_question,
+                    timeout=30,
+                    on_delta=show_question_preview(st.empty())
+                )
+                next_question = res.get("question")
             
             if next_question:
                 st.session_state.current_tech_question = next_question
+                set_question_deadline(res)
                 
                 # Varied skip acknowledgements
                 import random
@@ -1858,25 +1930,18 @@ if st.session_state.get("message_display_pending") and st.session_state.pending_
                     st.session_state.current_tech_question,
                     user_input
                 )
-                time.sleep(2)
             
             with st.spinner("⏳ Finalizing your interview..."):
                 # Wait for backend to confirm completion
-                completed = False
-                for attempt in range(15):
-                    time.sleep(2)
-                    try:
-                        res = requests.get(
-                            f"{BACKEND_URL}/next-question/{st.session_state.interview_id}",
-                            timeout=10
-                        ).json()
-                        
-                        if res.get("completed"):
-                            completed = True
-                            print(f"✅ Backend confirmed completion after {(attempt+1)*2} seconds")
-                            break
-                    except Exception as e:
-                        print(f"⚠️ Completion check error: {e}")
+                wait_started = time.time()
+                res = wait_for_next_question(
+                    st.session_state.interview_id,
+                    st.session_state.current_tech_question,
+                    timeout=30
+                )
+                completed = bool(res.get("completed"))
+                if completed:
+                    print(f"✅ Backend confirmed completion after {time.time() - wait_started:.1f} seconds")
             
             end_msg = (
                 "<div class='assistant-box'>"
@@ -1897,31 +1962,22 @@ if st.session_state.get("message_display_pending") and st.session_state.pending_
                 st.session_state.current_tech_question,
                 user_input
             )
-            time.sleep(2)
         
         with st.spinner("✅ Answer saved, loading next question..."):
-            next_question = None
-            
-            for attempt in range(20):
-                time.sleep(1.5)
-                try:
-                    res = requests.get(
-                        f"{BACKEND_URL}/next-question/{st.session_state.interview_id}",
-                        timeout=10
-                    ).json()
-                    
-                    if "question" in res and res["question"]:
-                        next_question = res["question"]
-                        print(f"✅ Next question received after {(attempt+1)*1.5} seconds")
-                        break
-                        
-                    print(f"🔍 Attempt {attempt+1}: Status = {res.get('status', 'unknown')}")
-                    
-                except Exception as e:
-                    print(f"❌ Error on attempt {attempt+1}: {e}")
+            wait_started = time.time()
+            res = wait_for_next_question(
+                st.session_state.interview_id,
+                st.session_state.current_tech_question,
+                timeout=30,
+                on_delta=show_question_preview(st.empty())
+            )
+            next_question = res.get("question")
+            if next_question:
+                print(f"✅ Next question received after {time.time() - wait_started:.1f} seconds")
         
         if next_question:
             st.session_state.current_tech_question = next_question
+            set_question_deadline(res)
                 
             # Varied acknowledgements - randomly selected
             import random